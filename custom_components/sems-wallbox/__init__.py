@@ -6,16 +6,18 @@ import asyncio
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import CONF_STATION_ID, DOMAIN
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
-from .sems_api import SemsApi
+from .account import async_get_registry
 from .coordinator import SemsUpdateCoordinator
+from .dispatcher import CommandDispatcher
+from .reconciler import WallboxReconciler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,17 +39,25 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up sems from a config entry."""
-    username = entry.data[CONF_USERNAME]
-    password = entry.data[CONF_PASSWORD]
-
-    api = SemsApi(hass, username, password)
-    coordinator = SemsUpdateCoordinator(hass, entry, api)
-
-    await coordinator.async_config_entry_first_refresh()
-
+    registry = async_get_registry(hass)
+    account = await registry.async_acquire(entry)
+    api = account.api
+    if account.coordinator is None:
+        account.coordinator = SemsUpdateCoordinator(hass, api)
+    coordinator = account.coordinator
+
+    try:
+        await coordinator.async_add_serial(entry)
+    except Exception:
+        await registry.async_release(entry)
+        raise
+
+    sn = entry.data[CONF_STATION_ID]
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "reconciler": WallboxReconciler(coordinator, api, sn, CommandDispatcher()),
+        "sn": sn,
     }
 
     # Reload on options change (e.g. scan_interval)
@@ -73,6 +83,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        runtime = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if runtime is not None:
+            runtime["reconciler"].async_cancel()
+            runtime["coordinator"].async_remove_serial(runtime["sn"])
+        await async_get_registry(hass).async_release(entry)
 
     return unload_ok
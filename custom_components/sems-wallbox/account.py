@@ -0,0 +1,106 @@
+"""Per-account SEMS client registry for the GoodWe SEMS Wallbox integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import hashlib
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_ACCOUNTS, DOMAIN
+from .sems_api import SemsApi
+
+_LOGGER = logging.getLogger(__name__)
+
+TOKEN_STORAGE_VERSION = 1
+
+
+def account_key(username: str) -> str:
+    """Return a stable, non-reversible key for a SEMS account name."""
+    return hashlib.sha256(username.strip().lower().encode()).hexdigest()[:16]
+
+
+@dataclass
+class SemsAccount:
+    """One SEMS login shared by every config entry of that account."""
+
+    key: str
+    api: SemsApi
+    entry_ids: set[str] = field(default_factory=set)
+    # SemsUpdateCoordinator polling every wallbox of the account
+    coordinator: Any = None
+
+
+class SemsAccountRegistry:
+    """Reference-counted registry of SemsAccount objects, keyed by account."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self._hass = hass
+        self._accounts: dict[str, SemsAccount] = {}
+        self._lock = asyncio.Lock()
+
+    def get(self, entry: ConfigEntry) -> SemsAccount | None:
+        """Return the account an entry belongs to, if acquired."""
+        return self._accounts.get(account_key(entry.data[CONF_USERNAME]))
+
+    async def async_acquire(self, entry: ConfigEntry) -> SemsAccount:
+        """Return the shared account for an entry, creating it on first use."""
+        username = entry.data[CONF_USERNAME]
+        key = account_key(username)
+        async with self._lock:
+            account = self._accounts.get(key)
+            if account is None:
+                api = SemsApi(
+                    self._hass,
+                    username,
+                    entry.data[CONF_PASSWORD],
+                    token_store=Store(
+                        self._hass,
+                        TOKEN_STORAGE_VERSION,
+                        f"{DOMAIN}.token.{key}",
+                        private=True,
+                    ),
+                )
+                await api.async_load_token()
+                account = self._accounts[key] = SemsAccount(key, api)
+                _LOGGER.debug("SEMS account %s created", key)
+            account.entry_ids.add(entry.entry_id)
+            _LOGGER.debug(
+                "SEMS account %s acquired by entry %s (%d entries)",
+                key,
+                entry.entry_id,
+                len(account.entry_ids),
+            )
+            return account
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Drop an entry's reference; close the client with the last one."""
+        key = account_key(entry.data[CONF_USERNAME])
+        async with self._lock:
+            account = self._accounts.get(key)
+            if account is None:
+                return
+            account.entry_ids.discard(entry.entry_id)
+            if account.entry_ids:
+                return
+            del self._accounts[key]
+        _LOGGER.debug("SEMS account %s released, closing client", key)
+        if account.coordinator is not None:
+            await account.coordinator.async_shutdown()
+        await account.api.async_close()
+
+
+def async_get_registry(hass: HomeAssistant) -> SemsAccountRegistry:
+    """Return the account registry stored in hass.data."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    registry = domain_data.get(DATA_ACCOUNTS)
+    if registry is None:
+        registry = domain_data[DATA_ACCOUNTS] = SemsAccountRegistry(hass)
+    return registry
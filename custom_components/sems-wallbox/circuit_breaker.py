@@ -0,0 +1,172 @@
+"""Circuit breaker guarding SEMS API endpoints during outages."""
+
+from __future__ import annotations
+
+from collections import deque
+from enum import StrEnum
+import logging
+import random
+import time
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Open the circuit when at least this share of the recent calls failed...
+DEFAULT_FAILURE_RATE = 0.5
+# ...considering the last WINDOW calls, once MIN_CALLS of them are known
+DEFAULT_WINDOW = 10
+DEFAULT_MIN_CALLS = 3
+
+# Wait before the first half-open probe; doubles after every failed probe
+DEFAULT_BASE_BACKOFF = 30.0  # seconds
+DEFAULT_MAX_BACKOFF = 900.0  # seconds
+# Backoff is multiplied by a random factor in [1 - JITTER, 1 + JITTER]
+DEFAULT_JITTER = 0.2
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(HomeAssistantError):
+    """Error to indicate a call was not sent because the circuit is open."""
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        """Initialize the error."""
+        super().__init__(
+            f"SEMS endpoint {name} is failing; requests paused, next attempt in {retry_in:.0f}s"
+        )
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Error-rate driven circuit breaker for one endpoint.
+
+    Closed: calls pass and their outcome is recorded in a sliding window.
+    Open: calls fail immediately until the backoff has elapsed.
+    Half-open: exactly one probe call is let through; success closes the
+    circuit, failure re-opens it with a doubled, jittered backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float = DEFAULT_FAILURE_RATE,
+        window: int = DEFAULT_WINDOW,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        jitter: float = DEFAULT_JITTER,
+        clock=time.monotonic,
+    ) -> None:
+        """Initialize the breaker."""
+        self.name = name
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = BreakerState.CLOSED
+        self._open_count = 0
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+        self.last_error: str | None = None
+
+    @property
+    def state(self) -> BreakerState:
+        """Return the current state, moving open -> half-open when due."""
+        if self._state is BreakerState.OPEN and self._clock() >= self._retry_at:
+            self._state = BreakerState.HALF_OPEN
+            self._probe_in_flight = False
+            _LOGGER.debug("SEMS circuit %s half-open, next call is a probe", self.name)
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until the next call may be attempted."""
+        if self.state is BreakerState.OPEN:
+            return max(0.0, self._retry_at - self._clock())
+        return 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Return the failure share of the recorded window."""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if a call must not be sent now."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return
+        if state is BreakerState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        raise CircuitOpenError(self.name, self.retry_in)
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self._state is BreakerState.HALF_OPEN:
+            _LOGGER.info("SEMS circuit %s closed, endpoint recovered", self.name)
+            self._state = BreakerState.CLOSED
+            self._open_count = 0
+            self._outcomes.clear()
+            self._probe_in_flight = False
+        self._outcomes.append(True)
+
+    def release(self) -> None:
+        """Forget a call that ended without an outcome (e.g. cancelled)."""
+        if self._state is BreakerState.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_failure(self, error: str | None = None) -> None:
+        """Record a failed call, opening the circuit if needed."""
+        self.last_error = error
+        if self._state is BreakerState.HALF_OPEN:
+            self._probe_in_flight = False
+            self._open()
+            return
+        self._outcomes.append(False)
+        if (
+            self._state is BreakerState.CLOSED
+            and len(self._outcomes) >= self._min_calls
+            and self.error_rate >= self._failure_rate
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        """Open the circuit with exponential, jittered backoff."""
+        self._open_count += 1
+        backoff = min(
+            self._max_backoff, self._base_backoff * 2 ** (self._open_count - 1)
+        )
+        backoff *= random.uniform(1 - self._jitter, 1 + self._jitter)
+        self._retry_at = self._clock() + backoff
+        self._state = BreakerState.OPEN
+        _LOGGER.warning(
+            "SEMS circuit %s open (error rate %.0f%%, last error: %s), pausing for %.0fs",
+            self.name,
+            self.error_rate * 100,
+            self.last_error,
+            backoff,
+        )
+
+    def as_dict(self) -> dict:
+        """Return breaker state for diagnostics."""
+        return {
+            "state": self.state.value,
+            "error_rate": round(self.error_rate, 2),
+            "retry_in": round(self.retry_in),
+            "open_count": self._open_count,
+            "last_error": self.last_error,
+        }
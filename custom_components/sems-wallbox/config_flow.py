@@ -9,15 +9,41 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_SCAN_INTERVAL
+from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
     SEMS_CONFIG_SCHEMA,
     CONF_STATION_ID,
     CONF_SCAN_INTERVAL_CHARGING,
+    CONF_SCAN_INTERVAL_TRANSITION,
+    CONF_SCAN_INTERVAL_MAX,
     DEFAULT_SCAN_INTERVAL_IDLE,
     DEFAULT_SCAN_INTERVAL_CHARGING,
+    DEFAULT_SCAN_INTERVAL_TRANSITION,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    CONF_POWER_DEADBAND,
+    CONF_CURRENT_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_HEARTBEAT,
+    DEFAULT_POWER_DEADBAND,
+    DEFAULT_CURRENT_DEADBAND,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_HEARTBEAT,
+    CONF_PROFILES,
+    CONF_TRIGGERS,
 )
+from .profiles import (
+    PROFILE_CHARGING,
+    PROFILE_END,
+    PROFILE_ENTITY,
+    PROFILE_IDLE,
+    PROFILE_NAME,
+    PROFILE_OFFLINE,
+    PROFILE_START,
+)
+from .triggers import TRIGGER_ENTITY, TRIGGER_THRESHOLD
 from .sems_api import SemsApi
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,9 +56,15 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """
 
     _LOGGER.debug("SEMS - Start validation config flow user input")
-    api = SemsApi(hass, data[CONF_USERNAME], data[CONF_PASSWORD])
+    # One-shot check: use HA's shared session instead of opening a pool.
+    api = SemsApi(
+        hass,
+        data[CONF_USERNAME],
+        data[CONF_PASSWORD],
+        session=async_get_clientsession(hass),
+    )
 
-    authenticated = await hass.async_add_executor_job(api.test_authentication)
+    authenticated = await api.async_test_authentication()
     if not authenticated:
         raise InvalidAuth
 
@@ -94,14 +126,33 @@ class InvalidAuth(HomeAssistantError):
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    """Handle options (polling intervals) for SEMS Wallbox."""
+    """Handle options (polling intervals, sensor filters, polling profiles)."""
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """Manage the options."""
+        options = self.config_entry.options
+        menu_options = ["intervals", "add_profile"]
+        if options.get(CONF_PROFILES):
+            menu_options.append("remove_profile")
+        menu_options.append("add_trigger")
+        if options.get(CONF_TRIGGERS):
+            menu_options.append("remove_trigger")
+        return self.async_show_menu(step_id="init", menu_options=menu_options)
+
+    def _async_save(self, changes: dict[str, Any]) -> dict[str, Any]:
+        """Save changed options, keeping the others."""
+        return self.async_create_entry(
+            title="", data={**self.config_entry.options, **changes}
+        )
+
+    async def async_step_intervals(
+        self, user_input: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Manage the polling intervals and sensor filters."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            return self._async_save(user_input)
 
         current_idle = int(self.config_entry.options.get(
             CONF_SCAN_INTERVAL,
@@ -111,9 +162,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             CONF_SCAN_INTERVAL_CHARGING,
             DEFAULT_SCAN_INTERVAL_CHARGING,
         ))
+        options = self.config_entry.options
 
         return self.async_show_form(
-            step_id="init",
+            step_id="intervals",
             data_schema=vol.Schema({
                 vol.Required(CONF_SCAN_INTERVAL, default=current_idle): vol.All(
                     int, vol.Range(min=10, max=300)
@@ -121,5 +173,141 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(CONF_SCAN_INTERVAL_CHARGING, default=current_charging): vol.All(
                     int, vol.Range(min=5, max=120)
                 ),
+                vol.Required(
+                    CONF_SCAN_INTERVAL_TRANSITION,
+                    default=options.get(
+                        CONF_SCAN_INTERVAL_TRANSITION, DEFAULT_SCAN_INTERVAL_TRANSITION
+                    ),
+                ): vol.All(int, vol.Range(min=5, max=120)),
+                vol.Required(
+                    CONF_SCAN_INTERVAL_MAX,
+                    default=options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+                ): vol.All(int, vol.Range(min=60, max=3600)),
+                vol.Required(
+                    CONF_POWER_DEADBAND,
+                    default=options.get(CONF_POWER_DEADBAND, DEFAULT_POWER_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Required(
+                    CONF_CURRENT_DEADBAND,
+                    default=options.get(CONF_CURRENT_DEADBAND, DEFAULT_CURRENT_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=16)),
+                vol.Required(
+                    CONF_DEADBAND_PERCENT,
+                    default=options.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                vol.Required(
+                    CONF_HEARTBEAT,
+                    default=options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT),
+                ): vol.All(int, vol.Range(min=0, max=3600)),
+            }),
+        )
+
+    async def async_step_add_profile(
+        self, user_input: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Add a named polling profile."""
+        profiles = list(self.config_entry.options.get(CONF_PROFILES, []))
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            name = user_input[PROFILE_NAME].strip()
+            has_window = PROFILE_START in user_input and PROFILE_END in user_input
+            if not name:
+                errors[PROFILE_NAME] = "profile_name_required"
+            elif any(p[PROFILE_NAME].casefold() == name.casefold() for p in profiles):
+                errors[PROFILE_NAME] = "profile_exists"
+            elif (PROFILE_START in user_input) != (PROFILE_END in user_input):
+                errors["base"] = "profile_window_incomplete"
+            elif not has_window and not user_input.get(PROFILE_ENTITY):
+                errors["base"] = "profile_trigger_required"
+            else:
+                return self._async_save(
+                    {CONF_PROFILES: [*profiles, {**user_input, PROFILE_NAME: name}]}
+                )
+
+        return self.async_show_form(
+            step_id="add_profile",
+            data_schema=vol.Schema({
+                vol.Required(PROFILE_NAME): str,
+                vol.Required(
+                    PROFILE_IDLE, default=DEFAULT_SCAN_INTERVAL_IDLE
+                ): vol.All(int, vol.Range(min=10, max=3600)),
+                vol.Required(
+                    PROFILE_CHARGING, default=DEFAULT_SCAN_INTERVAL_CHARGING
+                ): vol.All(int, vol.Range(min=5, max=600)),
+                vol.Required(
+                    PROFILE_OFFLINE, default=DEFAULT_SCAN_INTERVAL_MAX
+                ): vol.All(int, vol.Range(min=60, max=3600)),
+                vol.Optional(PROFILE_START): selector.TimeSelector(),
+                vol.Optional(PROFILE_END): selector.TimeSelector(),
+                vol.Optional(PROFILE_ENTITY): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["schedule", "input_select"])
+                ),
+            }),
+            errors=errors,
+        )
+
+    async def async_step_remove_profile(
+        self, user_input: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Remove a polling profile."""
+        profiles = list(self.config_entry.options.get(CONF_PROFILES, []))
+        if user_input is not None:
+            return self._async_save({
+                CONF_PROFILES: [
+                    p for p in profiles if p[PROFILE_NAME] != user_input[PROFILE_NAME]
+                ]
+            })
+
+        return self.async_show_form(
+            step_id="remove_profile",
+            data_schema=vol.Schema({
+                vol.Required(PROFILE_NAME): vol.In(
+                    [p[PROFILE_NAME] for p in profiles]
+                ),
+            }),
+        )
+
+    async def async_step_add_trigger(
+        self, user_input: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Add an entity that triggers an early refresh."""
+        triggers = list(self.config_entry.options.get(CONF_TRIGGERS, []))
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if any(t[TRIGGER_ENTITY] == user_input[TRIGGER_ENTITY] for t in triggers):
+                errors[TRIGGER_ENTITY] = "trigger_exists"
+            else:
+                return self._async_save({CONF_TRIGGERS: [*triggers, user_input]})
+
+        return self.async_show_form(
+            step_id="add_trigger",
+            data_schema=vol.Schema({
+                vol.Required(TRIGGER_ENTITY): selector.EntitySelector(),
+                vol.Required(TRIGGER_THRESHOLD, default=0.0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }),
+            errors=errors,
+        )
+
+    async def async_step_remove_trigger(
+        self, user_input: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Remove a refresh trigger."""
+        triggers = list(self.config_entry.options.get(CONF_TRIGGERS, []))
+        if user_input is not None:
+            return self._async_save({
+                CONF_TRIGGERS: [
+                    t for t in triggers
+                    if t[TRIGGER_ENTITY] != user_input[TRIGGER_ENTITY]
+                ]
+            })
+
+        return self.async_show_form(
+            step_id="remove_trigger",
+            data_schema=vol.Schema({
+                vol.Required(TRIGGER_ENTITY): vol.In(
+                    [t[TRIGGER_ENTITY] for t in triggers]
+                ),
             }),
         )
@@ -0,0 +1,163 @@
+"""Adaptive confirmation polling after wallbox commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import logging
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .snapshot import WallboxSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delays between confirmation polls after a command; the last one repeats.
+# SEMS usually applies a change within 10-15 s.
+CONFIRM_BACKOFF = (3.0, 3.0, 5.0, 8.0, 13.0, 20.0)  # seconds
+# Give up (and fall back to the polled state) after this long
+CONFIRM_DEADLINE = 120.0  # seconds
+
+
+@dataclass
+class ConfirmationStats:
+    """Time from command to confirmation for one command type."""
+
+    confirmed: int = 0
+    # The state echoed in the command response already showed the change
+    immediate: int = 0
+    timed_out: int = 0
+    polls: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+    max_latency: float | None = None
+
+    @property
+    def avg_latency(self) -> float | None:
+        """Average seconds until a command was confirmed."""
+        return self.total_latency / self.confirmed if self.confirmed else None
+
+    def record(self, latency: float) -> None:
+        """Record a confirmed command."""
+        self.confirmed += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency or 0.0, latency)
+
+    def as_dict(self) -> dict:
+        """Return stats for diagnostics."""
+        return {**asdict(self), "avg_latency": self.avg_latency}
+
+
+class ConfirmationScheduler:
+    """Poll one wallbox on a growing backoff until a command shows up.
+
+    After a command the caller names the wallbox, a command type and a
+    check on the wallbox data.  The wallbox alone is re-read after 3, 6,
+    11, ... seconds and every result is published right away; polling stops
+    as soon as the check passes or CONFIRM_DEADLINE has passed, and the
+    coordinator's normal cadence takes over again.
+    """
+
+    def __init__(
+        self,
+        hass,
+        fetch: Callable[[str], Awaitable[WallboxSnapshot]],
+        publish: Callable[[str, WallboxSnapshot], None],
+        *,
+        backoff: tuple[float, ...] = CONFIRM_BACKOFF,
+        deadline: float = CONFIRM_DEADLINE,
+        sleep=asyncio.sleep,
+        clock=time.monotonic,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._fetch = fetch
+        self._publish = publish
+        self._backoff = backoff
+        self._deadline = deadline
+        self._sleep = sleep
+        self._clock = clock
+        self._tasks: dict[tuple[str, str], asyncio.Task] = {}
+        self.stats: dict[str, ConfirmationStats] = {}
+
+    def async_expect(
+        self,
+        sn: str,
+        kind: str,
+        check: Callable[[WallboxSnapshot], bool],
+        data: WallboxSnapshot | None = None,
+    ) -> None:
+        """Start confirming a command, replacing an earlier one of the same kind.
+
+        `data` is the snapshot after merging the command response.  Passing
+        the check there is only counted: the echo may just repeat the
+        request, so the status is always polled at least once.
+        """
+        self._cancel((sn, kind))
+        if data is not None and check(data):
+            self.stats.setdefault(kind, ConfirmationStats()).immediate += 1
+            _LOGGER.debug("Wallbox %s echoed %s in command response", sn, kind)
+        self._tasks[(sn, kind)] = self._hass.async_create_background_task(
+            self._async_confirm(sn, kind, check), f"sems_wallbox_confirm_{kind}_{sn}"
+        )
+
+    def _cancel(self, key: tuple[str, str]) -> None:
+        task = self._tasks.pop(key, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def async_cancel(self, sn: str | None = None) -> None:
+        """Stop confirming commands of one wallbox (or of all)."""
+        for key in [key for key in self._tasks if sn is None or key[0] == sn]:
+            self._cancel(key)
+
+    async def _async_confirm(
+        self, sn: str, kind: str, check: Callable[[WallboxSnapshot], bool]
+    ) -> bool:
+        """Poll until check passes; return True if it was confirmed."""
+        stats = self.stats.setdefault(kind, ConfirmationStats())
+        started = self._clock()
+        attempt = 0
+        try:
+            while True:
+                delay = self._backoff[min(attempt, len(self._backoff) - 1)]
+                attempt += 1
+                if self._clock() - started + delay > self._deadline:
+                    break
+                await self._sleep(delay)
+                stats.polls += 1
+                try:
+                    data = await self._fetch(sn)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.debug("Confirmation poll for %s (%s) failed: %s", sn, kind, err)
+                    continue
+                self._publish(sn, data)
+                if check(data):
+                    latency = self._clock() - started
+                    stats.record(latency)
+                    _LOGGER.debug(
+                        "Wallbox %s confirmed %s after %.1fs (%s polls)",
+                        sn,
+                        kind,
+                        latency,
+                        attempt,
+                    )
+                    return True
+        finally:
+            if self._tasks.get((sn, kind)) is asyncio.current_task():
+                del self._tasks[(sn, kind)]
+
+        stats.timed_out += 1
+        _LOGGER.info(
+            "Wallbox %s did not confirm %s within %.0fs", sn, kind, self._deadline
+        )
+        return False
+
+    def as_dict(self) -> dict:
+        """Return confirmation stats per command type for diagnostics."""
+        return {kind: stats.as_dict() for kind, stats in self.stats.items()}
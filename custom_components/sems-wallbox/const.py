@@ -2,6 +2,9 @@
 
 DOMAIN = "sems-wallbox"
 
+# hass.data[DOMAIN] key holding the per-account client registry
+DATA_ACCOUNTS = "accounts"
+
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_SCAN_INTERVAL
@@ -14,6 +17,30 @@ DEFAULT_SCAN_INTERVAL = 20  # timedelta(seconds=20)
 DEFAULT_SCAN_INTERVAL_IDLE = 60       # seconds, when not charging
 DEFAULT_SCAN_INTERVAL_CHARGING = 30   # seconds, when actively charging
 
+# Adaptive polling around likely transitions and backoff while idle
+CONF_SCAN_INTERVAL_TRANSITION = "scan_interval_transition"
+CONF_SCAN_INTERVAL_MAX = "scan_interval_max"
+
+DEFAULT_SCAN_INTERVAL_TRANSITION = 15  # seconds, plugged in (Fast) or just changed
+DEFAULT_SCAN_INTERVAL_MAX = 600        # seconds, backoff cap while offline / unplugged
+
+# Named polling profiles, a list of dicts (see profiles.py)
+CONF_PROFILES = "profiles"
+
+# Entities that queue an early refresh when they change sharply (see triggers.py)
+CONF_TRIGGERS = "triggers"
+
+# Significant-change filter of the power and current sensors
+CONF_POWER_DEADBAND = "power_deadband"
+CONF_CURRENT_DEADBAND = "current_deadband"
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_HEARTBEAT = "heartbeat"
+
+DEFAULT_POWER_DEADBAND = 0.1    # kW
+DEFAULT_CURRENT_DEADBAND = 0.5  # A
+DEFAULT_DEADBAND_PERCENT = 0    # % of the last published value
+DEFAULT_HEARTBEAT = 300         # seconds, 0 = off
+
 # Validation of the user's configuration
 SEMS_CONFIG_SCHEMA = vol.Schema(
     {
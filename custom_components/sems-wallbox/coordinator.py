@@ -2,122 +2,671 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
-from typing import Any
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_STATION_ID, DEFAULT_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_IDLE, DEFAULT_SCAN_INTERVAL_CHARGING, CONF_SCAN_INTERVAL_CHARGING
+from .const import (
+    DOMAIN,
+    CONF_STATION_ID,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_IDLE,
+    DEFAULT_SCAN_INTERVAL_CHARGING,
+    DEFAULT_SCAN_INTERVAL_TRANSITION,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_CHARGING,
+    CONF_SCAN_INTERVAL_TRANSITION,
+    CONF_SCAN_INTERVAL_MAX,
+)
+from .circuit_breaker import CircuitOpenError
+from .confirmation import ConfirmationScheduler
+from .device import DEVICE_FIELDS, WallboxDevice
+from .polling import PollingIntervals, PollingStateMachine
+from .profiles import PollingProfile, ProfileSelector, profiles_from_options
+from .schedule import PlugInSchedule
+from .rate_limiter import RateLimited, RequestPriority
 from .sems_api import SemsApi, OutOfRetries
+from .snapshot import WallboxSnapshot
+from .triggers import TriggerWatcher, triggers_from_options
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of wallbox status requests in flight at once per account
+MAX_PARALLEL_FETCHES = 4
+# Minimum spacing of refreshes queued by external trigger entities
+TRIGGER_COOLDOWN = 30  # seconds
+# A requested refresh this soon after a fetch reuses its data instead.  Kept
+# below the first confirmation delay so confirmation polls are never skipped.
+REFRESH_MIN_SPACING = 2  # seconds
+# A timer tick also polls the wallboxes due within this much of it, and the
+# next tick is never planned closer than this
+DUE_TOLERANCE = 1  # seconds
 
-class SemsUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinate fetching data from the SEMS Wallbox API."""
+
+class SemsUpdateCoordinator(DataUpdateCoordinator[dict[str, WallboxSnapshot]]):
+    """Coordinate fetching data for all wallboxes of one SEMS account.
+
+    Every config entry of the account registers its serial number; one
+    timer polls them concurrently and merges the results into a single
+    {sn: WallboxSnapshot} mapping.  Each serial has its own next-due time
+    from its polling state machine: a timer tick fetches only the serials
+    that are due and is planned for the earliest due time.  A serial whose
+    fetch fails keeps its last data and is marked stale instead of failing
+    the whole update.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
-        entry: ConfigEntry,
         api: SemsApi,
     ) -> None:
         """Initialize the coordinator."""
         self._hass = hass
         self._api = api
-        self._station_id: str = entry.data[CONF_STATION_ID]
+        # serial -> polling state machine with the cadences of its config entry
+        self._serials: dict[str, PollingStateMachine] = {}
+        # serial -> monotonic time its next poll is due
+        self._due: dict[str, float] = {}
+        # Set while a timer tick runs its update: only due serials are fetched
+        self._scheduled_tick = False
+        # serial -> cadences of its config entry, and its polling profiles
+        self._base_intervals: dict[str, PollingIntervals] = {}
+        self._profiles: dict[str, ProfileSelector] = {}
+        # serial -> watcher of the entities that trigger an early refresh
+        self._triggers: dict[str, TriggerWatcher] = {}
+        # serial -> when its last triggered refresh ran, and its deferred one
+        self._last_triggered_refresh: dict[str, float] = {}
+        self._unsub_triggered_refresh: dict[str, Callable[[], None]] = {}
+        self.trigger_stats = {"fired": 0, "refreshes": 0, "deferred": 0, "merged": 0}
+        self.stale_serials: set[str] = set()
+        self._fetch_semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+
+        # Short polls of one wallbox after a command until it shows up
+        self.confirmations = ConfirmationScheduler(
+            hass, self._async_fetch_confirmation, self._async_publish_serial
+        )
+        # Set while async_request_refresh runs its update: it may be dropped
+        self._refresh_requested = False
+        # Single-flight gate: the update in progress, joined by overlapping
+        # requests, and when each serial was last fetched successfully
+        self._update_in_flight: asyncio.Future[None] | None = None
+        self._last_fetched: dict[str, float] = {}
+        self.refresh_stats = {"requested": 0, "merged": 0, "spaced": 0}
+        # What listeners last saw per serial, for dirty-field tracking
+        self._notified: dict[str, tuple[WallboxSnapshot, bool]] = {}
+        self.notify_stats = {"updates": 0, "skipped": 0, "callbacks": 0}
+        # Device registry info per serial, shared by all platforms
+        self.devices: dict[str, WallboxDevice] = {}
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=None,
+            name="SEMS API wallbox",
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL_IDLE),
+        )
+
+    # ------------------------------------------------------------------
+    # Serial registration
+    # ------------------------------------------------------------------
+
+    @property
+    def serials(self) -> list[str]:
+        """Return the serial numbers polled by this coordinator."""
+        return list(self._serials)
+
+    def _recompute_intervals(self) -> None:
+        """Plan the next timer tick for the wallbox that is due first."""
+        if not self._serials:
+            return
+        now = time.monotonic()
+        next_due = min(self._due.get(sn, now) for sn in self._serials)
+        new_interval = timedelta(seconds=max(round(next_due - now), DUE_TOLERANCE))
+        if new_interval != self.update_interval:
+            self.update_interval = new_interval
+            _LOGGER.debug(
+                "Coordinator polling interval -> %ss (%s)",
+                int(new_interval.total_seconds()),
+                {sn: machine.state for sn, machine in self._serials.items()},
+            )
+
+    @callback
+    def _async_replan(self) -> None:
+        """Recompute the interval and re-arm a running timer if it changed.
+
+        HA only plans the timer after an update or when the first listener
+        subscribes, so changes outside an update must move it themselves.
+        """
+        previous = self.update_interval
+        self._recompute_intervals()
+        if self.update_interval != previous and self._listeners:
+            self._schedule_refresh()
+
+    def _set_due(self, sn: str) -> None:
+        """Plan the next poll of a wallbox one interval from now."""
+        if (machine := self._serials.get(sn)) is not None:
+            self._due[sn] = time.monotonic() + machine.interval
+
+    def _due_serials(self) -> list[str]:
+        """Return the wallboxes whose next poll is due (within DUE_TOLERANCE)."""
+        deadline = time.monotonic() + DUE_TOLERANCE
+        return [sn for sn in self._serials if self._due.get(sn, deadline) <= deadline]
+
+    async def async_add_serial(self, entry: ConfigEntry) -> None:
+        """Register the wallbox of a config entry and fetch it once.
+
+        Raises ConfigEntryNotReady if the first fetch fails.
+        """
+        sn: str = entry.data[CONF_STATION_ID]
 
         # Options take precedence over data, then fall back to default
-        self._interval_idle = int(entry.options.get(
+        interval_idle = int(entry.options.get(
             CONF_SCAN_INTERVAL,
             entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_IDLE),
         ))
-        self._interval_charging = int(entry.options.get(
+        interval_charging = int(entry.options.get(
             CONF_SCAN_INTERVAL_CHARGING,
             DEFAULT_SCAN_INTERVAL_CHARGING,
         ))
+        intervals = PollingIntervals(
+            idle=interval_idle,
+            charging=interval_charging,
+            transition=int(entry.options.get(
+                CONF_SCAN_INTERVAL_TRANSITION, DEFAULT_SCAN_INTERVAL_TRANSITION
+            )),
+            maximum=int(entry.options.get(
+                CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX
+            )),
+        )
+        schedule = await PlugInSchedule.async_load(self.hass, sn)
+        self._serials[sn] = PollingStateMachine(intervals, schedule)
+        self._base_intervals[sn] = intervals
+        self.devices.setdefault(sn, WallboxDevice(sn))
+        if profiles := profiles_from_options(entry.options):
+            selector = ProfileSelector(
+                self.hass,
+                profiles,
+                lambda profile: self._async_apply_profile(sn, profile),
+            )
+            self._profiles[sn] = selector
+            selector.async_start()
+        if triggers := triggers_from_options(entry.options):
+            watcher = TriggerWatcher(
+                self.hass,
+                triggers,
+                lambda entity_id: self.async_trigger_refresh(sn, entity_id),
+            )
+            self._triggers[sn] = watcher
+            watcher.async_start()
 
         _LOGGER.debug(
-            "SEMS coordinator init for station %s with idle_interval=%ss, charging_interval=%ss",
-            self._station_id,
-            self._interval_idle,
-            self._interval_charging,
+            "SEMS coordinator: added wallbox %s (%s), polling %s",
+            sn,
+            intervals,
+            self.serials,
         )
 
-        self._pending_refresh_cancel = None
+        try:
+            result = await self._async_fetch_serial(sn)
+        except Exception as err:  # noqa: BLE001
+            self._async_drop_polling(sn)
+            self.devices.pop(sn, None)
+            self._recompute_intervals()
+            raise ConfigEntryNotReady(
+                f"Error communicating with SEMS API for {sn}: {err}"
+            ) from err
 
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="SEMS API wallbox",
-            update_interval=timedelta(seconds=self._interval_idle),
+        self._set_due(sn)
+        self._async_replan()
+        self._async_publish_serial(sn, result)
+
+    def async_remove_serial(self, sn: str) -> None:
+        """Stop polling a wallbox (its config entry was unloaded)."""
+        self._async_drop_polling(sn)
+        self._notified.pop(sn, None)
+        self.devices.pop(sn, None)
+        self.confirmations.async_cancel(sn)
+        self.stale_serials.discard(sn)
+        self._async_replan()
+        if self.data is not None and sn in self.data:
+            self.data = {k: v for k, v in self.data.items() if k != sn}
+        _LOGGER.debug(
+            "SEMS coordinator: removed wallbox %s, polling %s", sn, self.serials
+        )
+
+    def _async_drop_polling(self, sn: str) -> None:
+        """Forget the polling state of a wallbox, stop its profiles and triggers."""
+        self._serials.pop(sn, None)
+        self._base_intervals.pop(sn, None)
+        self._due.pop(sn, None)
+        self._last_fetched.pop(sn, None)
+        if (selector := self._profiles.pop(sn, None)) is not None:
+            selector.async_stop()
+        if (watcher := self._triggers.pop(sn, None)) is not None:
+            watcher.async_stop()
+        if (unsub := self._unsub_triggered_refresh.pop(sn, None)) is not None:
+            unsub()
+        self._last_triggered_refresh.pop(sn, None)
+
+    @callback
+    def _async_apply_profile(self, sn: str, profile: PollingProfile | None) -> None:
+        """Switch a wallbox to the cadences of a profile and re-plan the timer.
+
+        None restores the cadences of the config entry.
+        """
+        machine = self._serials.get(sn)
+        if machine is None:
+            return
+        base = self._base_intervals[sn]
+        interval = machine.interval
+        machine.set_intervals(profile.intervals(base) if profile else base)
+        _LOGGER.debug(
+            "Wallbox %s polling profile -> %s (%s)",
+            sn,
+            profile.name if profile else None,
+            machine.intervals,
         )
+        # The next poll is one new interval after the last one
+        if sn in self._due:
+            self._due[sn] += machine.interval - interval
+        # Move the pending poll now instead of after the old interval ran out
+        self._async_replan()
 
-    def schedule_delayed_refresh(self, delay: float = 5.0) -> None:
-        """Schedule a one-shot refresh after `delay` seconds.
+    @callback
+    def async_trigger_refresh(self, sn: str, entity_id: str) -> None:
+        """Queue an early refresh of a wallbox because its trigger fired.
 
-        Cancels any previously pending delayed refresh so rapid actions
-        (e.g. slider dragging) don't pile up.
+        Refreshes of one wallbox are at least TRIGGER_COOLDOWN apart: a
+        trigger inside the cooldown defers one refresh to its end, and
+        further triggers are merged into it.  Only that wallbox is fetched,
+        at REFRESH priority, so the account rate limiter may still drop it.
         """
-        if self._pending_refresh_cancel is not None:
-            self._pending_refresh_cancel()
-            self._pending_refresh_cancel = None
+        self.trigger_stats["fired"] += 1
+        if sn in self._unsub_triggered_refresh:
+            self.trigger_stats["merged"] += 1
+            return
+        now = time.monotonic()
+        last = self._last_triggered_refresh.get(sn)
+        if last is not None and now - last < TRIGGER_COOLDOWN:
+            self.trigger_stats["deferred"] += 1
+            _LOGGER.debug(
+                "Refresh of %s triggered by %s deferred by %.0fs",
+                sn,
+                entity_id,
+                TRIGGER_COOLDOWN - (now - last),
+            )
+            self._unsub_triggered_refresh[sn] = async_call_later(
+                self.hass,
+                TRIGGER_COOLDOWN - (now - last),
+                partial(self._async_triggered_refresh, sn),
+            )
+            return
+        _LOGGER.debug("Refresh of %s triggered by %s", sn, entity_id)
+        self._async_triggered_refresh(sn)
 
-        @callback
-        def _do_refresh(_now):
-            self._pending_refresh_cancel = None
-            self.hass.async_create_task(self.async_request_refresh())
+    @callback
+    def _async_triggered_refresh(self, sn: str, _now: Any = None) -> None:
+        self._unsub_triggered_refresh.pop(sn, None)
+        self._last_triggered_refresh[sn] = time.monotonic()
+        self.trigger_stats["refreshes"] += 1
+        self.hass.async_create_task(self._async_refresh_serial(sn))
 
-        self._pending_refresh_cancel = async_call_later(self.hass, delay, _do_refresh)
+    async def _async_refresh_serial(self, sn: str) -> None:
+        """Fetch one wallbox early and publish it without a full update.
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the SEMS API."""
+        Joins an update in flight and skips a wallbox fetched within
+        REFRESH_MIN_SPACING.  The fetch advances the polling state machine
+        and due time of the wallbox like a scheduled poll.
+        """
+        if self._update_in_flight is not None:
+            self.refresh_stats["merged"] += 1
+            await asyncio.shield(self._update_in_flight)
+        if sn not in self._serials or self._fetched_within([sn], REFRESH_MIN_SPACING):
+            return
         try:
-            result = await self._hass.async_add_executor_job(
-                self._api.getData,
-                self._station_id,
-            )
-        except OutOfRetries as err:
-            raise UpdateFailed(
-                f"Too many retries talking to SEMS API: {err}"
-            ) from err
+            result = await self._async_fetch_serial(sn, RequestPriority.REFRESH)
+        except RateLimited as err:
+            # Dropped extra refresh: keep the last data, it is not stale
+            _LOGGER.debug("SEMS refresh of wallbox %s skipped: %s", sn, err)
+            return
         except Exception as err:  # noqa: BLE001
-            raise UpdateFailed(
-                f"Error communicating with SEMS API: {err}"
-            ) from err
+            if sn not in self._serials:
+                return
+            _LOGGER.warning("SEMS refresh failed for wallbox %s: %s", sn, err)
+            self.stale_serials.add(sn)
+            self.async_update_listeners()
+            return
+        if (machine := self._serials.get(sn)) is None:
+            return
+        machine.update(result, dt_util.now())
+        self._set_due(sn)
+        self._async_publish_serial(sn, result)
+        # The timer may have been waiting for this wallbox
+        self._async_replan()
+
+    def polling_state(self, sn: str) -> dict[str, Any] | None:
+        """Return the polling state machine of a wallbox for diagnostics."""
+        machine = self._serials.get(sn)
+        if machine is None:
+            return None
+        selector = self._profiles.get(sn)
+        active = selector.active if selector is not None else None
+        due = self._due.get(sn)
+        return {
+            **machine.as_dict(),
+            "profile": active.name if active else None,
+            "due_in": max(round(due - time.monotonic()), 0) if due is not None else None,
+        }
 
+    def serial_available(self, sn: str) -> bool:
+        """Return True if the last update succeeded for this wallbox."""
+        return (
+            self.last_update_success
+            and sn not in self.stale_serials
+            and sn in (self.data or {})
+        )
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+
+    def _changed_fields(self) -> dict[str, frozenset[str] | None]:
+        """Return {sn: changed fields} since the last notification.
+
+        None means everything changed (new serial, or availability flipped).
+        """
+        changed: dict[str, frozenset[str] | None] = {}
+        data = self.data or {}
+        for sn in set(data) | set(self._notified):
+            snapshot = data.get(sn)
+            available = self.serial_available(sn)
+            previous = self._notified.get(sn)
+            if snapshot is None:
+                self._notified.pop(sn, None)
+                changed[sn] = None
+                continue
+            self._notified[sn] = (snapshot, available)
+            if previous is None or previous[1] != available:
+                changed[sn] = None
+            elif previous[0] is not snapshot:
+                fields = snapshot.changed_fields(previous[0])
+                if fields:
+                    changed[sn] = fields
+        return changed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only listeners whose wallbox fields changed.
+
+        Entities subscribe with a (serial, fields) context; listeners without
+        a context hear about any change.  An update that changes nothing at
+        all (the usual idle poll) skips the fan-out completely.
+        """
+        changed = self._changed_fields()
+        self.notify_stats["updates"] += 1
+        if not changed:
+            self.notify_stats["skipped"] += 1
+            return
+        for sn, fields in changed.items():
+            if fields is None or not fields.isdisjoint(DEVICE_FIELDS):
+                self._async_update_device(sn)
+        for update_callback, context in list(self._listeners.values()):
+            if context is not None:
+                sn, fields = context
+                if sn not in changed:
+                    continue
+                if changed[sn] is not None and changed[sn].isdisjoint(fields):
+                    continue
+            self.notify_stats["callbacks"] += 1
+            update_callback()
+
+    @callback
+    def _async_update_device(self, sn: str) -> None:
+        """Refresh the device info of a wallbox if its metadata changed."""
+        device = self.devices.get(sn)
+        snapshot = (self.data or {}).get(sn)
+        if device is not None and snapshot is not None and device.update(snapshot):
+            device.async_update_registry(self.hass)
+
+    @callback
+    def async_notify_serial(self, sn: str) -> None:
+        """Notify every listener of one wallbox, changed or not.
+
+        Used when state outside the snapshot changed, e.g. a pending command.
+        """
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context[0] == sn:
+                self.notify_stats["callbacks"] += 1
+                update_callback()
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def async_confirm(
+        self, sn: str, kind: str, check: Callable[[WallboxSnapshot], bool]
+    ) -> None:
+        """Poll one wallbox on a short backoff until check passes.
+
+        Used after a command instead of a fixed delayed refresh; the normal
+        polling cadence resumes once the change shows up or the deadline
+        passes.  Latency per command type ends up in diagnostics.
+        """
+        self.confirmations.async_expect(
+            sn, kind, check, (self.data or {}).get(sn)
+        )
+
+    @callback
+    def async_apply_command_state(self, sn: str, state: dict[str, Any]) -> None:
+        """Merge state echoed by a command response into the snapshot.
+
+        Entities see the result of a command without waiting for the next
+        poll; the confirmation poll still reads the full status afterwards.
+        """
+        current = (self.data or {}).get(sn)
+        if not state or current is None:
+            return
+        _LOGGER.debug("Applying command response state for %s: %s", sn, state)
+        self._async_publish_serial(sn, current.merge(state))
+
+    @callback
+    def _async_publish_serial(self, sn: str, result: WallboxSnapshot) -> None:
+        """Merge fresh data of one wallbox into the snapshot.
+
+        Unlike async_set_updated_data this leaves the account poll timer
+        alone: frequent confirmation polls of one wallbox must not keep
+        pushing back the polls of the others.
+        """
+        if sn not in self._serials:
+            return
+        self.stale_serials.discard(sn)
+        self.data = {**(self.data or {}), sn: result}
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Stop pending confirmation polls, then the coordinator."""
+        self.confirmations.async_cancel()
+        for selector in self._profiles.values():
+            selector.async_stop()
+        for watcher in self._triggers.values():
+            watcher.async_stop()
+        while self._unsub_triggered_refresh:
+            self._unsub_triggered_refresh.popitem()[1]()
+        await super().async_shutdown()
+
+    async def async_request_refresh(self) -> None:
+        """Request an extra refresh at low priority, through a single-flight gate.
+
+        A request while an update is in flight waits for that update instead
+        of starting another one, and a request within REFRESH_MIN_SPACING of
+        a fetch of every wallbox (e.g. by a confirmation poll) reuses its
+        data.  Unlike scheduled polls, requested refreshes are dropped by
+        the account rate limiter when the read budget is exhausted.
+
+        The refresh runs right away rather than through HA's debouncer, so
+        its REFRESH priority cannot outlive the request and leak into the
+        next scheduled poll.
+        """
+        self.refresh_stats["requested"] += 1
+        if self._update_in_flight is not None:
+            self.refresh_stats["merged"] += 1
+            await asyncio.shield(self._update_in_flight)
+            return
+        if self._fetched_within(self.serials, REFRESH_MIN_SPACING):
+            self.refresh_stats["spaced"] += 1
+            return
+        self._refresh_requested = True
+        try:
+            await self.async_refresh()
+        finally:
+            self._refresh_requested = False
+
+    async def _handle_refresh_interval(self, _now: datetime | None = None) -> None:
+        """Run a timer tick, which polls only the wallboxes that are due."""
+        self._scheduled_tick = True
+        try:
+            await super()._handle_refresh_interval(_now)
+        finally:
+            self._scheduled_tick = False
+
+    def _fetched_within(self, serials: list[str], seconds: float) -> bool:
+        """Return True if all these wallboxes were fetched in the last seconds."""
+        now = time.monotonic()
+        return bool(serials) and all(
+            now - self._last_fetched.get(sn, float("-inf")) < seconds for sn in serials
+        )
+
+    async def _async_fetch_confirmation(self, sn: str) -> WallboxSnapshot:
+        """Fetch one wallbox for a confirmation poll.
+
+        Joins an update in flight and reuses data fetched within
+        REFRESH_MIN_SPACING, so a command is not polled twice.
+        """
+        if self._update_in_flight is not None:
+            self.refresh_stats["merged"] += 1
+            await asyncio.shield(self._update_in_flight)
+        current = (self.data or {}).get(sn)
+        if current is not None and self._fetched_within([sn], REFRESH_MIN_SPACING):
+            return current
+        return await self._async_fetch_serial(sn)
+
+    async def _async_fetch_serial(
+        self, sn: str, priority: RequestPriority = RequestPriority.READ
+    ) -> WallboxSnapshot:
+        """Fetch and decode one wallbox, raising on any failure."""
+        async with self._fetch_semaphore:
+            result = await self._api.async_get_data(sn, priority=priority)
         if result is None:
             raise UpdateFailed(
                 "No data received from SEMS API, token might be invalid. See debug logs."
             )
+        try:
+            snapshot = WallboxSnapshot.from_dict(result)
+        except ValueError as err:
+            raise UpdateFailed(str(err)) from err
+        self._last_fetched[sn] = time.monotonic()
+        return snapshot
 
-        sn = result.get("sn")
-        if not sn:
-            raise UpdateFailed("Missing 'sn' in SEMS API data")
+    async def _async_update_data(self) -> dict[str, WallboxSnapshot]:
+        """Fetch data for all registered wallboxes, one update at a time."""
+        in_flight = asyncio.get_running_loop().create_future()
+        self._update_in_flight = in_flight
+        try:
+            return await self._async_fetch_all()
+        finally:
+            self._update_in_flight = None
+            in_flight.set_result(None)
 
-        data: dict[str, Any] = {sn: result}
-        _LOGGER.debug(
-            "Coordinator fetched data for wallbox %s: %s",
-            sn,
-            result,
-        )
+    async def _async_fetch_all(self) -> dict[str, WallboxSnapshot]:
+        """Fetch data for the registered wallboxes from the SEMS API.
+
+        A timer tick fetches the wallboxes that are due; any other refresh
+        fetches all of them.
+        """
+        if not self._serials:
+            return {}
 
-        # Dynamic polling: faster while actively charging (power > 0)
-        is_charging = float(result.get("power", 0) or 0) > 0
-        new_interval = timedelta(
-            seconds=self._interval_charging if is_charging else self._interval_idle
+        priority = (
+            RequestPriority.REFRESH if self._refresh_requested else RequestPriority.READ
         )
-        if new_interval != self.update_interval:
-            self.update_interval = new_interval
+        self._refresh_requested = False
+        serials = self._due_serials() if self._scheduled_tick else self.serials
+        self._scheduled_tick = False
+
+        if serials:
+            results = await asyncio.gather(
+                *(self._async_fetch_serial(sn, priority) for sn in serials),
+                return_exceptions=True,
+            )
+        else:
+            results = []
+
+        # Merge into the data as it is now: confirmation polls and triggered
+        # refreshes may have published other wallboxes during the fetch
+        data: dict[str, WallboxSnapshot] = {
+            sn: value for sn, value in (self.data or {}).items() if sn in self._serials
+        }
+        errors: dict[str, BaseException] = {}
+        for sn, result in zip(serials, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, RateLimited) and priority is RequestPriority.REFRESH:
+                # Dropped extra refresh: keep the last data, it is not stale
+                _LOGGER.debug("SEMS refresh of wallbox %s skipped: %s", sn, result)
+                continue
+            self._set_due(sn)
+            if isinstance(result, BaseException):
+                errors[sn] = result
+                self.stale_serials.add(sn)
+                _LOGGER.warning("SEMS update failed for wallbox %s: %s", sn, result)
+                continue
+            self.stale_serials.discard(sn)
+            data[sn] = result
             _LOGGER.debug(
-                "Coordinator polling interval -> %ss (charging=%s)",
-                int(new_interval.total_seconds()),
-                is_charging,
+                "Coordinator fetched data for wallbox %s: %s",
+                sn,
+                result,
             )
 
+        # Fail the update only when no wallbox of the account is readable;
+        # otherwise just the failed ones become unavailable
+        if errors and self.stale_serials.issuperset(self._serials):
+            self._recompute_intervals()
+            err = next(iter(errors.values()))
+            if isinstance(err, OutOfRetries):
+                raise UpdateFailed(
+                    f"Too many retries talking to SEMS API: {err}"
+                ) from err
+            if isinstance(err, CircuitOpenError):
+                raise UpdateFailed(
+                    f"SEMS API paused after repeated failures: {err}"
+                ) from err
+            if isinstance(err, UpdateFailed):
+                raise err
+            raise UpdateFailed(
+                f"Error communicating with SEMS API: {err}"
+            ) from err
+
+        # Adaptive polling: every freshly polled wallbox advances its state
+        # machine and is due again one interval later; the account timer
+        # wakes up for the wallbox due first
+        now = dt_util.now()
+        for sn, result in zip(serials, results):
+            machine = self._serials.get(sn)
+            if machine is not None and isinstance(result, WallboxSnapshot):
+                machine.update(result, now)
+                self._set_due(sn)
+        self._recompute_intervals()
+
         return data
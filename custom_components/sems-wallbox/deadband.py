@@ -0,0 +1,85 @@
+"""Significant-change filter for wallbox readings."""
+
+from __future__ import annotations
+
+import time
+
+
+class DeadbandFilter:
+    """Decide whether a new reading is worth a state write.
+
+    A reading is published when it moves by at least the deadband from the
+    last published value, where the deadband is the larger of `absolute`
+    and `relative` (a fraction of the last published value).  Starting or
+    stopping (a move to or from zero), a change in availability and any
+    change after `heartbeat` seconds are always published, so sessions and
+    their length show up exactly and a slow drift is never hidden for long.
+    """
+
+    def __init__(
+        self,
+        absolute: float = 0.0,
+        relative: float = 0.0,
+        heartbeat: float = 0.0,
+        clock=time.monotonic,
+    ) -> None:
+        """Initialize the filter; 0 disables a threshold."""
+        self.absolute = absolute
+        self.relative = relative
+        self.heartbeat = heartbeat
+        self._clock = clock
+        self._published_at: float | None = None
+        self.value: float | None = None
+        # Latest suppressed reading that differs from the published value
+        self.pending: float | None = None
+        self.has_pending = False
+        self.suppressed = 0
+
+    def accept(self, value: float | None) -> bool:
+        """Return True and remember value if it should be published.
+
+        None stands for an unavailable reading.
+        """
+        now = self._clock()
+        last = self.value
+        if self._published_at is not None and not self._significant(last, value, now):
+            self.suppressed += 1
+            self.has_pending = value != last
+            self.pending = value if self.has_pending else None
+            return False
+        self._publish(value, now)
+        return True
+
+    def heartbeat_delay(self) -> float | None:
+        """Return seconds until a pending reading is due, or None if never."""
+        if not self.heartbeat or not self.has_pending or self._published_at is None:
+            return None
+        return max(0.0, self.heartbeat - (self._clock() - self._published_at))
+
+    def flush(self) -> bool:
+        """Publish a pending reading once the heartbeat is due.
+
+        Called from a timer, since with no new reading accept() never runs.
+        """
+        delay = self.heartbeat_delay()
+        if delay is None or delay > 0:
+            return False
+        self._publish(self.pending, self._clock())
+        return True
+
+    def _publish(self, value: float | None, now: float) -> None:
+        self.value = value
+        self._published_at = now
+        self.pending = None
+        self.has_pending = False
+
+    def _significant(self, last: float | None, value: float | None, now: float) -> bool:
+        if last is None or value is None:
+            return last != value
+        if value == last:
+            return False
+        if (last == 0) != (value == 0):
+            return True
+        if self.heartbeat and now - self._published_at >= self.heartbeat:
+            return True
+        return abs(value - last) >= max(self.absolute, self.relative * abs(last))
@@ -0,0 +1,66 @@
+"""Device registry information shared by all entities of one wallbox."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .snapshot import WallboxSnapshot
+
+# Snapshot fields that end up in the device registry
+DEVICE_FIELDS = frozenset({"name", "model", "firmware"})
+
+
+class WallboxDevice:
+    """Identifiers and metadata of one wallbox, built once per change.
+
+    Every platform of a config entry reads `info` from the same object, so
+    the device dict is not rebuilt each time an entity is asked for it.
+    """
+
+    def __init__(self, sn: str) -> None:
+        """Initialize with placeholders until the first status poll."""
+        self.sn = sn
+        self.identifiers = {(DOMAIN, sn)}
+        self._metadata: tuple[str | None, str | None, str | None] | None = None
+        self.info: dict[str, Any] = self._build_info(None, None, None)
+
+    def _build_info(
+        self, name: str | None, model: str | None, firmware: str | None
+    ) -> dict[str, Any]:
+        return {
+            "identifiers": self.identifiers,
+            "name": name or f"GoodWe Wallbox {self.sn}",
+            "manufacturer": "GoodWe",
+            "model": model or "unknown",
+            "sw_version": firmware or "unknown",
+        }
+
+    def update(self, snapshot: WallboxSnapshot) -> bool:
+        """Take name, model and firmware from a snapshot.
+
+        Returns True if any of them changed since the last call.
+        """
+        metadata = (snapshot.name, snapshot.model, snapshot.firmware)
+        if metadata == self._metadata:
+            return False
+        self._metadata = metadata
+        self.info = self._build_info(*metadata)
+        return True
+
+    @callback
+    def async_update_registry(self, hass: HomeAssistant) -> None:
+        """Push the current metadata to an already registered device."""
+        registry = dr.async_get(hass)
+        device = registry.async_get_device(identifiers=self.identifiers)
+        if device is None:
+            return
+        registry.async_update_device(
+            device.id,
+            name=self.info["name"],
+            model=self.info["model"],
+            sw_version=self.info["sw_version"],
+        )
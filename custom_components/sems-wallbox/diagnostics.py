@@ -0,0 +1,39 @@
+"""Diagnostics support for the GoodWe SEMS Wallbox integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "token", "uid"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    api = runtime["api"]
+    coordinator = runtime["coordinator"]
+    sn = runtime["sn"]
+    snapshot = (coordinator.data or {}).get(sn)
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "api": api.diagnostics(),
+        "account_serials": coordinator.serials,
+        "stale": sn in coordinator.stale_serials,
+        "polling": coordinator.polling_state(sn),
+        "pending": runtime["reconciler"].as_dict(),
+        "confirmations": coordinator.confirmations.as_dict(),
+        "notifications": dict(coordinator.notify_stats),
+        "triggers": dict(coordinator.trigger_stats),
+        "refreshes": dict(coordinator.refresh_stats),
+        "data": dict(snapshot.raw) if snapshot else None,
+    }
@@ -0,0 +1,85 @@
+"""Debouncing, coalescing dispatcher for wallbox commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writes to the same endpoint within this window collapse into the last one
+DEFAULT_WINDOW = 1.0  # seconds
+
+# Endpoint key shared by the charge mode select and the charge power slider
+KEY_CHARGE_MODE = "set_charge_mode"
+
+
+class CommandOutcome(StrEnum):
+    """Result of a dispatched command."""
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"  # a newer write to the same endpoint replaced it
+
+
+class _Pending:
+    """A submitted command waiting for its window to pass."""
+
+    __slots__ = ("superseded",)
+
+    def __init__(self) -> None:
+        self.superseded = False
+
+
+class CommandDispatcher:
+    """Coalesce commands sent to one wallbox.
+
+    Every submit names an endpoint key.  A submit waits `delay` seconds and
+    is then sent unless a newer submit for the same key arrived meanwhile,
+    in which case it returns SUPERSEDED without touching the API.  Sends to
+    the same key never overlap, so the last write is also the last one SEMS
+    receives.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW, sleep=asyncio.sleep) -> None:
+        """Initialize the dispatcher."""
+        self.window = window
+        self._sleep = sleep
+        self._pending: dict[str, _Pending] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.sent = 0
+        self.superseded = 0
+
+    async def async_submit(
+        self,
+        key: str,
+        send: Callable[[], Awaitable[bool]],
+        delay: float | None = None,
+    ) -> CommandOutcome:
+        """Submit a command; `send` is only called if it is still the latest."""
+        pending = _Pending()
+        previous = self._pending.get(key)
+        if previous is not None:
+            previous.superseded = True
+        self._pending[key] = pending
+
+        try:
+            await self._sleep(self.window if delay is None else delay)
+        except asyncio.CancelledError:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            raise
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if pending.superseded:
+                self.superseded += 1
+                _LOGGER.debug("Command %s superseded by a newer write", key)
+                return CommandOutcome.SUPERSEDED
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            self.sent += 1
+            ok = await send()
+        return CommandOutcome.SUCCESS if ok else CommandOutcome.FAILED
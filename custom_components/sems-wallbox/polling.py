@@ -0,0 +1,165 @@
+"""Adaptive polling cadence of a wallbox, driven by its reported state."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+import logging
+
+from .schedule import Outlook, PlugInSchedule
+from .snapshot import MODE_FAST, WallboxSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollState(StrEnum):
+    """What a wallbox is doing, as far as polling is concerned."""
+
+    CHARGING = "charging"
+    STARTING = "starting"  # plugged in, Fast mode: charging should start shortly
+    WAITING = "waiting"  # plugged in, PV mode: waiting for surplus power
+    FINISHED = "finished"
+    UNPLUGGED = "unplugged"
+    OFFLINE = "offline"
+
+
+# States in which nothing is expected to happen soon: back off exponentially
+_BACKOFF_STATES = frozenset({PollState.UNPLUGGED, PollState.OFFLINE})
+# States that also back off during a learned quiet period
+_QUIET_STATES = frozenset({PollState.UNPLUGGED, PollState.WAITING, PollState.FINISHED})
+
+
+def classify(snapshot: WallboxSnapshot) -> PollState:
+    """Return the polling state of a status snapshot.
+
+    Keyed on status, workstate and charge mode; anything unexpected polls
+    at the idle cadence.
+    """
+    if snapshot.is_charging:
+        return PollState.CHARGING
+    if snapshot.state == "offline":
+        return PollState.OFFLINE
+    workstate = snapshot.workstate_state
+    if workstate == "not_plugged_in":
+        return PollState.UNPLUGGED
+    if workstate == "finished_charging":
+        return PollState.FINISHED
+    if workstate == "dash":
+        # Shown by SEMS while a session is being set up or torn down
+        return PollState.STARTING
+    if workstate == "connected":
+        return PollState.STARTING if snapshot.charge_mode == MODE_FAST else PollState.WAITING
+    return PollState.WAITING
+
+
+@dataclass(frozen=True, slots=True)
+class PollingIntervals:
+    """Polling cadences of one wallbox, in seconds."""
+
+    idle: float = 60
+    charging: float = 30
+    # Around likely transitions: plugged in in Fast mode, right after a change
+    transition: float = 15
+    # Upper bound of the backoff while offline or unplugged
+    maximum: float = 600
+
+
+class PollingStateMachine:
+    """Pick the next polling interval of one wallbox from its state.
+
+    Charging and an imminent start poll fast, a plugged-in car waiting for
+    PV or a finished session polls at the idle cadence, and an offline or
+    unplugged wallbox backs off exponentially from the idle cadence up to
+    `maximum`.  The first poll after any state change uses the transition
+    cadence, since one change is often followed by another.
+
+    With a learned schedule, plug-ins and charge starts are recorded, an
+    unplugged wallbox does not back off while one is expected, and idle
+    states back off too during long quiet periods.
+    """
+
+    def __init__(
+        self, intervals: PollingIntervals, schedule: PlugInSchedule | None = None
+    ) -> None:
+        """Initialize the machine; the state is unknown until the first poll."""
+        self.intervals = intervals
+        self.schedule = schedule
+        self.state: PollState | None = None
+        self.outlook = Outlook.NORMAL
+        self.interval: float = intervals.idle
+        self._polls_in_state = 0
+        self.transitions = 0
+
+    def update(self, snapshot: WallboxSnapshot, now: datetime | None = None) -> float:
+        """Feed a polled snapshot; return the interval until the next poll.
+
+        `now` (local time) enables the learned schedule.
+        """
+        state = classify(snapshot)
+        previous = self.state
+        changed = previous is not None and state != previous
+        if state != previous:
+            if changed:
+                self.transitions += 1
+                _LOGGER.debug(
+                    "Wallbox %s polling state %s -> %s", snapshot.sn, previous, state
+                )
+            self.state = state
+            self._polls_in_state = 0
+        else:
+            self._polls_in_state += 1
+        if self.schedule is not None and now is not None:
+            if changed and _is_event(previous, state):
+                self.schedule.record(now)
+            self.outlook = self.schedule.outlook(now)
+        self.interval = self._interval(changed)
+        return self.interval
+
+    def set_intervals(self, intervals: PollingIntervals) -> float:
+        """Switch to other cadences (a polling profile); return the new interval."""
+        self.intervals = intervals
+        if self.state is not None:
+            self.interval = self._interval(False)
+        else:
+            self.interval = intervals.idle
+        return self.interval
+
+    def _interval(self, changed: bool) -> float:
+        intervals = self.intervals
+        if self.state is PollState.CHARGING:
+            interval = intervals.charging
+        elif self.state is PollState.STARTING:
+            interval = intervals.transition
+        elif self.state is PollState.UNPLUGGED and self.outlook is Outlook.EXPECTED:
+            interval = intervals.idle
+        elif self.state in _BACKOFF_STATES or (
+            self.outlook is Outlook.QUIET and self.state in _QUIET_STATES
+        ):
+            interval = min(
+                intervals.idle * 2 ** min(self._polls_in_state, 16),
+                max(intervals.maximum, intervals.idle),
+            )
+        else:
+            interval = intervals.idle
+        if changed:
+            interval = min(interval, intervals.transition)
+        return interval
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the current state for diagnostics."""
+        return {
+            "state": self.state,
+            "interval": self.interval,
+            "polls_in_state": self._polls_in_state,
+            "transitions": self.transitions,
+            "outlook": self.outlook,
+            "learned_events": self.schedule.events if self.schedule else None,
+        }
+
+
+def _is_event(previous: PollState | None, state: PollState) -> bool:
+    """Return True for a plug-in or a charge start."""
+    if state is PollState.CHARGING:
+        return True
+    return previous is PollState.UNPLUGGED and state not in _BACKOFF_STATES
@@ -0,0 +1,195 @@
+"""User-defined polling profiles switched by time windows or entities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from datetime import time
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_change,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_PROFILES
+from .polling import PollingIntervals
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys of one profile in the entry options
+PROFILE_NAME = "name"
+PROFILE_IDLE = "idle"
+PROFILE_CHARGING = "charging"
+PROFILE_OFFLINE = "offline"
+PROFILE_START = "start"
+PROFILE_END = "end"
+PROFILE_ENTITY = "entity_id"
+
+
+def _time(value: Any) -> time | None:
+    if not value:
+        return None
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class PollingProfile:
+    """Named polling cadences, active in a time window and/or by an entity.
+
+    A `schedule` entity activates the profile while it is on, an
+    `input_select` entity while its option equals the profile name.  When
+    both a window and an entity are set, both must match.
+    """
+
+    name: str
+    idle: int
+    charging: int
+    # Cap of the backoff while offline or unplugged
+    offline: int
+    start: time | None = None
+    end: time | None = None
+    entity_id: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PollingProfile:
+        """Build a profile from its entry options."""
+        return cls(
+            name=str(data[PROFILE_NAME]),
+            idle=int(data[PROFILE_IDLE]),
+            charging=int(data[PROFILE_CHARGING]),
+            offline=int(data[PROFILE_OFFLINE]),
+            start=_time(data.get(PROFILE_START)),
+            end=_time(data.get(PROFILE_END)),
+            entity_id=data.get(PROFILE_ENTITY) or None,
+        )
+
+    def intervals(self, base: PollingIntervals) -> PollingIntervals:
+        """Return the entry cadences with this profile applied."""
+        return replace(
+            base, idle=self.idle, charging=self.charging, maximum=self.offline
+        )
+
+    def in_window(self, now: time) -> bool:
+        """Return True if now is inside the time window (or there is none)."""
+        if self.start is None or self.end is None:
+            return True
+        if self.start <= self.end:
+            return self.start <= now < self.end
+        # Window past midnight, e.g. 22:00-06:00
+        return now >= self.start or now < self.end
+
+    def matches(self, now: time, state: str | None) -> bool:
+        """Return True if the profile is active at this time and entity state."""
+        if self.entity_id is None:
+            if self.start is None or self.end is None:
+                return False
+            return self.in_window(now)
+        if self.entity_id.startswith("input_select."):
+            entity_match = state is not None and state.casefold() == self.name.casefold()
+        else:
+            entity_match = state == "on"
+        return entity_match and self.in_window(now)
+
+
+def profiles_from_options(options: Mapping[str, Any]) -> list[PollingProfile]:
+    """Return the valid polling profiles stored in entry options."""
+    profiles = []
+    for data in options.get(CONF_PROFILES, []):
+        try:
+            profiles.append(PollingProfile.from_dict(data))
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid polling profile %s: %s", data, err)
+    return profiles
+
+
+class ProfileSelector:
+    """Track which polling profile of a wallbox is active.
+
+    Re-evaluates at the window boundaries and on state changes of the
+    profile entities, and calls `on_change` only when the active profile
+    changes (None when no profile matches).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        profiles: list[PollingProfile],
+        on_change: Callable[[PollingProfile | None], None],
+    ) -> None:
+        """Initialize the selector; call async_start() to begin tracking."""
+        self._hass = hass
+        self.profiles = profiles
+        self._on_change = on_change
+        self.active: PollingProfile | None = None
+        self._unsubs: list[Callable[[], None]] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start tracking and apply the profile active right now."""
+        boundaries = {
+            boundary
+            for profile in self.profiles
+            for boundary in (profile.start, profile.end)
+            if boundary is not None
+        }
+        for boundary in boundaries:
+            self._unsubs.append(
+                async_track_time_change(
+                    self._hass,
+                    self._async_evaluate,
+                    hour=boundary.hour,
+                    minute=boundary.minute,
+                    second=boundary.second,
+                )
+            )
+        entity_ids = sorted(
+            {profile.entity_id for profile in self.profiles if profile.entity_id}
+        )
+        if entity_ids:
+            self._unsubs.append(
+                async_track_state_change_event(
+                    self._hass, entity_ids, self._async_evaluate
+                )
+            )
+        self._async_evaluate()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def _async_evaluate(self, *_: Any) -> None:
+        """Pick the first matching profile and report a change."""
+        now = dt_util.now().time()
+        active = next(
+            (
+                profile
+                for profile in self.profiles
+                if profile.matches(now, self._state(profile.entity_id))
+            ),
+            None,
+        )
+        if active == self.active:
+            return
+        _LOGGER.debug(
+            "Polling profile %s -> %s",
+            self.active.name if self.active else None,
+            active.name if active else None,
+        )
+        self.active = active
+        self._on_change(active)
+
+    def _state(self, entity_id: str | None) -> str | None:
+        if entity_id is None:
+            return None
+        state = self._hass.states.get(entity_id)
+        return state.state if state is not None else None
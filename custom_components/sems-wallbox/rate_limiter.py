@@ -0,0 +1,197 @@
+"""Per-account rate limiting of SEMS API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+import logging
+import time
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Status reads: bursts of 10, refilled at 30 per minute
+DEFAULT_READ_RATE = 0.5  # requests per second
+DEFAULT_READ_CAPACITY = 10
+# Commands have their own budget so polling can never starve them
+DEFAULT_COMMAND_RATE = 0.2  # requests per second
+DEFAULT_COMMAND_CAPACITY = 5
+
+# Reads and commands wait at most this long for a slot before giving up
+DEFAULT_MAX_WAIT = 30.0  # seconds
+# Pause used for a 429 response without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 60.0  # seconds
+
+
+class RequestPriority(StrEnum):
+    """Priority of a SEMS request, highest first."""
+
+    COMMAND = "command"  # user action: never dropped, own budget
+    READ = "read"  # scheduled poll: waits for a read slot
+    REFRESH = "refresh"  # extra refresh: dropped when no slot is free
+
+
+class RateLimited(HomeAssistantError):
+    """Error to indicate a request was not sent to respect the rate limit."""
+
+    def __init__(self, priority: RequestPriority, retry_in: float) -> None:
+        """Initialize the error."""
+        super().__init__(
+            f"SEMS {priority.value} request rate limited, retry in {retry_in:.0f}s"
+        )
+        self.priority = priority
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay of a Retry-After header (seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` per second."""
+
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self) -> float:
+        """Return seconds until a token is available."""
+        tokens = self.tokens
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self) -> None:
+        """Consume one token."""
+        self._refill()
+        self._tokens -= 1
+
+
+class RateLimiter:
+    """Rate limiter shared by all requests of one SEMS account.
+
+    Reads and commands draw from separate token buckets.  A Retry-After
+    (or bare 429) from SEMS pauses every request until it has passed.
+    Low-priority refreshes are dropped instead of queued, so they never
+    push back a scheduled poll or a user command.
+    """
+
+    def __init__(
+        self,
+        *,
+        read_rate: float = DEFAULT_READ_RATE,
+        read_capacity: int = DEFAULT_READ_CAPACITY,
+        command_rate: float = DEFAULT_COMMAND_RATE,
+        command_capacity: int = DEFAULT_COMMAND_CAPACITY,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        clock=time.monotonic,
+        sleep=asyncio.sleep,
+    ) -> None:
+        """Initialize the limiter."""
+        self._clock = clock
+        self._sleep = sleep
+        self._max_wait = max_wait
+        self._buckets = {
+            RequestPriority.READ: TokenBucket(read_rate, read_capacity, clock),
+            RequestPriority.COMMAND: TokenBucket(
+                command_rate, command_capacity, clock
+            ),
+        }
+        self._locks = {
+            RequestPriority.READ: asyncio.Lock(),
+            RequestPriority.COMMAND: asyncio.Lock(),
+        }
+        self._blocked_until = 0.0
+        self.delayed = 0
+        self.dropped = 0
+        self.throttled = 0
+
+    @property
+    def blocked_for(self) -> float:
+        """Return seconds left of a pause requested by SEMS."""
+        return max(0.0, self._blocked_until - self._clock())
+
+    def note_retry_after(self, seconds: float | None) -> None:
+        """Pause all requests after SEMS answered 429 / Retry-After."""
+        if seconds is None:
+            seconds = DEFAULT_RETRY_AFTER
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        _LOGGER.warning("SEMS asked to slow down, pausing requests for %.0fs", seconds)
+
+    async def async_acquire(self, priority: RequestPriority) -> None:
+        """Wait for a request slot, raising RateLimited if none is granted."""
+        budget = (
+            RequestPriority.COMMAND
+            if priority is RequestPriority.COMMAND
+            else RequestPriority.READ
+        )
+        bucket = self._buckets[budget]
+        lock = self._locks[budget]
+
+        if priority is RequestPriority.REFRESH:
+            wait = max(self.blocked_for, bucket.wait_time())
+            if wait > 0 or lock.locked():
+                self.dropped += 1
+                raise RateLimited(priority, wait)
+            bucket.take()
+            return
+
+        async with lock:
+            delayed = False
+            while (wait := max(self.blocked_for, bucket.wait_time())) > 0:
+                if wait > self._max_wait:
+                    raise RateLimited(priority, wait)
+                if not delayed:
+                    delayed = True
+                    self.delayed += 1
+                    _LOGGER.debug(
+                        "SEMS %s request delayed by %.1fs (rate limit)",
+                        priority.value,
+                        wait,
+                    )
+                await self._sleep(wait)
+            bucket.take()
+
+    def as_dict(self) -> dict:
+        """Return limiter state for diagnostics."""
+        return {
+            "blocked_for": round(self.blocked_for),
+            "read_tokens": round(self._buckets[RequestPriority.READ].tokens, 1),
+            "command_tokens": round(
+                self._buckets[RequestPriority.COMMAND].tokens, 1
+            ),
+            "delayed": self.delayed,
+            "dropped": self.dropped,
+            "throttled": self.throttled,
+        }
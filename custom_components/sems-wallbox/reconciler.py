@@ -0,0 +1,304 @@
+"""Desired-state reconciler for one GoodWe SEMS wallbox."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .confirmation import CONFIRM_DEADLINE
+from .dispatcher import KEY_CHARGE_MODE, CommandDispatcher, CommandOutcome
+from .snapshot import MODE_FAST, WallboxSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+KEY_POWER_CONTROL = "change_status"
+
+MODE = "mode"
+POWER = "power"
+CHARGING = "charging"
+
+_DEFAULT_MIN_POWER = 4.2
+_DEFAULT_MAX_POWER = 11.0
+
+
+def _same_power(a: float | None, b: float | None) -> bool:
+    """Compare two charge powers at the 0.1 kW slider resolution."""
+    return a is not None and b is not None and abs(a - b) < 0.05
+
+
+@dataclass
+class _Target:
+    """A desired value waiting to be confirmed by a poll."""
+
+    value: Any
+    set_at: float
+
+
+class WallboxReconciler:
+    """Hold the desired state of one wallbox and converge SEMS towards it.
+
+    Entities do not talk to the API themselves: they record what the user
+    wants (charge mode, charge power, charging on/off) and read back the
+    effective state, which is the desired value while it is pending and the
+    polled value otherwise.  Each change is turned into the smallest set of
+    API calls that makes the polled state match; mode and power share one
+    SetChargeMode call.
+    """
+
+    def __init__(
+        self,
+        coordinator,
+        api,
+        sn: str,
+        dispatcher: CommandDispatcher,
+        clock=time.monotonic,
+    ) -> None:
+        """Initialize the reconciler."""
+        self._coordinator = coordinator
+        self._api = api
+        self.sn = sn
+        self._dispatcher = dispatcher
+        self._clock = clock
+        self._targets: dict[str, _Target] = {}
+        # field -> cancels the timer that drops its target at the deadline
+        self._expiry: dict[str, Callable[[], None]] = {}
+        # Last charge power used in Fast mode; PV modes report a stale value
+        self._fast_power: float | None = None
+        if self._actual(MODE) == MODE_FAST:
+            self._fast_power = self._actual(POWER)
+
+    # ------------------------------------------------------------------
+    # Polled and effective state
+    # ------------------------------------------------------------------
+
+    @property
+    def data(self) -> WallboxSnapshot | None:
+        """Return the last polled snapshot of this wallbox."""
+        return (self._coordinator.data or {}).get(self.sn)
+
+    def _actual(self, field: str, data: WallboxSnapshot | None = None):
+        """Return a field of the last polled state (or of the given snapshot)."""
+        if data is None:
+            data = self.data
+        if data is None:
+            return False if field == CHARGING else None
+        if field == MODE:
+            return data.charge_mode
+        if field == POWER:
+            return data.set_charge_power
+        return data.is_charging
+
+    def _confirmed(self, field: str, value, data: WallboxSnapshot | None = None) -> bool:
+        """Return True if the polled state already matches value."""
+        if field == POWER:
+            return self._actual(MODE, data) == MODE_FAST and _same_power(
+                self._actual(POWER, data), value
+            )
+        return self._actual(field, data) == value
+
+    def _target(self, field: str) -> _Target | None:
+        """Return the pending target of a field, dropping it once settled."""
+        target = self._targets.get(field)
+        if target is None:
+            return None
+        if self._confirmed(field, target.value):
+            _LOGGER.debug("Wallbox %s: %s=%s confirmed", self.sn, field, target.value)
+        elif self._clock() - target.set_at > CONFIRM_DEADLINE:
+            self._log_expired(field, target)
+        else:
+            return target
+        self._remove_target(field)
+        return None
+
+    def _log_expired(self, field: str, target: _Target) -> None:
+        _LOGGER.warning(
+            "Wallbox %s: %s=%s not confirmed within %ss, accepting polled %s",
+            self.sn,
+            field,
+            target.value,
+            CONFIRM_DEADLINE,
+            self._actual(field),
+        )
+
+    @property
+    def charge_mode(self) -> int | None:
+        """Return the effective charge mode."""
+        target = self._target(MODE)
+        return target.value if target is not None else self._actual(MODE)
+
+    @property
+    def charge_power(self) -> float | None:
+        """Return the effective charge power limit (kW) for Fast mode."""
+        target = self._target(POWER)
+        if target is not None:
+            return target.value
+        actual = self._actual(POWER)
+        if self._actual(MODE) == MODE_FAST and actual is not None:
+            self._fast_power = actual
+            return actual
+        return self._fast_power if self._fast_power is not None else actual
+
+    @property
+    def charging(self) -> bool:
+        """Return the effective charging on/off state."""
+        target = self._target(CHARGING)
+        return target.value if target is not None else self._actual(CHARGING)
+
+    def _fast_mode_power(self) -> float:
+        """Return the power to send with Fast mode, clamped to the wallbox range."""
+        data = self.data
+        low = (data and data.min_charge_power) or _DEFAULT_MIN_POWER
+        high = (data and data.max_charge_power) or _DEFAULT_MAX_POWER
+        power = self.charge_power
+        if power is None or not low <= power <= high:
+            return low
+        return power
+
+    def as_dict(self) -> dict:
+        """Return pending targets for diagnostics."""
+        now = self._clock()
+        return {
+            field: {"value": target.value, "age": round(now - target.set_at, 1)}
+            for field, target in self._targets.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Desired state
+    # ------------------------------------------------------------------
+
+    def _put_target(self, field: str, value) -> None:
+        """Hold a desired value until a poll confirms it or the deadline passes.
+
+        Entities only re-read their state when the wallbox data changes, so
+        a timer drops an unconfirmed target at the deadline and notifies
+        them; otherwise a stuck optimistic state would never be corrected.
+        """
+        target = _Target(value, self._clock())
+        self._targets[field] = target
+        self._cancel_expiry(field)
+        self._expiry[field] = async_call_later(
+            self._coordinator.hass,
+            CONFIRM_DEADLINE,
+            partial(self._async_expire, field, target),
+        )
+
+    @callback
+    def _async_expire(self, field: str, target: _Target, _now: Any = None) -> None:
+        """Drop a target that was not confirmed in time and show the poll."""
+        self._expiry.pop(field, None)
+        if self._targets.get(field) is not target:
+            return
+        if not self._confirmed(field, target.value):
+            self._log_expired(field, target)
+        del self._targets[field]
+        self._coordinator.async_notify_serial(self.sn)
+
+    def _cancel_expiry(self, field: str) -> None:
+        if (cancel := self._expiry.pop(field, None)) is not None:
+            cancel()
+
+    def _remove_target(self, field: str) -> None:
+        del self._targets[field]
+        self._cancel_expiry(field)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop the deadline timers (the config entry is unloaded)."""
+        for field in list(self._expiry):
+            self._cancel_expiry(field)
+
+    def _set_target(self, field: str, value) -> None:
+        self._put_target(field, value)
+        self._coordinator.async_notify_serial(self.sn)
+
+    def _drop_target(self, field: str, value) -> None:
+        """Forget a target after its command failed, unless it was replaced."""
+        target = self._targets.get(field)
+        if target is not None and target.value == value:
+            self._remove_target(field)
+
+    async def async_set_charge_mode(self, mode: int) -> CommandOutcome:
+        """Request a charge mode; sent right away."""
+        if mode == MODE_FAST:
+            # Pin the power that goes with Fast mode so the slider shows it
+            self._put_target(POWER, self._fast_mode_power())
+        self._set_target(MODE, mode)
+        return await self._dispatcher.async_submit(
+            KEY_CHARGE_MODE, self._async_apply_charge_mode, delay=0
+        )
+
+    async def async_set_charge_power(self, power: float) -> CommandOutcome:
+        """Request a Fast mode charge power; debounced by the dispatcher."""
+        self._fast_power = power
+        self._set_target(POWER, power)
+        return await self._dispatcher.async_submit(
+            KEY_CHARGE_MODE, self._async_apply_charge_mode
+        )
+
+    async def async_set_charging(self, on: bool) -> CommandOutcome:
+        """Request charging to start or stop."""
+        self._set_target(CHARGING, on)
+        return await self._dispatcher.async_submit(
+            KEY_POWER_CONTROL, self._async_apply_charging, delay=0
+        )
+
+    # ------------------------------------------------------------------
+    # Convergence
+    # ------------------------------------------------------------------
+
+    async def _async_apply_charge_mode(self) -> bool:
+        """Send one SetChargeMode call if mode or power differ from the poll."""
+        mode = self.charge_mode
+        if mode is None:
+            return True
+        power = self._fast_mode_power() if mode == MODE_FAST else None
+        if self._confirmed(MODE, mode) and (
+            mode != MODE_FAST or self._confirmed(POWER, power)
+        ):
+            _LOGGER.debug(
+                "Wallbox %s already at mode=%s power=%s, nothing to send",
+                self.sn,
+                mode,
+                power,
+            )
+            return True
+
+        # For PV modes charge_power must NOT be sent, SEMS would revert to Fast
+        result = await self._api.async_set_charge_mode(self.sn, mode, power)
+        if not result.ok:
+            self._drop_target(MODE, mode)
+            self._drop_target(POWER, power)
+            self._coordinator.async_notify_serial(self.sn)
+            return False
+        self._coordinator.async_apply_command_state(self.sn, result.state)
+        self._coordinator.async_confirm(
+            self.sn,
+            KEY_CHARGE_MODE,
+            lambda data: self._confirmed(MODE, mode, data)
+            and (mode != MODE_FAST or self._confirmed(POWER, power, data)),
+        )
+        return True
+
+    async def _async_apply_charging(self) -> bool:
+        """Send a start/stop command if charging differs from the poll."""
+        on = self.charging
+        if self._confirmed(CHARGING, on):
+            _LOGGER.debug("Wallbox %s already charging=%s, nothing to send", self.sn, on)
+            return True
+        result = await self._api.async_change_status(self.sn, 1 if on else 2)
+        if not result.ok:
+            self._drop_target(CHARGING, on)
+            self._coordinator.async_notify_serial(self.sn)
+            return False
+        self._coordinator.async_apply_command_state(self.sn, result.state)
+        self._coordinator.async_confirm(
+            self.sn, KEY_POWER_CONTROL, lambda data: self._confirmed(CHARGING, on, data)
+        )
+        return True
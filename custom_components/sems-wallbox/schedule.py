@@ -0,0 +1,106 @@
+"""Learned weekly schedule of plug-in and charge-start events of a wallbox."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from enum import StrEnum
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEDULE_STORAGE_VERSION = 1
+# Coalesce the writes of events that arrive close together
+SCHEDULE_SAVE_DELAY = 60  # seconds
+
+HOURS_PER_WEEK = 168
+# Every new event scales the older ones down, so a changed routine takes
+# over within a few weeks
+EVENT_DECAY = 0.97
+# Below this many events the schedule has no opinion
+MIN_EVENTS = 6
+# Share of all events in the current and next hour that makes an event expected
+EXPECTED_SHARE = 0.05
+# Hours on either side with (almost) no events make a quiet period
+QUIET_MARGIN = 3
+QUIET_SHARE = 0.01
+
+
+class Outlook(StrEnum):
+    """What the schedule expects around a point in time."""
+
+    EXPECTED = "expected"  # an event usually happens now or within the hour
+    NORMAL = "normal"  # not enough data, or nothing conclusive
+    QUIET = "quiet"  # no events seen for hours around this time of week
+
+
+def hour_of_week(when: datetime) -> int:
+    """Return 0 (Monday 00:00–00:59) to 167 (Sunday 23:00–23:59)."""
+    return when.weekday() * 24 + when.hour
+
+
+class PlugInSchedule:
+    """Hour-of-week histogram of when a car is plugged in or starts charging.
+
+    168 decaying counters are all that is kept; they are saved to HA storage
+    so the schedule survives restarts.
+    """
+
+    def __init__(
+        self,
+        store: Store | None = None,
+        data: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Initialize from stored data, or empty."""
+        self._store = store
+        data = data or {}
+        bins = data.get("bins")
+        if not isinstance(bins, list) or len(bins) != HOURS_PER_WEEK:
+            data, bins = {}, [0.0] * HOURS_PER_WEEK
+        self.bins: list[float] = [float(value) for value in bins]
+        self.events = int(data.get("events", 0))
+
+    @classmethod
+    async def async_load(cls, hass: HomeAssistant, sn: str) -> PlugInSchedule:
+        """Return the stored schedule of a wallbox (empty if there is none)."""
+        store: Store = Store(hass, SCHEDULE_STORAGE_VERSION, f"{DOMAIN}.schedule.{sn}")
+        try:
+            data = await store.async_load()
+        except Exception as exc:  # noqa: BLE001
+            _LOGGER.warning("Unable to load the learned schedule of %s: %s", sn, exc)
+            data = None
+        return cls(store, data if isinstance(data, dict) else None)
+
+    def record(self, when: datetime) -> None:
+        """Count an event at this time of week and schedule a save."""
+        self.bins = [value * EVENT_DECAY for value in self.bins]
+        self.bins[hour_of_week(when)] += 1.0
+        self.events += 1
+        if self._store is not None:
+            self._store.async_delay_save(self.as_dict, SCHEDULE_SAVE_DELAY)
+
+    def outlook(self, when: datetime) -> Outlook:
+        """Return whether an event is expected around this time of week."""
+        if self.events < MIN_EVENTS:
+            return Outlook.NORMAL
+        total = sum(self.bins)
+        hour = hour_of_week(when)
+
+        def share(hours: range) -> float:
+            return sum(self.bins[h % HOURS_PER_WEEK] for h in hours) / total
+
+        if share(range(hour, hour + 2)) >= EXPECTED_SHARE:
+            return Outlook.EXPECTED
+        if share(range(hour - QUIET_MARGIN, hour + QUIET_MARGIN + 1)) < QUIET_SHARE:
+            return Outlook.QUIET
+        return Outlook.NORMAL
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"bins": [round(value, 4) for value in self.bins], "events": self.events}
@@ -1,26 +1,78 @@
+import asyncio
+from dataclasses import asdict, dataclass, field
 import json
 import logging
+import time
+from typing import Any
+from urllib.parse import urlsplit
 
-import requests
+import aiohttp
 from homeassistant import exceptions
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.util.json import json_loads
+from homeassistant.util.ssl import get_default_context
 
-_LOGGER = logging.getLogger(__name__)
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .rate_limiter import RateLimited, RateLimiter, RequestPriority, parse_retry_after
+from .snapshot import STATUS_KEYS
 
-API_VERSION = "0.4.2"
+_LOGGER = logging.getLogger(__name__)
 
-_LoginURL = "https://www.semsportal.com/api/v3/Common/CrossLogin"
+API_VERSION = "0.6.0"
+
+# Global front end; CrossLogin always goes here and returns the regional
+# API base URL (e.g. https://eu.semsportal.com/api/) in its "api" field.
+_GlobalBaseURL = "https://www.semsportal.com/api/"
+_LoginPath = "v3/Common/CrossLogin"
+_LoginURL = _GlobalBaseURL + _LoginPath
+
+# Only regional hosts under this domain are trusted with the token
+_TrustedDomain = "semsportal.com"
+
+# After a connection error on the regional host, use the global host for this long
+_RegionalFallbackCooldown = 600  # seconds
+
+# v3/v4 endpoints for reading wallbox status (relative to the API base URL)
+_WallboxPath_V3 = "v3/EvCharger/GetCurrentChargeinfo"
+_WallboxPath_V4 = "v4/EvCharger/GetEvChargerMoreView"
+
+# Status endpoints in order of preference.  Each serial is probed once and
+# the first endpoint returning every key the snapshot reads is cached; the
+# last entry (v3, the long-standing default) is the fallback and is accepted
+# whenever it returns data.
+_StatusPaths = (_WallboxPath_V4, _WallboxPath_V3)
+_RequiredStatusFields = STATUS_KEYS
+_EndpointRecheckInterval = 24 * 3600  # seconds
+
+# Status fields a command response may echo back, mapped to their names in
+# the status data.  Values that do not look like status data are ignored.
+_CommandStateFields = {
+    "chargeMode": "chargeMode",
+    "charge_power": "set_charge_power",
+    "set_charge_power": "set_charge_power",
+    "status": "status",
+    "power": "power",
+}
+_StatusPrefix = "EVDetail_Status_"
 
-# v3/v4 endpoints for reading wallbox status
-_WallboxURL_V3 = "https://www.semsportal.com/api/v3/EvCharger/GetCurrentChargeinfo"
-_WallboxURL_V4 = "https://www.semsportal.com/api/v4/EvCharger/GetEvChargerMoreView"
+_SetChargeModePath = "v3/EvCharger/SetChargeMode"
+_PowerControlPath = "v3/EvCharger/Charging"
 
-# Toggle: set to True to prefer v4 endpoint (with automatic fallback to v3)
-_USE_V4_STATUS = False
+_RequestTimeout = aiohttp.ClientTimeout(total=30)  # seconds
 
-_SetChargeModeURL = "https://www.semsportal.com/api/v3/EvCharger/SetChargeMode"
-_PowerControlURL = "https://www.semsportal.com/api/v3/EvCharger/Charging"
+# Renew the login token in the background once it is this old, and wait at
+# least _TokenProactiveRetry between attempts if such a renewal fails.
+_TokenRefreshAge = 12 * 3600  # seconds
+_TokenProactiveRetry = 600  # seconds
+# After a failed CrossLogin, callers without a token get None for this long
+# instead of each sending another login (e.g. with wrong credentials).
+_LoginFailureCooldown = 30  # seconds
 
-_RequestTimeout = 30  # seconds
+# Connection pool tuning: keep sockets to semsportal.com open between polls
+# (keep-alive must outlive the 60 s idle poll interval) and cache DNS.
+_PoolLimitPerHost = 4
+_KeepAliveTimeout = 75  # seconds
+_DnsCacheTTL = 300  # seconds
 
 _DefaultHeaders = {
     "Content-Type": "application/json",
@@ -29,41 +81,274 @@ _DefaultHeaders = {
 }
 
 
+def _regional_base_url(api) -> str | None:
+    """Return the regional API base URL from a login token, if trustworthy."""
+    if not isinstance(api, str) or not api:
+        return None
+    parts = urlsplit(api)
+    host = (parts.hostname or "").lower()
+    if parts.scheme != "https" or not (
+        host == _TrustedDomain or host.endswith("." + _TrustedDomain)
+    ):
+        return None
+    return api if api.endswith("/") else api + "/"
+
+
+def _is_auth_expired(resp_json) -> bool:
+    """Return True if a SEMS JSON response reports an expired token."""
+    return (
+        isinstance(resp_json, dict)
+        and resp_json.get("data") is None
+        and "authorization has expired" in str(resp_json.get("msg", "")).lower()
+    )
+
+
+@dataclass
+class ConnectionStats:
+    """Counters collected from aiohttp tracing on the SEMS connection pool."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    handshake_time_total: float = 0.0
+    last_handshake_time: float | None = None
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served on an already open connection."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    @property
+    def avg_handshake_time(self) -> float | None:
+        """Average TCP+TLS connect time in seconds."""
+        if not self.connections_created:
+            return None
+        return self.handshake_time_total / self.connections_created
+
+    def as_dict(self) -> dict:
+        """Return stats for diagnostics."""
+        return {
+            **asdict(self),
+            "reuse_ratio": round(self.reuse_ratio, 3),
+            "avg_handshake_time": self.avg_handshake_time,
+        }
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    """Outcome of a wallbox command.
+
+    `state` holds the status fields SEMS echoed back in the response (keyed
+    like the status data, e.g. chargeMode, set_charge_power, status); it is
+    empty when the response carried none.
+    """
+
+    ok: bool
+    state: dict[str, Any] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        """Return True if the command was accepted."""
+        return self.ok
+
+
 class SemsApi:
     """Interface to the SEMS API."""
 
-    def __init__(self, hass, username, password):
-        """Init SEMS API wrapper."""
+    def __init__(self, hass, username, password, session=None, token_store=None):
+        """Init SEMS API wrapper.
+
+        Unless a session is passed explicitly, the wrapper owns a pooled
+        keep-alive session to semsportal.com which must be released with
+        async_close(); HA closing closes it too, since config entries are
+        not unloaded on shutdown.  If a token_store (HA Store) is given, the login
+        token survives restarts; see async_load_token().
+        """
         self._hass = hass
         self._username = username
         self._password = password
-        self._token: dict | None = None
-        _LOGGER.info(
-            "SEMS API wrapper v%s initialized (status via %s)",
+        self._session: aiohttp.ClientSession | None = session
+        self._owns_session = session is None
+        self._unsub_close = None
+        self.token_manager = TokenManager(
+            hass, self._async_fetch_login_token, token_store
+        )
+        self.connection_stats = ConnectionStats()
+        self._regional_fallback_until = 0.0
+        self._status_endpoints: dict[str, StatusEndpoint] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.rate_limiter = RateLimiter()
+        _LOGGER.info("SEMS API wrapper v%s initialized", API_VERSION)
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Return a TraceConfig feeding self.connection_stats."""
+        stats = self.connection_stats
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            stats.requests += 1
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.monotonic()
+
+        async def on_connection_create_end(session, ctx, params):
+            elapsed = time.monotonic() - ctx.connect_started
+            stats.connections_created += 1
+            stats.handshake_time_total += elapsed
+            stats.last_handshake_time = elapsed
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats.connections_reused += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            stats.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            stats.dns_cache_misses += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use."""
+        if self._session is None or (self._owns_session and self._session.closed):
+            # A single SSL context shared by all pooled connections; together
+            # with keep-alive this avoids a full TLS handshake on every poll.
+            connector = aiohttp.TCPConnector(
+                limit_per_host=_PoolLimitPerHost,
+                keepalive_timeout=_KeepAliveTimeout,
+                ttl_dns_cache=_DnsCacheTTL,
+                ssl=get_default_context(),
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self._build_trace_config()],
+            )
+            self._owns_session = True
+            if self._unsub_close is None:
+                self._unsub_close = self._hass.bus.async_listen_once(
+                    EVENT_HOMEASSISTANT_CLOSE, self._async_close_at_stop
+                )
+            _LOGGER.debug("SEMS v%s - created pooled client session", API_VERSION)
+        return self._session
+
+    async def _async_close_at_stop(self, _event) -> None:
+        """Close the pooled session when HA shuts down."""
+        self._unsub_close = None
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the pooled session if this wrapper owns it."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+        _LOGGER.debug(
+            "SEMS v%s - client session closed, connection stats: %s",
             API_VERSION,
-            "v4" if _USE_V4_STATUS else "v3",
+            self.connection_stats.as_dict(),
         )
 
+    def diagnostics(self) -> dict:
+        """Return client state for config entry diagnostics."""
+        return {
+            "base_url": self.base_url(),
+            "connection": self.connection_stats.as_dict(),
+            "token": self.token_manager.as_dict(),
+            "status_endpoints": {
+                sn: endpoint.as_dict()
+                for sn, endpoint in self._status_endpoints.items()
+            },
+            "circuit_breakers": {
+                path: breaker.as_dict() for path, breaker in self._breakers.items()
+            },
+            "rate_limiter": self.rate_limiter.as_dict(),
+        }
+
+    async def _async_post(
+        self, url: str, headers: dict, payload: dict
+    ) -> tuple[int, dict | None, str]:
+        """POST a JSON payload and return (status, json or None, text)."""
+        async with self._get_session().post(
+            url, headers=headers, json=payload, timeout=_RequestTimeout
+        ) as response:
+            if response.status == 429 or (
+                response.status == 503 and "Retry-After" in response.headers
+            ):
+                self.rate_limiter.note_retry_after(
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
+            text = await response.text()
+            try:
+                resp_json = json_loads(text) if text else None
+            except ValueError:
+                resp_json = None
+            return response.status, resp_json, text
+
+    def _breaker(self, path: str) -> CircuitBreaker:
+        """Return the circuit breaker of an API path, creating it on first use."""
+        breaker = self._breakers.get(path)
+        if breaker is None:
+            breaker = self._breakers[path] = CircuitBreaker(path)
+        return breaker
+
+    async def _async_guarded(self, path: str, request) -> tuple[int, dict | None, str]:
+        """Await request() through the circuit breaker of `path`.
+
+        Raises CircuitOpenError without sending anything while the endpoint
+        is considered down.  Transport errors and HTTP 5xx count as failures.
+        """
+        breaker = self._breaker(path)
+        breaker.before_call()
+        try:
+            status, resp_json, text = await request()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as err:
+            breaker.record_failure(f"{type(err).__name__}: {err}")
+            raise
+        if status >= 500:
+            breaker.record_failure(f"HTTP {status}")
+        else:
+            breaker.record_success()
+        return status, resp_json, text
+
     # ------------------------------------------------------------------
     # Token handling
     # ------------------------------------------------------------------
 
-    def _fetch_login_token(self) -> dict | None:
+    async def _async_fetch_login_token(self) -> dict | None:
         """Call CrossLogin and return token dict or None."""
         try:
             _LOGGER.debug("SEMS v%s - Getting API token", API_VERSION)
-            login_data = json.dumps(
-                {"account": self._username, "pwd": self._password}
+            status, json_response, text = await self._async_guarded(
+                _LoginPath,
+                lambda: self._async_post(
+                    _LoginURL,
+                    _DefaultHeaders,
+                    {"account": self._username, "pwd": self._password},
+                ),
             )
-            login_response = requests.post(
-                _LoginURL,
-                headers=_DefaultHeaders,
-                data=login_data,
-                timeout=_RequestTimeout,
-            )
-            _LOGGER.debug("Login Response: %s", login_response)
-            login_response.raise_for_status()
-            json_response = login_response.json()
+            _LOGGER.debug("Login Response: HTTP %s", status)
+            if status != 200 or not isinstance(json_response, dict):
+                _LOGGER.error(
+                    "SEMS login failed (HTTP %s), response: %s", status, text
+                )
+                return None
             _LOGGER.debug("Login JSON response %s", json_response)
 
             if json_response.get("hasError") or json_response.get("code") not in (0, None):
@@ -77,44 +362,108 @@ class SemsApi:
             token_dict["api"] = json_response.get("api")
             _LOGGER.debug("SEMS - API Token received: %s", token_dict)
             return token_dict
+        except (CircuitOpenError, asyncio.CancelledError):
+            raise
         except Exception as exc:  # noqa: BLE001
             _LOGGER.error("Unable to fetch login token from SEMS API. %s", exc)
             return None
 
-    def _ensure_token(self, renew: bool = False) -> bool:
-        """Ensure we have a valid token in self._token."""
-        if self._token is None or renew:
-            _LOGGER.debug(
-                "SEMS v%s - fetching new token (token_is_none=%s, renew=%s)",
-                API_VERSION,
-                self._token is None,
-                renew,
-            )
-            token = self._fetch_login_token()
-            if token is None:
-                self._token = None
-                return False
-            self._token = token
-        return True
+    async def async_load_token(self) -> bool:
+        """Restore a previously persisted token, if any.
 
-    def _build_headers(self) -> dict:
-        """Build request headers with current token."""
-        if not self._ensure_token():
-            raise OutOfRetries("Could not obtain SEMS token")
+        The restored token is used as-is; a new CrossLogin only happens once
+        SEMS answers "authorization has expired".
+        """
+        return await self.token_manager.async_load()
+
+    @staticmethod
+    def _build_headers(token: dict) -> dict:
+        """Build request headers with the given token."""
         return {
             "Content-Type": "application/json",
             "Accept": "application/json",
-            "token": json.dumps(self._token),
+            "token": json.dumps(token),
         }
 
+    def base_url(self, token: dict | None = None) -> str:
+        """Return the API base URL requests are currently sent to."""
+        if token is None:
+            token = self.token_manager.token
+        if time.monotonic() < self._regional_fallback_until:
+            return _GlobalBaseURL
+        return _regional_base_url((token or {}).get("api")) or _GlobalBaseURL
+
+    async def _async_call(
+        self,
+        path: str,
+        payload: dict,
+        maxTokenRetries: int = 1,
+        priority: RequestPriority = RequestPriority.READ,
+    ) -> tuple[int, dict | None, str]:
+        """POST to an API path with the shared token, renewing it once on expiry.
+
+        Requests go to the regional host returned by CrossLogin; if it
+        cannot be reached the call is repeated on the global host.
+        Concurrent callers that hit the same expired token all wait on a
+        single CrossLogin (see TokenManager.async_refresh).  Every path has
+        its own circuit breaker; CircuitOpenError is raised while it is open.
+        Every request first takes a slot of the account's rate limiter and
+        RateLimited is raised if `priority` does not get one.
+        """
+        if maxTokenRetries < 0:
+            _LOGGER.info("SEMS - Maximum token fetch tries reached, aborting for now")
+            raise OutOfRetries
+
+        await self.rate_limiter.async_acquire(priority)
+
+        token = await self.token_manager.async_get_token()
+        if token is None:
+            raise OutOfRetries("Could not obtain SEMS token")
+
+        headers = self._build_headers(token)
+        base_url = self.base_url(token)
+
+        async def _send():
+            try:
+                return await self._async_post(base_url + path, headers, payload)
+            except aiohttp.ClientConnectionError as err:
+                if base_url == _GlobalBaseURL:
+                    raise
+                _LOGGER.warning(
+                    "SEMS regional host %s unreachable (%s), using %s for %ss",
+                    base_url,
+                    err,
+                    _GlobalBaseURL,
+                    _RegionalFallbackCooldown,
+                )
+                self._regional_fallback_until = (
+                    time.monotonic() + _RegionalFallbackCooldown
+                )
+                return await self._async_post(_GlobalBaseURL + path, headers, payload)
+
+        status, resp_json, text = await self._async_guarded(path, _send)
+
+        if _is_auth_expired(resp_json):
+            _LOGGER.debug(
+                "SEMS - Authorization expired for %s, retrying with fresh token, remaining retries: %s",
+                path,
+                maxTokenRetries,
+            )
+            await self.token_manager.async_refresh(rejected=token)
+            return await self._async_call(
+                path, payload, maxTokenRetries - 1, priority
+            )
+
+        return status, resp_json, text
+
     # ------------------------------------------------------------------
     # Public helpers
     # ------------------------------------------------------------------
 
-    def test_authentication(self) -> bool:
+    async def async_test_authentication(self) -> bool:
         """Test if we can authenticate with the host."""
         try:
-            ok = self._ensure_token(renew=True)
+            ok = await self.token_manager.async_refresh(force=True) is not None
             _LOGGER.debug(
                 "SEMS v%s - test_authentication result: %s", API_VERSION, ok
             )
@@ -123,100 +472,131 @@ class SemsApi:
             _LOGGER.exception("SEMS Authentication exception: %s", exc)
             return False
 
-    def _resolve_status_url(self) -> str:
-        """Return the correct status URL based on toggle."""
-        return _WallboxURL_V4 if _USE_V4_STATUS else _WallboxURL_V3
+    @staticmethod
+    def _parse_status_response(status, json_response, text):
+        """Return the data dict of a status response, or None."""
+        if status != 200 or not isinstance(json_response, dict):
+            _LOGGER.debug(
+                "SEMS status response not usable (HTTP %s), response: %s",
+                status,
+                text,
+            )
+            return None
+        data = json_response.get("data")
+        if not isinstance(data, dict):
+            _LOGGER.debug(
+                "SEMS status response without data, message: %s",
+                json_response.get("msg", ""),
+            )
+            return None
+        return data
 
-    def getData(self, wallbox_sn, renewToken: bool = False, maxTokenRetries: int = 1):
-        """Get the latest data from the SEMS API."""
-        _LOGGER.debug(
-            "SEMS v%s - getData called for wallbox %s (renewToken=%s, retries=%s)",
-            API_VERSION,
-            wallbox_sn,
-            renewToken,
-            maxTokenRetries,
+    async def _async_timed_status_call(self, path, payload, maxTokenRetries, priority):
+        """Call a status endpoint and return (data or None, latency, http status)."""
+        started = time.monotonic()
+        status, json_response, text = await self._async_call(
+            path, payload, maxTokenRetries, priority
         )
-        try:
-            if maxTokenRetries < 0:
-                _LOGGER.info(
-                    "SEMS - Maximum token fetch tries reached, aborting for now"
+        latency = time.monotonic() - started
+        return self._parse_status_response(status, json_response, text), latency, status
+
+    async def _async_probe_status(self, wallbox_sn, maxTokenRetries, priority):
+        """Find and cache the best working status endpoint for a serial."""
+        payload = {"sn": wallbox_sn}
+        rejected: list[str] = []
+        for path in _StatusPaths:
+            is_fallback = path == _StatusPaths[-1]
+            try:
+                data, latency, status = await self._async_timed_status_call(
+                    path, payload, maxTokenRetries, priority
                 )
-                raise OutOfRetries
-
-            if not self._ensure_token(renew=renewToken):
-                _LOGGER.error("SEMS - Could not ensure token before getData")
-                return None
-
-            headers = self._build_headers()
-            wallbox_url = self._resolve_status_url()
-            payload = json.dumps({"sn": wallbox_sn})
+            except CircuitOpenError as err:
+                if is_fallback:
+                    raise
+                _LOGGER.debug("SEMS v%s - skipping %s: %s", API_VERSION, path, err)
+                rejected.append(path)
+                continue
+            if data is not None and (
+                is_fallback or _RequiredStatusFields.issubset(data)
+            ):
+                self._status_endpoints[wallbox_sn] = StatusEndpoint(
+                    path=path,
+                    fields=frozenset(data),
+                    latency=latency,
+                    checked_at=time.monotonic(),
+                    rejected=tuple(rejected),
+                )
+                _LOGGER.debug(
+                    "SEMS v%s - status endpoint for SN=%s: %s (%.3fs, rejected %s)",
+                    API_VERSION,
+                    wallbox_sn,
+                    path,
+                    latency,
+                    rejected,
+                )
+                return data
+            _LOGGER.debug(
+                "SEMS v%s - status endpoint %s not usable for SN=%s (HTTP %s)",
+                API_VERSION,
+                path,
+                wallbox_sn,
+                status,
+            )
+            rejected.append(path)
+        return None
 
-            try:
+    async def async_get_data(
+        self,
+        wallbox_sn,
+        maxTokenRetries: int = 1,
+        priority: RequestPriority = RequestPriority.READ,
+    ):
+        """Get the latest data from the SEMS API.
+
+        The status endpoint is chosen per serial by a one-time probe (see
+        _async_probe_status) and re-checked every _EndpointRecheckInterval.
+        Pass RequestPriority.REFRESH for refreshes that may be dropped
+        (RateLimited) when the read budget is exhausted.
+        """
+        endpoint = self._status_endpoints.get(wallbox_sn)
+        try:
+            if (
+                endpoint is None
+                or time.monotonic() - endpoint.checked_at > _EndpointRecheckInterval
+            ):
+                data = await self._async_probe_status(
+                    wallbox_sn, maxTokenRetries, priority
+                )
+            else:
                 _LOGGER.debug(
-                    "SEMS v%s - Making Wallbox Status API Call, URL=%s, SN=%s",
+                    "SEMS v%s - Making Wallbox Status API Call, path=%s, SN=%s",
                     API_VERSION,
-                    wallbox_url,
+                    endpoint.path,
                     wallbox_sn,
                 )
-                response = requests.post(
-                    wallbox_url, headers=headers, data=payload, timeout=_RequestTimeout
+                data, latency, status = await self._async_timed_status_call(
+                    endpoint.path, {"sn": wallbox_sn}, maxTokenRetries, priority
                 )
-                response.raise_for_status()
-                json_response = response.json()
-            except requests.exceptions.HTTPError as http_err:
-                # If v4 returns 404, fall back to v3
-                if (
-                    _USE_V4_STATUS
-                    and wallbox_url.endswith("GetEvChargerMoreView")
-                    and http_err.response is not None
-                    and http_err.response.status_code == 404
-                ):
+                if status == 404:
+                    # Endpoint went away: forget it and probe again right now
                     _LOGGER.warning(
-                        "SEMS v%s - v4 endpoint 404, falling back to v3 for SN=%s",
+                        "SEMS v%s - %s returned 404 for SN=%s, re-probing",
                         API_VERSION,
+                        endpoint.path,
                         wallbox_sn,
                     )
-                    v3_response = requests.post(
-                        _WallboxURL_V3,
-                        headers=headers,
-                        data=payload,
-                        timeout=_RequestTimeout,
+                    self._status_endpoints.pop(wallbox_sn, None)
+                    data = await self._async_probe_status(
+                        wallbox_sn, maxTokenRetries, priority
                     )
-                    v3_response.raise_for_status()
-                    json_response = v3_response.json()
                 else:
-                    raise
-
-            data = json_response.get("data")
-            msg = str(json_response.get("msg", ""))
-            _LOGGER.debug(
-                "SEMS v%s - getData raw response msg=%s, data_is_none=%s",
-                API_VERSION,
-                msg,
-                data is None,
-            )
-
-            # Handle authorization expiry → retry once with fresh token
-            if data is None and "authorization has expired" in msg.lower():
-                _LOGGER.debug(
-                    "SEMS - Authorization expired (%s), retrying with fresh token, remaining retries: %s",
-                    msg,
-                    maxTokenRetries,
-                )
-                self._token = None
-                return self.getData(
-                    wallbox_sn, renewToken=True, maxTokenRetries=maxTokenRetries - 1
-                )
+                    endpoint.latency = latency
 
             if data is None:
-                _LOGGER.error(
-                    "Unable to fetch data from SEMS, message: %s", msg
-                )
-                return None
-
+                _LOGGER.error("Unable to fetch data from SEMS for SN=%s", wallbox_sn)
             return data
 
-        except OutOfRetries:
+        except (OutOfRetries, CircuitOpenError, RateLimited, asyncio.CancelledError):
             raise
         except Exception as exc:  # noqa: BLE001
             _LOGGER.error("Unable to fetch data from SEMS. %s", exc)
@@ -226,172 +606,276 @@ class SemsApi:
     # Commands
     # ------------------------------------------------------------------
 
-    def change_status(
-        self,
-        inverterSn,
-        status,
-        renewToken: bool = False,
-        maxTokenRetries: int = 1,
-    ):
+    @staticmethod
+    def _parse_command_state(resp_json) -> dict[str, Any]:
+        """Return the wallbox state echoed in a command response."""
+        data = resp_json.get("data") if isinstance(resp_json, dict) else None
+        if not isinstance(data, dict):
+            return {}
+        state: dict[str, Any] = {}
+        for key, name in _CommandStateFields.items():
+            value = data.get(key)
+            if value is None:
+                continue
+            try:
+                if name == "chargeMode":
+                    value = int(value)
+                elif name in ("set_charge_power", "power"):
+                    value = float(value)
+                elif not str(value).startswith(_StatusPrefix):
+                    # change_status echoes the requested "1"/"2", not a status
+                    continue
+            except (TypeError, ValueError):
+                continue
+            state[name] = value
+        return state
+
+    async def async_change_status(
+        self, inverterSn, status, maxTokenRetries: int = 1
+    ) -> CommandResult:
         """Start or stop charging."""
         _LOGGER.debug(
-            "SEMS v%s - change_status(%s, %s, renewToken=%s, retries=%s)",
-            API_VERSION,
+            "Sending power control command (%s) for wallbox sn: %s status: %s",
+            _PowerControlPath,
             inverterSn,
             status,
-            renewToken,
-            maxTokenRetries,
         )
         try:
-            if maxTokenRetries < 0:
-                _LOGGER.info(
-                    "SEMS - Maximum token fetch tries reached for change_status"
-                )
-                raise OutOfRetries
-
-            if not self._ensure_token(renew=renewToken):
-                _LOGGER.error("SEMS - Could not ensure token before change_status")
-                return
-
-            headers = self._build_headers()
-            _LOGGER.debug(
-                "Sending power control command (%s) for wallbox sn: %s status: %s",
-                _PowerControlURL,
-                inverterSn,
-                status,
-            )
-
-            data = {"sn": inverterSn, "status": str(status)}
-            response = requests.post(
-                _PowerControlURL, headers=headers, json=data, timeout=_RequestTimeout
+            http_status, resp_json, text = await self._async_call(
+                _PowerControlPath,
+                {"sn": inverterSn, "status": str(status)},
+                maxTokenRetries,
+                RequestPriority.COMMAND,
             )
-
-            try:
-                resp_json = response.json()
-            except Exception:  # noqa: BLE001
-                resp_json = None
-
-            if response.status_code != 200 or (
-                isinstance(resp_json, dict)
-                and resp_json.get("data") is None
-                and "authorization has expired"
-                in str(resp_json.get("msg", "")).lower()
-            ):
-                if (
-                    isinstance(resp_json, dict)
-                    and "authorization has expired"
-                    in str(resp_json.get("msg", "")).lower()
-                    and maxTokenRetries > 0
-                ):
-                    _LOGGER.debug(
-                        "SEMS - change_status authorization expired, retrying once with new token"
-                    )
-                    self._token = None
-                    return self.change_status(
-                        inverterSn,
-                        status,
-                        renewToken=True,
-                        maxTokenRetries=maxTokenRetries - 1,
-                    )
-
+            if http_status != 200:
                 _LOGGER.warning(
                     "Power control command not successful (HTTP %s), response: %s",
-                    response.status_code,
-                    response.text,
+                    http_status,
+                    text,
                 )
-                return
-
-            return
+                return CommandResult(False)
+            return CommandResult(True, self._parse_command_state(resp_json))
+        except asyncio.CancelledError:
+            raise
         except Exception as exc:  # noqa: BLE001
             _LOGGER.error("Unable to execute Power control command. %s", exc)
+            return CommandResult(False)
 
-    def set_charge_mode(
-        self,
-        wallboxSn,
-        mode,
-        chargePower=None,
-        renewToken: bool = False,
-        maxTokenRetries: int = 1,
-    ):
+    async def async_set_charge_mode(
+        self, wallboxSn, mode, chargePower=None, maxTokenRetries: int = 1
+    ) -> CommandResult:
         """Set charge mode and optionally power."""
         _LOGGER.debug(
-            "SEMS v%s - set_charge_mode(sn=%s, mode=%s, power=%s, renewToken=%s, retries=%s)",
-            API_VERSION,
+            "Sending SetChargeMode command (%s) for wallbox SN: %s mode: %s chargepower: %s",
+            _SetChargeModePath,
             wallboxSn,
             mode,
             chargePower,
-            renewToken,
-            maxTokenRetries,
         )
+        if chargePower is not None:
+            data = {"sn": wallboxSn, "type": mode, "charge_power": chargePower}
+        else:
+            data = {"sn": wallboxSn, "type": mode}
+
         try:
-            if maxTokenRetries < 0:
-                _LOGGER.info(
-                    "SEMS - Maximum token fetch tries reached for set_charge_mode"
+            http_status, resp_json, text = await self._async_call(
+                _SetChargeModePath, data, maxTokenRetries, RequestPriority.COMMAND
+            )
+            if http_status != 200:
+                _LOGGER.warning(
+                    "SetChargeMode command not successful (HTTP %s), response: %s",
+                    http_status,
+                    text,
                 )
-                raise OutOfRetries
+                return CommandResult(False)
+            return CommandResult(True, self._parse_command_state(resp_json))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            _LOGGER.error("Unable to execute SetChargeMode command. %s", exc)
+            return CommandResult(False)
 
-            if not self._ensure_token(renew=renewToken):
-                _LOGGER.error("SEMS - Could not ensure token before set_charge_mode")
-                return False
 
-            headers = self._build_headers()
-            _LOGGER.debug(
-                "Sending SetChargeMode command (%s) for wallbox SN: %s mode: %s chargepower: %s",
-                _SetChargeModeURL,
-                wallboxSn,
-                mode,
-                chargePower,
-            )
+@dataclass
+class StatusEndpoint:
+    """Status endpoint known to work for one wallbox serial."""
 
-            if chargePower is not None:
-                data = {"sn": wallboxSn, "type": mode, "charge_power": chargePower}
-            else:
-                data = {"sn": wallboxSn, "type": mode}
+    path: str
+    fields: frozenset[str]
+    latency: float
+    checked_at: float
+    rejected: tuple[str, ...] = ()
 
-            response = requests.post(
-                _SetChargeModeURL, headers=headers, json=data, timeout=_RequestTimeout
-            )
+    def as_dict(self) -> dict:
+        """Return the probe result for diagnostics."""
+        return {
+            "path": self.path,
+            "fields": sorted(self.fields),
+            "latency": round(self.latency, 3),
+            "age": round(time.monotonic() - self.checked_at),
+            "rejected": list(self.rejected),
+        }
 
-            try:
-                resp_json = response.json()
-            except Exception:  # noqa: BLE001
-                resp_json = None
 
-            if response.status_code != 200 or (
-                isinstance(resp_json, dict)
-                and resp_json.get("data") is None
-                and "authorization has expired"
-                in str(resp_json.get("msg", "")).lower()
-            ):
-                if (
-                    isinstance(resp_json, dict)
-                    and "authorization has expired"
-                    in str(resp_json.get("msg", "")).lower()
-                    and maxTokenRetries > 0
-                ):
-                    _LOGGER.debug(
-                        "SEMS - set_charge_mode authorization expired, retrying once with new token"
-                    )
-                    self._token = None
-                    return self.set_charge_mode(
-                        wallboxSn,
-                        mode,
-                        chargePower=chargePower,
-                        renewToken=True,
-                        maxTokenRetries=maxTokenRetries - 1,
-                    )
+class TokenManager:
+    """Single-flight owner of the SEMS login token.
 
-                _LOGGER.warning(
-                    "SetChargeMode command not successful (HTTP %s), response: %s",
-                    response.status_code,
-                    response.text,
-                )
-                return False
+    All calls share one token.  Renewals are serialised behind a lock and a
+    caller that saw a token rejected only triggers a new CrossLogin if nobody
+    else has replaced that token in the meantime.  Callers that waited on a
+    login share its result, failed or not, and a failed login is not retried
+    for _LoginFailureCooldown unless forced.  Tokens older than
+    _TokenRefreshAge are renewed in the background while the current one
+    keeps serving requests.
+    """
+
+    def __init__(self, hass, login, store=None):
+        """Init the token manager.
+
+        `login` is a coroutine function returning a new token dict or None.
+        """
+        self._hass = hass
+        self._login = login
+        self._store = store
+        self._token: dict | None = None
+        self._obtained_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._refresh_task = None
+        self._last_proactive_attempt = 0.0
+        # Bumped by every finished login, so waiters can tell one happened
+        self._generation = 0
+        self._login_failed_until = 0.0
+        self.login_count = 0
+
+    @property
+    def token(self) -> dict | None:
+        """Return the current token."""
+        return self._token
+
+    @property
+    def age(self) -> float | None:
+        """Return the token age in seconds, or None without a token."""
+        if self._token is None or self._obtained_at is None:
+            return None
+        return time.time() - self._obtained_at
+
+    def set_token(self, token: dict | None, obtained_at: float | None = None) -> None:
+        """Replace the current token (without persisting it)."""
+        self._token = token
+        self._obtained_at = (obtained_at or time.time()) if token is not None else None
 
-            return True
+    async def async_load(self) -> bool:
+        """Restore the persisted token, if any."""
+        if self._store is None or self._token is not None:
+            return self._token is not None
+        try:
+            stored = await self._store.async_load()
         except Exception as exc:  # noqa: BLE001
-            _LOGGER.error("Unable to execute SetChargeMode command. %s", exc)
+            _LOGGER.warning("SEMS - Unable to load persisted token: %s", exc)
+            return False
+        token = stored.get("token") if isinstance(stored, dict) else None
+        if not isinstance(token, dict):
             return False
+        self.set_token(token, stored.get("obtained_at"))
+        _LOGGER.debug("SEMS v%s - restored persisted token", API_VERSION)
+        return True
+
+    async def _async_save(self) -> None:
+        """Persist the current token (or drop it when None)."""
+        if self._store is None:
+            return
+        try:
+            if self._token is None:
+                await self._store.async_remove()
+            else:
+                await self._store.async_save(
+                    {"token": self._token, "obtained_at": self._obtained_at}
+                )
+        except Exception as exc:  # noqa: BLE001
+            _LOGGER.warning("SEMS - Unable to persist token: %s", exc)
+
+    async def async_get_token(self) -> dict | None:
+        """Return a usable token, logging in only if there is none."""
+        token = self._token
+        if token is None:
+            return await self.async_refresh()
+        age = self.age
+        if age is not None and age > _TokenRefreshAge:
+            self._schedule_proactive_refresh()
+        return token
+
+    async def async_refresh(
+        self, rejected: dict | None = None, force: bool = False
+    ) -> dict | None:
+        """Obtain a new token, sharing one CrossLogin between callers.
+
+        `rejected` is the token a caller saw expire; if the current token
+        differs, another caller already renewed it and that one is returned.
+        """
+        generation = self._generation
+        async with self._lock:
+            current = self._token
+            if not force:
+                if current is not None and current is not rejected:
+                    return current
+                # A login finished while this caller waited: share its result
+                if self._generation != generation:
+                    return current
+                if current is None and time.monotonic() < self._login_failed_until:
+                    return None
+
+            _LOGGER.debug(
+                "SEMS v%s - fetching new token (token_is_none=%s, force=%s)",
+                API_VERSION,
+                current is None,
+                force,
+            )
+            self.login_count += 1
+            try:
+                token = await self._login()
+            finally:
+                self._generation += 1
+            self._login_failed_until = (
+                time.monotonic() + _LoginFailureCooldown if token is None else 0.0
+            )
+            self.set_token(token)
+            await self._async_save()
+            return token
+
+    def _schedule_proactive_refresh(self) -> None:
+        """Renew an ageing token in the background, off the request path."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        now = time.monotonic()
+        if now - self._last_proactive_attempt < _TokenProactiveRetry:
+            return
+        self._last_proactive_attempt = now
+        self._refresh_task = self._hass.async_create_background_task(
+            self._async_proactive_refresh(), "sems_wallbox_token_refresh"
+        )
+
+    async def _async_proactive_refresh(self) -> None:
+        """Renew the token but keep the old one if the login fails."""
+        async with self._lock:
+            _LOGGER.debug("SEMS v%s - proactively renewing token", API_VERSION)
+            self.login_count += 1
+            try:
+                token = await self._login()
+            finally:
+                self._generation += 1
+            if token is None:
+                # The current token is still valid as far as we know
+                return
+            self.set_token(token)
+            await self._async_save()
+
+    def as_dict(self) -> dict:
+        """Return token state for diagnostics (without the token itself)."""
+        return {
+            "has_token": self._token is not None,
+            "age": self.age,
+            "login_count": self.login_count,
+        }
 
 
 class OutOfRetries(exceptions.HomeAssistantError):
@@ -2,26 +2,127 @@
 
 from __future__ import annotations
 
-from decimal import Decimal
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 import logging
+from operator import attrgetter
 from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfElectricCurrent
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_POWER_DEADBAND,
+    CONF_CURRENT_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_HEARTBEAT,
+    DEFAULT_POWER_DEADBAND,
+    DEFAULT_CURRENT_DEADBAND,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_HEARTBEAT,
+)
 from .coordinator import SemsUpdateCoordinator
+from .deadband import DeadbandFilter
+from .snapshot import STATUS_ATTRIBUTES, WallboxSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
+ICON_UNKNOWN = "mdi:help-circle-outline"
+
+
+@dataclass(frozen=True, kw_only=True)
+class SemsSensorEntityDescription(SensorEntityDescription):
+    """Describes a wallbox sensor and how it is read from a snapshot.
+
+    Values are converted once per poll when the snapshot is decoded;
+    `value_fn` only picks the converted field, so a new SEMS field needs a
+    line in the snapshot schema and an entry in SENSOR_DESCRIPTIONS.
+    """
+
+    value_fn: Callable[[WallboxSnapshot], Any]
+    # Snapshot fields the value depends on; other changes do not write state
+    snapshot_fields: tuple[str, ...]
+    unique_id_suffix: str = ""
+    # State -> icon for enum sensors; other states get ICON_UNKNOWN
+    icons: Mapping[Any, str] | None = None
+    attributes_fn: Callable[[WallboxSnapshot], Mapping[str, Any]] | None = None
+    # (options key, default) of the absolute deadband; None records every change
+    deadband: tuple[str, float] | None = None
+
+
+SENSOR_DESCRIPTIONS: tuple[SemsSensorEntityDescription, ...] = (
+    SemsSensorEntityDescription(
+        key="status",
+        translation_key="status",
+        device_class=SensorDeviceClass.ENUM,
+        options=["charging", "standby", "offline", "unknown"],
+        value_fn=attrgetter("state"),
+        snapshot_fields=("state", "attributes"),
+        icons={
+            "charging": "mdi:battery-charging-100",
+            "standby": "mdi:ev-station",
+            "offline": "mdi:power-plug-off",
+        },
+        attributes_fn=attrgetter("attributes"),
+    ),
+    SemsSensorEntityDescription(
+        key="workstate",
+        translation_key="workstate",
+        device_class=SensorDeviceClass.ENUM,
+        options=["not_plugged_in", "connected", "finished_charging", "dash", "unknown"],
+        value_fn=attrgetter("workstate_state"),
+        snapshot_fields=("workstate_state",),
+        unique_id_suffix="_workstate",
+        icons={
+            "not_plugged_in": "mdi:power-plug-off-outline",
+            "connected": "mdi:power-plug",
+            "finished_charging": "mdi:battery-check",
+            "dash": "mdi:progress-clock",
+        },
+    ),
+    SemsSensorEntityDescription(
+        key="power",
+        translation_key="power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        value_fn=attrgetter("power"),
+        snapshot_fields=("power",),
+        unique_id_suffix="_power",
+        deadband=(CONF_POWER_DEADBAND, DEFAULT_POWER_DEADBAND),
+    ),
+    SemsSensorEntityDescription(
+        key="energy",
+        translation_key="energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value_fn=attrgetter("charge_energy"),
+        snapshot_fields=("charge_energy",),
+        unique_id_suffix="-energy",
+    ),
+    SemsSensorEntityDescription(
+        key="current",
+        translation_key="current",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        value_fn=attrgetter("current"),
+        snapshot_fields=("current",),
+        unique_id_suffix="_current",
+        deadband=(CONF_CURRENT_DEADBAND, DEFAULT_CURRENT_DEADBAND),
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -32,342 +133,143 @@ async def async_setup_entry(
     runtime: dict[str, Any] = hass.data[DOMAIN][config_entry.entry_id]
     coordinator: SemsUpdateCoordinator = runtime["coordinator"]
 
-    sns = list(coordinator.data.keys())
-
-    entities: list[SensorEntity] = []
-    for sn in sns:
-        entities.append(SemsSensor(coordinator, sn))
-        entities.append(SemsWorkStateSensor(coordinator, sn))
-        entities.append(SemsStatisticsSensor(coordinator, sn))
-        entities.append(SemsPowerSensor(coordinator, sn))
-        entities.append(SemsCurrentSensor(coordinator, sn))
-
-    async_add_entities(entities)
-
-
-class SemsSensor(CoordinatorEntity, SensorEntity):
-    """Main wallbox status sensor (Charging / Standby / Offline / Unknown)."""
-
-    _attr_device_class = SensorDeviceClass.ENUM
-    _attr_options = ["charging", "standby", "offline", "unknown"]
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-    _attr_translation_key = "status"
-
-    def __init__(self, coordinator: SemsUpdateCoordinator, sn: str) -> None:
-        """Initialize the status sensor."""
-        super().__init__(coordinator)
-        self.sn = sn
-        _LOGGER.debug("Creating SemsSensor with id %s", self.sn)
-
-    @property
-    def unique_id(self) -> str:
-        """Unique ID based on serial number."""
-        return self.coordinator.data.get(self.sn, {}).get("sn", self.sn)
-
-    @property
-    def state(self) -> str:
-        """Return the state of the device as human readable string."""
-        data = self.coordinator.data.get(self.sn, {})
-        status = data.get("status")
-        if status == "EVDetail_Status_Title_Charging":
-            return "charging"
-        if status == "EVDetail_Status_Title_Waiting":
-            return "standby"
-        if status == "EVDetail_Status_Title_Offline":
-            return "offline"
-        return "unknown"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes of the monitored installation."""
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        attributes = {
-            k: v for k, v in data.items() if k is not None and v is not None
-        }
-        if "status" in data:
-            attributes["statusText"] = data["status"]
-        return attributes
-
-    @property
-    def icon(self) -> str:
-        """Return dynamic icon based on status."""
-        state = self.state
-        if state == "charging":
-            return "mdi:battery-charging-100"
-        if state == "standby":
-            return "mdi:ev-station"
-        if state == "offline":
-            return "mdi:power-plug-off"
-        return "mdi:help-circle-outline"
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
-
-    @property
-    def device_info(self) -> dict[str, Any]:
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        return {
-            "identifiers": {(DOMAIN, self.sn)},
-            "name": data.get("name") or f"GoodWe Wallbox {self.sn}",
-            "manufacturer": "GoodWe",
-            "model": data.get("model", "unknown"),
-            "sw_version": data.get("fireware", "unknown"),
-        }
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
-
-    async def async_update(self) -> None:
-        """Update the entity via the coordinator."""
-        await self.coordinator.async_request_refresh()
-
-
-class SemsWorkStateSensor(CoordinatorEntity, SensorEntity):
-    """Workstate sensor for the wallbox EV plug state."""
-
-    _attr_device_class = SensorDeviceClass.ENUM
-    _attr_options = ["not_plugged_in", "connected", "finished_charging", "dash", "unknown"]
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-    _attr_translation_key = "workstate"
-
-    def __init__(self, coordinator: SemsUpdateCoordinator, sn: str) -> None:
-        """Initialize the workstate sensor."""
-        super().__init__(coordinator)
-        self.sn = sn
-        _LOGGER.debug("Creating SemsWorkStateSensor with id %s", self.sn)
-
-    @property
-    def unique_id(self) -> str:
-        """Unique ID for workstate sensor."""
-        sn = self.coordinator.data.get(self.sn, {}).get("sn", self.sn)
-        return f"{sn}_workstate"
-
-    @property
-    def native_value(self) -> str:
-        """Return the workstate of the device as a human-readable string."""
-        data = self.coordinator.data.get(self.sn, {})
-        workstate = data.get("workstate")
-
-        if workstate == "EVDetail_Status_Waiting_Stat00":
-            return "not_plugged_in"
-        if workstate == "EVDetail_Status_Waiting_Stat01":
-            return "connected"
-        if workstate == "EVDetail_Status_Waiting_Stat02":
-            return "finished_charging"
-        if workstate == "":
-            return "dash"
-        return "unknown"
-
-    @property
-    def icon(self) -> str:
-        """Return a dynamic icon based on workstate."""
-        state = self.native_value
-        if state == "not_plugged_in":
-            return "mdi:power-plug-off-outline"
-        if state == "connected":
-            return "mdi:power-plug"
-        if state == "finished_charging":
-            return "mdi:battery-check"
-        if state == "dash":
-            return "mdi:progress-clock"
-        return "mdi:help-circle-outline"
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
-
-    @property
-    def device_info(self) -> dict[str, Any]:
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        return {
-            "identifiers": {(DOMAIN, self.sn)},
-            "name": data.get("name") or f"GoodWe Wallbox {self.sn}",
-            "manufacturer": "GoodWe",
-            "model": data.get("model", "unknown"),
-            "sw_version": data.get("fireware", "unknown"),
-        }
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
-
-    async def async_update(self) -> None:
-        """Update the entity via the coordinator."""
-        await self.coordinator.async_request_refresh()
-
-
-class SemsPowerSensor(CoordinatorEntity, SensorEntity):
-    """Instant power sensor in kW."""
-
-    _attr_device_class = SensorDeviceClass.POWER
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-    _attr_translation_key = "power"
-    _attr_native_unit_of_measurement = UnitOfPower.KILO_WATT
-
-    def __init__(self, coordinator: SemsUpdateCoordinator, sn: str) -> None:
-        """Initialize the power sensor."""
-        super().__init__(coordinator)
-        self.sn = sn
-        _LOGGER.debug("Creating SemsPowerSensor with id %s", self.sn)
+    sn: str = runtime["sn"]
+    options = config_entry.options
 
-    @property
-    def unique_id(self) -> str:
-        """Unique ID for power sensor."""
-        sn = self.coordinator.data.get(self.sn, {}).get("sn", self.sn)
-        return f"{sn}_power"
+    async_add_entities(
+        SemsSensor(coordinator, sn, description, _deadband_filter(options, description))
+        for description in SENSOR_DESCRIPTIONS
+    )
 
-    @property
-    def native_value(self) -> float:
-        """Return the power in kW."""
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        try:
-            power = float(data.get("power", 0) or 0)
-        except (TypeError, ValueError):
-            power = 0.0
-        return max(0.0, power)
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+def _deadband_filter(
+    options, description: SemsSensorEntityDescription
+) -> DeadbandFilter | None:
+    """Build the significant-change filter of a sensor from entry options."""
+    if description.deadband is None:
+        return None
+    conf_deadband, default = description.deadband
+    return DeadbandFilter(
+        absolute=float(options.get(conf_deadband, default)),
+        relative=float(options.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT)) / 100,
+        heartbeat=float(options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT)),
+    )
 
-    @property
-    def device_info(self) -> dict[str, Any]:
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        return {
-            "identifiers": {(DOMAIN, self.sn)},
-            "name": data.get("name") or f"GoodWe Wallbox {self.sn}",
-            "manufacturer": "GoodWe",
-            "model": data.get("model", "unknown"),
-            "sw_version": data.get("fireware", "unknown"),
-        }
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
-
-    async def async_update(self) -> None:
-        """Update the entity via the coordinator."""
-        await self.coordinator.async_request_refresh()
 
+class SemsSensor(CoordinatorEntity, SensorEntity):
+    """Wallbox sensor driven by a SemsSensorEntityDescription."""
 
-class SemsStatisticsSensor(CoordinatorEntity, SensorEntity):
-    """Energy sensor in kWh to enable HA statistics."""
+    entity_description: SemsSensorEntityDescription
 
-    _attr_device_class = SensorDeviceClass.ENERGY
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_should_poll = False
     _attr_has_entity_name = True
-    _attr_translation_key = "energy"
-    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-
-    def __init__(self, coordinator: SemsUpdateCoordinator, sn: str) -> None:
-        """Initialize the statistics sensor."""
-        super().__init__(coordinator)
+    # Status details follow the state; recording them only grows the database
+    _unrecorded_attributes = frozenset(STATUS_ATTRIBUTES)
+
+    def __init__(
+        self,
+        coordinator: SemsUpdateCoordinator,
+        sn: str,
+        description: SemsSensorEntityDescription,
+        value_filter: DeadbandFilter | None = None,
+    ) -> None:
+        """Initialize the sensor and read its first value."""
+        super().__init__(coordinator, (sn, description.snapshot_fields))
+        self.entity_description = description
         self.sn = sn
-        _LOGGER.debug("Creating SemsStatisticsSensor with id %s", self.sn)
-
-    @property
-    def native_value(self) -> Decimal:
-        """Return the value reported by the sensor (kWh)."""
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        raw = data.get("chargeEnergy", 0)
-        try:
-            return Decimal(str(raw))
-        except Exception:  # noqa: BLE001
-            _LOGGER.debug(
-                "Unable to parse chargeEnergy=%s for %s, falling back to 0", raw, self.sn
+        self._device = coordinator.devices[sn]
+        self._attr_unique_id = f"{sn}{description.unique_id_suffix}"
+        self._filter = value_filter
+        # Cancels the timer that publishes a suppressed value at the heartbeat
+        self._unsub_heartbeat: Callable[[], None] | None = None
+        self._value: Any = None
+        self._attributes: Mapping[str, Any] | None = None
+        self._update_value()
+        _LOGGER.debug("Creating SemsSensor %s with id %s", description.key, self.sn)
+
+    def _update_value(self) -> bool:
+        """Read the value from the current snapshot.
+
+        Returns False when the deadband filter keeps the last published
+        value.  An unavailable wallbox reads as None.
+        """
+        description = self.entity_description
+        snapshot = self.coordinator.data.get(self.sn) if self.available else None
+        value = description.value_fn(snapshot) if snapshot else None
+        if self._filter is not None and not self._filter.accept(value):
+            self._arm_heartbeat()
+            return False
+        self._cancel_heartbeat()
+        self._value = value
+        if description.attributes_fn is not None:
+            self._attributes = description.attributes_fn(snapshot) if snapshot else {}
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value changed (significantly)."""
+        if self._update_value():
+            self.async_write_ha_state()
+
+    def _arm_heartbeat(self) -> None:
+        """Publish a suppressed value at the heartbeat even if no poll changes it."""
+        if self._unsub_heartbeat is not None or self.hass is None:
+            return
+        delay = self._filter.heartbeat_delay()
+        if delay is not None:
+            self._unsub_heartbeat = async_call_later(
+                self.hass, delay, self._async_heartbeat
             )
-            return Decimal("0")
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    def _cancel_heartbeat(self) -> None:
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    @callback
+    def _async_heartbeat(self, _now: Any = None) -> None:
+        self._unsub_heartbeat = None
+        if self._filter.flush():
+            self._value = self._filter.value
+            self.async_write_ha_state()
+        else:
+            self._arm_heartbeat()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the heartbeat timer."""
+        self._cancel_heartbeat()
+        await super().async_will_remove_from_hass()
 
     @property
-    def unique_id(self) -> str:
-        """Unique ID for energy sensor."""
-        sn = self.coordinator.data.get(self.sn, {}).get("sn", self.sn)
-        return f"{sn}-energy"
+    def native_value(self) -> Any:
+        """Return the value read from the last snapshot."""
+        return self._value
 
     @property
-    def device_info(self) -> dict[str, Any]:
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        return {
-            "identifiers": {(DOMAIN, self.sn)},
-            "name": data.get("name") or f"GoodWe Wallbox {self.sn}",
-            "manufacturer": "GoodWe",
-            "model": data.get("model", "unknown"),
-            "sw_version": data.get("fireware", "unknown"),
-        }
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the status details (built once per poll).
 
-    async def async_update(self) -> None:
-        """Update the entity via the coordinator."""
-        await self.coordinator.async_request_refresh()
-
-
-class SemsCurrentSensor(CoordinatorEntity, SensorEntity):
-    """Instantaneous charging current sensor in A."""
-
-    _attr_device_class = SensorDeviceClass.CURRENT
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-    _attr_translation_key = "current"
-    _attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
-
-    def __init__(self, coordinator: SemsUpdateCoordinator, sn: str) -> None:
-        """Initialize the current sensor."""
-        super().__init__(coordinator)
-        self.sn = sn
-        _LOGGER.debug("Creating SemsCurrentSensor with id %s", self.sn)
-
-    @property
-    def unique_id(self) -> str:
-        """Unique ID for current sensor."""
-        sn = self.coordinator.data.get(self.sn, {}).get("sn", self.sn)
-        return f"{sn}_current"
+        The full SEMS response is available in the diagnostics download.
+        """
+        return self._attributes
 
     @property
-    def native_value(self) -> float:
-        """Return the charging current in A."""
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        try:
-            current = float(data.get("current", 0) or 0)
-        except (TypeError, ValueError):
-            current = 0.0
-        return max(0.0, current)
+    def icon(self) -> str | None:
+        """Return a state-dependent icon for enum sensors."""
+        icons = self.entity_description.icons
+        if icons is None:
+            return None
+        return icons.get(self._value, ICON_UNKNOWN)
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.serial_available(self.sn)
 
     @property
     def device_info(self) -> dict[str, Any]:
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        return {
-            "identifiers": {(DOMAIN, self.sn)},
-            "name": data.get("name") or f"GoodWe Wallbox {self.sn}",
-            "manufacturer": "GoodWe",
-            "model": data.get("model", "unknown"),
-            "sw_version": data.get("fireware", "unknown"),
-        }
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
+        """Return the device info shared by all entities of this wallbox."""
+        return self._device.info
 
     async def async_update(self) -> None:
         """Update the entity via the coordinator."""
@@ -0,0 +1,160 @@
+"""Typed, immutable snapshot of one wallbox status response."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, fields
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import Any
+
+STATUS_CHARGING = "EVDetail_Status_Title_Charging"
+STATUS_WAITING = "EVDetail_Status_Title_Waiting"
+STATUS_OFFLINE = "EVDetail_Status_Title_Offline"
+
+# chargeMode in which the wallbox charges at the set power right away
+MODE_FAST = 0
+
+_STATES = {
+    STATUS_CHARGING: "charging",
+    STATUS_WAITING: "standby",
+    STATUS_OFFLINE: "offline",
+}
+
+_WORKSTATES = {
+    "EVDetail_Status_Waiting_Stat00": "not_plugged_in",
+    "EVDetail_Status_Waiting_Stat01": "connected",
+    "EVDetail_Status_Waiting_Stat02": "finished_charging",
+    "": "dash",
+}
+
+
+def _str(value) -> str | None:
+    return None if value is None else str(value)
+
+
+def _float(value) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _non_negative(value) -> float:
+    """Return a reading as float, 0 when missing or invalid, never negative."""
+    return max(0.0, _float(value or 0) or 0.0)
+
+
+def _int(value) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _decimal(value) -> Decimal:
+    try:
+        return Decimal(str(value if value is not None else 0))
+    except (InvalidOperation, ValueError):
+        return Decimal(0)
+
+
+# Status sensor attribute <- response key.  Only these are exposed as
+# attributes (and kept out of the recorder); the full response is in the
+# diagnostics download.
+STATUS_ATTRIBUTES: dict[str, str] = {
+    "statusText": "status",
+    "workstate": "workstate",
+    "chargeMode": "chargeMode",
+    "startStatus": "startStatus",
+}
+
+# Snapshot field <- (response key, converter).  Every response is run
+# through this table once; entities only read the converted attributes.
+_SCHEMA: tuple[tuple[str, str, Callable[[Any], Any]], ...] = (
+    ("name", "name", _str),
+    ("model", "model", _str),
+    ("firmware", "fireware", _str),
+    ("status", "status", _str),
+    ("workstate", "workstate", _str),
+    ("power", "power", _non_negative),
+    ("current", "current", _non_negative),
+    ("charge_energy", "chargeEnergy", _decimal),
+    ("charge_mode", "chargeMode", _int),
+    ("set_charge_power", "set_charge_power", _float),
+    ("min_charge_power", "min_charge_power", _float),
+    ("max_charge_power", "max_charge_power", _float),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class WallboxSnapshot:
+    """One status poll of a wallbox, decoded once into typed fields.
+
+    `raw` is the response exactly as received and is meant for diagnostics;
+    entities read the typed fields and the derived flags.
+    """
+
+    sn: str
+    name: str | None
+    model: str | None
+    firmware: str | None
+    status: str | None
+    workstate: str | None
+    power: float  # kW
+    current: float  # A
+    charge_energy: Decimal  # kWh
+    charge_mode: int | None
+    set_charge_power: float | None  # kW
+    min_charge_power: float | None  # kW
+    max_charge_power: float | None  # kW
+    # Derived
+    is_charging: bool
+    state: str  # charging / standby / offline / unknown
+    workstate_state: str  # not_plugged_in / connected / finished_charging / dash / unknown
+    attributes: Mapping[str, Any]
+    raw: Mapping[str, Any]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> WallboxSnapshot:
+        """Decode a status response; raises ValueError if it has no serial."""
+        sn = data.get("sn")
+        if not sn:
+            raise ValueError("Missing 'sn' in SEMS API data")
+        values = {name: convert(data.get(key)) for name, key, convert in _SCHEMA}
+        attributes = {
+            name: data[key]
+            for name, key in STATUS_ATTRIBUTES.items()
+            if data.get(key) is not None
+        }
+        return cls(
+            sn=str(sn),
+            **values,
+            is_charging=values["status"] == STATUS_CHARGING or values["power"] > 0,
+            state=_STATES.get(values["status"], "unknown"),
+            workstate_state=_WORKSTATES.get(values["workstate"], "unknown"),
+            attributes=MappingProxyType(attributes),
+            raw=MappingProxyType(dict(data)),
+        )
+
+    def merge(self, changes: Mapping[str, Any]) -> WallboxSnapshot:
+        """Return a new snapshot with some response keys replaced."""
+        return WallboxSnapshot.from_dict({**self.raw, **changes})
+
+    def changed_fields(self, previous: WallboxSnapshot) -> frozenset[str]:
+        """Return the names of the fields that differ from a previous snapshot."""
+        return frozenset(
+            name
+            for name in SNAPSHOT_FIELDS
+            if getattr(self, name) != getattr(previous, name)
+        )
+
+
+# Response keys a snapshot is decoded from; a status endpoint lacking any of
+# them would silently read as 0 or a default
+STATUS_KEYS: frozenset[str] = frozenset({"sn", *(key for _, key, _ in _SCHEMA)})
+
+# Fields entities can subscribe to; raw is for diagnostics only
+SNAPSHOT_FIELDS: tuple[str, ...] = tuple(
+    field.name for field in fields(WallboxSnapshot) if field.name != "raw"
+)
@@ -3,26 +3,24 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import SemsUpdateCoordinator
+from .dispatcher import CommandOutcome
+from .reconciler import WallboxReconciler
 
 _LOGGER = logging.getLogger(__name__)
 
 SWITCH_VERSION = "0.3.4"
 
-# How long after an ON command to ignore "Waiting/power=0" and keep optimistic ON (seconds)
-GRACE_ON_SECONDS = 130
-
-# How long after an OFF command to tolerate API still briefly showing power>0
-GRACE_OFF_SECONDS = 130
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -32,7 +30,6 @@ async def async_setup_entry(
     """Add switches for passed config_entry in HA."""
     runtime = hass.data[DOMAIN][config_entry.entry_id]
     coordinator: SemsUpdateCoordinator = runtime["coordinator"]
-    api = runtime["api"]
 
     _LOGGER.debug(
         "Setting up SemsSwitch entities (version %s) for entry %s",
@@ -40,14 +37,7 @@ async def async_setup_entry(
         config_entry.entry_id,
     )
 
-    entities: list[SemsSwitch] = []
-    for sn, data in coordinator.data.items():
-        status = data.get("status")
-        power = float(data.get("power", 0) or 0)
-        current_is_on = status == "EVDetail_Status_Title_Charging" or power > 0
-        entities.append(SemsSwitch(coordinator, sn, api, current_is_on))
-
-    async_add_entities(entities)
+    async_add_entities([SemsSwitch(coordinator, runtime["sn"], runtime["reconciler"])])
 
 
 class SemsSwitch(CoordinatorEntity, SwitchEntity):
@@ -56,30 +46,27 @@ class SemsSwitch(CoordinatorEntity, SwitchEntity):
     _attr_should_poll = False
     _attr_has_entity_name = True
     _attr_translation_key = "start_charging"
+    _snapshot_fields = ("is_charging",)
 
     def __init__(
         self,
         coordinator: SemsUpdateCoordinator,
         sn: str,
-        api,
-        current_is_on: bool,
+        reconciler: WallboxReconciler,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (sn, self._snapshot_fields))
         self.coordinator = coordinator
-        self.api = api
+        self.reconciler = reconciler
         self.sn = sn
-        self._attr_is_on = current_is_on
-
-        # Grace period tracking
-        self._last_command_ts: float | None = None
-        self._last_command_target: bool | None = None
+        self._device = coordinator.devices[sn]
+        self._attr_unique_id = f"{sn}-switch-start-charging"
 
         _LOGGER.debug(
             "Creating SemsSwitch (v%s) for Wallbox %s, initial is_on=%s",
             SWITCH_VERSION,
             self.sn,
-            self._attr_is_on,
+            self.is_on,
         )
 
     @property
@@ -88,135 +75,45 @@ class SemsSwitch(CoordinatorEntity, SwitchEntity):
         return SwitchDeviceClass.SWITCH
 
     @property
-    def unique_id(self) -> str:
-        """Return unique id."""
-        return f"{self.coordinator.data[self.sn]['sn']}-switch-start-charging"
-
-    @property
-    def device_info(self):
-        """Return device info."""
-        return {
-            "identifiers": {(DOMAIN, self.sn)},
-            "name": (self.coordinator.data.get(self.sn, {}) or {}).get("name") or f"GoodWe Wallbox {self.sn}",
-            "manufacturer": "GoodWe",
-        }
+    def device_info(self) -> dict[str, Any]:
+        """Return the device info shared by all entities of this wallbox."""
+        return self._device.info
 
     @property
     def available(self):
         """Return if entity is available."""
-        return self.coordinator.last_update_success
-
-    def _compute_is_on_from_data(self, data: dict) -> bool:
-        """Compute is_on from API data, respecting the grace period after commands."""
-        status = data.get("status")
-        power = float(data.get("power", 0) or 0)
-        api_is_on = status == "EVDetail_Status_Title_Charging" or power > 0
-
-        now = self.hass.loop.time()
-        target = self._last_command_target
-        ts = self._last_command_ts
-
-        # Within ON grace: keep optimistic ON even if API still shows Waiting/power=0
-        if (
-            target is True
-            and ts is not None
-            and now - ts < GRACE_ON_SECONDS
-            and not api_is_on
-        ):
-            _LOGGER.debug(
-                "SemsSwitch %s: within ON grace (%.1fs < %.1fs), "
-                "API status=%s, power=%s -> holding is_on=True",
-                self.sn,
-                now - ts,
-                GRACE_ON_SECONDS,
-                status,
-                power,
-            )
-            return True
-
-        # Within OFF grace: keep optimistic OFF even if API briefly shows power>0
-        if (
-            target is False
-            and ts is not None
-            and now - ts < GRACE_OFF_SECONDS
-            and api_is_on
-        ):
-            _LOGGER.debug(
-                "SemsSwitch %s: within OFF grace (%.1fs < %.1fs), "
-                "API status=%s, power=%s -> holding is_on=False",
-                self.sn,
-                now - ts,
-                GRACE_OFF_SECONDS,
-                status,
-                power,
-            )
-            return False
-
-        # Outside grace period or state already matches command
-        if target is not None and api_is_on == target:
-            self._last_command_target = None
-            self._last_command_ts = None
+        return self.coordinator.serial_available(self.sn)
 
-        _LOGGER.debug(
-            "SemsSwitch %s: API status=%s, power=%s -> is_on=%s (no grace override)",
-            self.sn,
-            status,
-            power,
-            api_is_on,
-        )
-        return api_is_on
+    @property
+    def is_on(self) -> bool:
+        """Return True while charging (or while a start is pending)."""
+        return self.reconciler.charging
+
+    async def _async_set_charging(self, on: bool) -> None:
+        """Ask the reconciler to start or stop charging."""
+        _LOGGER.debug("Wallbox %s set to %s", self.sn, "On" if on else "Off")
+        outcome = await self.reconciler.async_set_charging(on)
+        if outcome is CommandOutcome.FAILED:
+            self.async_write_ha_state()
+            self.hass.async_create_task(self.coordinator.async_request_refresh())
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="start_charging_failed" if on else "stop_charging_failed",
+            )
 
     async def async_turn_off(self, **kwargs):
         """Turn off charging."""
-        _LOGGER.debug("Wallbox %s set to Off (optimistic UI + OFF grace)", self.sn)
-
-        self._last_command_target = False
-        self._last_command_ts = self.hass.loop.time()
-
-        # Optimistic state update
-        self._attr_is_on = False
-        self.async_write_ha_state()
-
-        # Optimistic immediate refresh, then a confirmed one 5 s after the command
-        self.hass.async_create_task(self.coordinator.async_request_refresh())
-
-        # Send command to SEMS API
-        await self.hass.async_add_executor_job(self.api.change_status, self.sn, 2)
-        self.coordinator.schedule_delayed_refresh(5)
+        await self._async_set_charging(False)
 
     async def async_turn_on(self, **kwargs):
         """Turn on charging."""
-        _LOGGER.debug("Wallbox %s set to On (optimistic UI + ON grace)", self.sn)
-
-        self._last_command_target = True
-        self._last_command_ts = self.hass.loop.time()
-
-        # Optimistic state update
-        self._attr_is_on = True
-        self.async_write_ha_state()
-
-        # Optimistic immediate refresh, then a confirmed one 5 s after the command
-        self.hass.async_create_task(self.coordinator.async_request_refresh())
-
-        # Send command to SEMS API
-        await self.hass.async_add_executor_job(self.api.change_status, self.sn, 1)
-        self.coordinator.schedule_delayed_refresh(5)
+        await self._async_set_charging(True)
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         await super().async_added_to_hass()
         _LOGGER.debug("SemsSwitch added to hass for wallbox %s", self.sn)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        self._attr_is_on = self._compute_is_on_from_data(data)
-        self.async_write_ha_state()
-
     async def async_update(self) -> None:
         """Manual update from HA."""
         await self.coordinator.async_request_refresh()
-        data = self.coordinator.data.get(self.sn, {}) or {}
-        self._attr_is_on = self._compute_is_on_from_data(data)
-        self.async_write_ha_state()
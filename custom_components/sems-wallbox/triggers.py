@@ -0,0 +1,128 @@
+"""Refresh triggers: HA entities whose sharp changes warrant an early poll."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import CONF_TRIGGERS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys of one trigger in the entry options
+TRIGGER_ENTITY = "entity_id"
+TRIGGER_THRESHOLD = "threshold"
+
+# States that say nothing about the measured quantity
+_IGNORED_STATES = frozenset({"unavailable", "unknown", ""})
+
+
+def _number(value: str) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class RefreshTrigger:
+    """An entity that fires when it moves by at least `threshold`.
+
+    Numeric states are compared with the value at which the trigger last
+    fired, so a steady ramp fires as well as a jump.  Other states (e.g. a
+    binary sensor) fire on every change.
+    """
+
+    entity_id: str
+    threshold: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> RefreshTrigger:
+        """Build a trigger from its entry options."""
+        return cls(
+            entity_id=str(data[TRIGGER_ENTITY]),
+            threshold=abs(float(data.get(TRIGGER_THRESHOLD, 0.0))),
+        )
+
+
+def triggers_from_options(options: Mapping[str, Any]) -> list[RefreshTrigger]:
+    """Return the valid refresh triggers stored in entry options."""
+    triggers = []
+    for data in options.get(CONF_TRIGGERS, []):
+        try:
+            triggers.append(RefreshTrigger.from_dict(data))
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid refresh trigger %s: %s", data, err)
+    return triggers
+
+
+class TriggerWatcher:
+    """Watch the trigger entities of a wallbox and report when one fires.
+
+    `on_fire` gets the entity ID; rate limiting is up to the caller.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        triggers: list[RefreshTrigger],
+        on_fire: Callable[[str], None],
+    ) -> None:
+        """Initialize the watcher; call async_start() to begin tracking."""
+        self._hass = hass
+        self._triggers = {trigger.entity_id: trigger for trigger in triggers}
+        self._on_fire = on_fire
+        # entity_id -> state at which the trigger last fired (or was first seen)
+        self._reference: dict[str, str] = {}
+        self._unsub: Callable[[], None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start tracking the trigger entities."""
+        if not self._triggers or self._unsub is not None:
+            return
+        for entity_id in self._triggers:
+            state = self._hass.states.get(entity_id)
+            if state is not None and state.state not in _IGNORED_STATES:
+                self._reference[entity_id] = state.state
+        self._unsub = async_track_state_change_event(
+            self._hass, list(self._triggers), self._async_state_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_state_changed(self, event: Any) -> None:
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        trigger = self._triggers.get(entity_id)
+        if trigger is None or new_state is None or new_state.state in _IGNORED_STATES:
+            return
+        reference = self._reference.get(entity_id)
+        if reference is None:
+            self._reference[entity_id] = new_state.state
+            return
+        if not self._moved(trigger, reference, new_state.state):
+            return
+        self._reference[entity_id] = new_state.state
+        _LOGGER.debug(
+            "Refresh trigger %s fired: %s -> %s", entity_id, reference, new_state.state
+        )
+        self._on_fire(entity_id)
+
+    @staticmethod
+    def _moved(trigger: RefreshTrigger, old: str, new: str) -> bool:
+        old_value, new_value = _number(old), _number(new)
+        if old_value is None or new_value is None:
+            return new != old
+        return abs(new_value - old_value) >= max(trigger.threshold, 1e-9)
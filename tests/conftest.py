@@ -10,11 +10,14 @@ part of the package hierarchy. This conftest ensures:
      to the project root (__init__.py), so relative imports work.
 """
 
+import asyncio
 import os
 import sys
 import types
 import importlib.util
 
+import pytest
+
 
 def _register(name: str) -> types.ModuleType:
     """Return or create a stub module in sys.modules."""
@@ -37,6 +40,10 @@ if not hasattr(exc_mod, "HomeAssistantError"):
         pass
     exc_mod.HomeAssistantError = HomeAssistantError
 
+    class ConfigEntryNotReady(HomeAssistantError):
+        pass
+    exc_mod.ConfigEntryNotReady = ConfigEntryNotReady
+
 # --------------------------------------------------------------------------
 # homeassistant.const
 # --------------------------------------------------------------------------
@@ -46,6 +53,7 @@ if not hasattr(const_mod, "CONF_PASSWORD"):
     const_mod.CONF_USERNAME = "username"
     const_mod.CONF_SCAN_INTERVAL = "scan_interval"
     const_mod.CONF_URL = "url"
+    const_mod.EVENT_HOMEASSISTANT_CLOSE = "homeassistant_close"
 
     class Platform:
         NUMBER = "number"
@@ -104,9 +112,20 @@ if not hasattr(sensor_mod, "SensorDeviceClass"):
         TOTAL_INCREASING = "total_increasing"
     class SensorEntity:
         pass
+    from dataclasses import dataclass as _dataclass
+
+    @_dataclass(frozen=True, kw_only=True)
+    class SensorEntityDescription:
+        key: str
+        translation_key: str | None = None
+        device_class: str | None = None
+        state_class: str | None = None
+        native_unit_of_measurement: str | None = None
+        options: list | None = None
     sensor_mod.SensorDeviceClass = SensorDeviceClass
     sensor_mod.SensorStateClass = SensorStateClass
     sensor_mod.SensorEntity = SensorEntity
+    sensor_mod.SensorEntityDescription = SensorEntityDescription
 
 switch_mod = _register("homeassistant.components.switch")
 if not hasattr(switch_mod, "SwitchDeviceClass"):
@@ -149,23 +168,166 @@ _register("homeassistant.helpers")
 
 coord_mod = _register("homeassistant.helpers.update_coordinator")
 if not hasattr(coord_mod, "CoordinatorEntity"):
+    from typing import Generic, TypeVar
+
+    _DataT = TypeVar("_DataT")
+
     class CoordinatorEntity:
-        def __init__(self, coordinator):
+        hass = None
+
+        def __init__(self, coordinator, context=None):
             self.coordinator = coordinator
+            self.coordinator_context = context
         async def async_added_to_hass(self):
             pass
-    class DataUpdateCoordinator:
-        pass
+        async def async_will_remove_from_hass(self):
+            pass
     class UpdateFailed(Exception):
         pass
+    class DataUpdateCoordinator(Generic[_DataT]):
+        """Small functional stand-in for HA's DataUpdateCoordinator."""
+
+        def __init__(self, hass, logger, *, config_entry=None, name=None,
+                     update_interval=None, always_update=True):
+            self.hass = hass
+            self.logger = logger
+            self.config_entry = config_entry
+            self.name = name
+            self.update_interval = update_interval
+            self.always_update = always_update
+            self.data = None
+            self.last_update_success = True
+            self.last_exception = None
+            self._listeners = {}
+
+        def async_add_listener(self, update_callback, context=None):
+            key = object()
+            self._listeners[key] = (update_callback, context)
+            return lambda: self._listeners.pop(key, None)
+
+        def async_update_listeners(self):
+            for update_callback, _ in list(self._listeners.values()):
+                update_callback()
+
+        def async_set_updated_data(self, data):
+            # Like HA: re-arms the poll timer from now
+            self.data = data
+            self.last_update_success = True
+            if self._listeners:
+                self._schedule_refresh()
+            self.async_update_listeners()
+
+        async def async_refresh(self):
+            try:
+                data = await self._async_update_data()
+            except UpdateFailed as err:
+                self.last_exception = err
+                self.last_update_success = False
+            else:
+                self.data = data
+                self.last_update_success = True
+            self.async_update_listeners()
+
+        async def async_request_refresh(self):
+            await self.async_refresh()
+
+        async def _handle_refresh_interval(self, _now=None):
+            await self.async_refresh()
+
+        async def async_shutdown(self):
+            pass
+
+        def _schedule_refresh(self):
+            pass
+
     coord_mod.CoordinatorEntity = CoordinatorEntity
     coord_mod.DataUpdateCoordinator = DataUpdateCoordinator
     coord_mod.UpdateFailed = UpdateFailed
 
+event_mod = _register("homeassistant.helpers.event")
+if not hasattr(event_mod, "async_call_later"):
+    event_mod.async_call_later = lambda hass, delay, action: (lambda: None)
+
+    # Tracked state-change listeners as (entity_ids, action); tests fire them
+    event_mod.state_listeners = []
+
+    def async_track_state_change_event(hass, entity_ids, action):
+        listener = (list(entity_ids), action)
+        event_mod.state_listeners.append(listener)
+        return lambda: event_mod.state_listeners.remove(listener)
+
+    event_mod.async_track_state_change_event = async_track_state_change_event
+    event_mod.async_track_time_change = lambda hass, action, **kwargs: (lambda: None)
+
+dr_mod = _register("homeassistant.helpers.device_registry")
+if not hasattr(dr_mod, "async_get"):
+    class DeviceRegistry:
+        """Minimal device registry: identifiers -> device with updatable fields."""
+
+        def __init__(self):
+            self.devices = {}
+
+        def async_get_device(self, identifiers=None):
+            for device in self.devices.values():
+                if device.identifiers & identifiers:
+                    return device
+            return None
+
+        def async_update_device(self, device_id, **changes):
+            for key, value in changes.items():
+                setattr(self.devices[device_id], key, value)
+
+    dr_mod.DeviceRegistry = DeviceRegistry
+    dr_mod.async_get = lambda hass: hass.device_registry
+
+storage_mod = _register("homeassistant.helpers.storage")
+if not hasattr(storage_mod, "Store"):
+    class Store:
+        """In-memory Store: saves land in `data` right away."""
+
+        def __init__(self, hass, version, key, private=False):
+            self.key = key
+            self.data = None
+
+        async def async_load(self):
+            return self.data
+
+        async def async_save(self, data):
+            self.data = data
+
+        def async_delay_save(self, data_func, delay=0):
+            self.data = data_func()
+
+        async def async_remove(self):
+            self.data = None
+
+    storage_mod.Store = Store
+
 ep_mod = _register("homeassistant.helpers.entity_platform")
 if not hasattr(ep_mod, "AddEntitiesCallback"):
     ep_mod.AddEntitiesCallback = object
 
+# --------------------------------------------------------------------------
+# homeassistant.util.*
+# --------------------------------------------------------------------------
+_register("homeassistant.util")
+
+ssl_mod = _register("homeassistant.util.ssl")
+if not hasattr(ssl_mod, "get_default_context"):
+    import ssl as _ssl
+    ssl_mod.get_default_context = _ssl.create_default_context
+
+dt_util_mod = _register("homeassistant.util.dt")
+if not hasattr(dt_util_mod, "now"):
+    from datetime import datetime as _datetime
+    dt_util_mod.now = _datetime.now
+sys.modules["homeassistant.util"].dt = dt_util_mod
+
+json_util_mod = _register("homeassistant.util.json")
+if not hasattr(json_util_mod, "json_loads"):
+    import json as _json
+    json_util_mod.json_loads = _json.loads
+
 # --------------------------------------------------------------------------
 # Block pytest from loading the integration's __init__.py
 #
@@ -181,3 +343,26 @@ if "__init__" not in sys.modules:
     sys.modules["__init__"] = types.ModuleType("__init__")
 
 
+# --------------------------------------------------------------------------
+# Fake clock for modules that take injectable `clock` / `sleep` callables
+# --------------------------------------------------------------------------
+class FakeClock:
+    """Fake monotonic clock; sleeping advances it and yields to the loop."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+        self.slept: list[float] = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a fresh FakeClock starting at 0."""
+    return FakeClock()
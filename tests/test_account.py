@@ -0,0 +1,146 @@
+"""Unit tests for account.py — per-account SEMS client registry."""
+
+import sys
+import os
+import types
+import importlib.util
+from unittest.mock import MagicMock
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# All HA stubs are set up by conftest.py before this file is collected.
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+storage_mod = sys.modules.setdefault(
+    "homeassistant.helpers.storage", types.ModuleType("homeassistant.helpers.storage")
+)
+if not hasattr(storage_mod, "Store"):
+    class Store:
+        def __init__(self, hass, version, key, private=False):
+            self.key = key
+    storage_mod.Store = Store
+
+# --------------------------------------------------------------------------
+# Load account.py under its own isolated package namespace
+# --------------------------------------------------------------------------
+_pkg_name = "sems_wallbox_pkg_account"
+
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_const = types.ModuleType(f"{_pkg_name}.const")
+_const.DOMAIN = "sems-wallbox"
+_const.DATA_ACCOUNTS = "accounts"
+sys.modules[f"{_pkg_name}.const"] = _const
+
+_api_stub = types.ModuleType(f"{_pkg_name}.sems_api")
+
+
+class _FakeSemsApi:
+    instances: list = []
+
+    def __init__(self, hass, username, password, token_store=None):
+        self.username = username
+        self.token_store = token_store
+        self.loaded = False
+        self.closed = False
+        _FakeSemsApi.instances.append(self)
+
+    async def async_load_token(self):
+        self.loaded = True
+        return False
+
+    async def async_close(self):
+        self.closed = True
+
+
+_api_stub.SemsApi = _FakeSemsApi
+sys.modules[f"{_pkg_name}.sems_api"] = _api_stub
+
+_spec = importlib.util.spec_from_file_location(
+    f"{_pkg_name}.account", os.path.join(_HERE, "account.py")
+)
+_account_mod = importlib.util.module_from_spec(_spec)
+_account_mod.__package__ = _pkg_name
+sys.modules[f"{_pkg_name}.account"] = _account_mod
+_spec.loader.exec_module(_account_mod)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _entry(entry_id, username="user@example.com"):
+    entry = MagicMock()
+    entry.entry_id = entry_id
+    entry.data = {"username": username, "password": "pw"}
+    return entry
+
+
+def _hass():
+    hass = MagicMock()
+    hass.data = {}
+    return hass
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestAccountKey:
+    def test_key_ignores_case_and_whitespace(self):
+        assert _account_mod.account_key(" User@Example.com ") == _account_mod.account_key("user@example.com")
+
+    def test_key_does_not_contain_username(self):
+        assert "example" not in _account_mod.account_key("user@example.com")
+
+
+class TestAccountRegistry:
+    async def test_entries_of_one_account_share_client(self):
+        hass = _hass()
+        registry = _account_mod.async_get_registry(hass)
+        first = await registry.async_acquire(_entry("a"))
+        second = await registry.async_acquire(_entry("b", username="USER@example.com"))
+        assert first is second
+        assert first.entry_ids == {"a", "b"}
+        assert first.api.loaded
+
+    async def test_different_accounts_get_separate_clients(self):
+        registry = _account_mod.async_get_registry(_hass())
+        first = await registry.async_acquire(_entry("a", username="one@example.com"))
+        second = await registry.async_acquire(_entry("b", username="two@example.com"))
+        assert first.api is not second.api
+
+    async def test_client_closed_with_last_entry(self):
+        registry = _account_mod.async_get_registry(_hass())
+        entry_a, entry_b = _entry("a"), _entry("b")
+        account = await registry.async_acquire(entry_a)
+        await registry.async_acquire(entry_b)
+
+        await registry.async_release(entry_a)
+        assert not account.api.closed
+        assert registry.get(entry_b) is account
+
+        await registry.async_release(entry_b)
+        assert account.api.closed
+        assert registry.get(entry_b) is None
+
+    async def test_registry_is_stored_in_hass_data(self):
+        hass = _hass()
+        registry = _account_mod.async_get_registry(hass)
+        assert hass.data["sems-wallbox"]["accounts"] is registry
+        assert _account_mod.async_get_registry(hass) is registry
+
+    async def test_token_store_keyed_by_account(self):
+        registry = _account_mod.async_get_registry(_hass())
+        account = await registry.async_acquire(_entry("a"))
+        assert account.api.token_store.key == f"sems-wallbox.token.{account.key}"
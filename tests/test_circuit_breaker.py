@@ -0,0 +1,129 @@
+"""Unit tests for circuit_breaker.CircuitBreaker."""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# All HA stubs are set up by conftest.py before this file is collected.
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "sems_wallbox_circuit_breaker", os.path.join(_HERE, "circuit_breaker.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["sems_wallbox_circuit_breaker"] = _mod
+_spec.loader.exec_module(_mod)
+
+BreakerState = _mod.BreakerState
+CircuitBreaker = _mod.CircuitBreaker
+CircuitOpenError = _mod.CircuitOpenError
+
+
+def _breaker(clock, **kwargs):
+    kwargs.setdefault("jitter", 0.0)
+    return CircuitBreaker("v3/test", clock=clock, **kwargs)
+
+
+def _trip(breaker, count=3):
+    for _ in range(count):
+        breaker.before_call()
+        breaker.record_failure("HTTP 500")
+
+
+class TestStateTransitions:
+    def test_stays_closed_below_min_calls(self, clock):
+        breaker = _breaker(clock)
+        _trip(breaker, 2)
+        assert breaker.state is BreakerState.CLOSED
+
+    def test_opens_on_error_rate(self, clock):
+        breaker = _breaker(clock)
+        breaker.record_success()
+        _trip(breaker, 2)
+        # 2 of 3 calls failed -> above the 50 % threshold
+        assert breaker.state is BreakerState.OPEN
+        with pytest.raises(CircuitOpenError, match="next attempt in 30s"):
+            breaker.before_call()
+
+    def test_occasional_errors_keep_circuit_closed(self, clock):
+        breaker = _breaker(clock)
+        for _ in range(4):
+            breaker.record_success()
+        _trip(breaker, 3)
+        assert breaker.state is BreakerState.CLOSED
+
+    def test_half_open_allows_a_single_probe(self, clock):
+        breaker = _breaker(clock)
+        _trip(breaker)
+        clock.now += 30
+        assert breaker.state is BreakerState.HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_successful_probe_closes(self, clock):
+        breaker = _breaker(clock)
+        _trip(breaker)
+        clock.now += 30
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.error_rate == 0.0
+
+    def test_released_probe_can_be_retried(self, clock):
+        breaker = _breaker(clock)
+        _trip(breaker)
+        clock.now += 30
+        breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+
+
+class TestBackoff:
+    def test_failed_probe_doubles_backoff(self, clock):
+        breaker = _breaker(clock)
+        _trip(breaker)
+        assert breaker.retry_in == pytest.approx(30)
+        clock.now += 30
+        breaker.before_call()
+        breaker.record_failure("timeout")
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.retry_in == pytest.approx(60)
+
+    def test_backoff_is_capped(self, clock):
+        breaker = _breaker(clock, max_backoff=100)
+        _trip(breaker)
+        for _ in range(5):
+            clock.now += breaker.retry_in
+            breaker.before_call()
+            breaker.record_failure("timeout")
+        assert breaker.retry_in == pytest.approx(100)
+
+    def test_jitter_spreads_backoff(self, clock):
+        delays = set()
+        for _ in range(20):
+            breaker = CircuitBreaker("v3/test", clock=clock, jitter=0.2)
+            _trip(breaker)
+            delays.add(round(breaker.retry_in, 3))
+            assert 24 <= breaker.retry_in <= 36
+        assert len(delays) > 1
+
+    def test_as_dict(self, clock):
+        breaker = _breaker(clock)
+        _trip(breaker)
+        assert breaker.as_dict() == {
+            "state": "open",
+            "error_rate": 1.0,
+            "retry_in": 30,
+            "open_count": 1,
+            "last_error": "HTTP 500",
+        }
@@ -0,0 +1,133 @@
+"""Unit tests for confirmation.ConfirmationScheduler."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "sems_wallbox_confirmation", os.path.join(_HERE, "confirmation.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["sems_wallbox_confirmation"] = _mod
+_spec.loader.exec_module(_mod)
+
+ConfirmationScheduler = _mod.ConfirmationScheduler
+
+SN = "GWSN001"
+
+
+class _Hass:
+    def async_create_background_task(self, coro, name):
+        return asyncio.ensure_future(coro)
+
+
+def _scheduler(clock, polls, deadline=_mod.CONFIRM_DEADLINE):
+    """Return a scheduler whose fetches return `polls` one by one."""
+    published = []
+    polls = list(polls)
+
+    async def fetch(sn):
+        value = polls.pop(0) if len(polls) > 1 else polls[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    scheduler = ConfirmationScheduler(
+        _Hass(),
+        fetch,
+        lambda sn, data: published.append(data),
+        deadline=deadline,
+        sleep=clock.sleep,
+        clock=clock,
+    )
+    return scheduler, published
+
+
+def _is_charging(data):
+    return data["charging"]
+
+
+class TestConfirmation:
+    async def test_stops_polling_once_confirmed(self, clock):
+        polls = [{"charging": False}, {"charging": False}, {"charging": True}]
+        scheduler, published = _scheduler(clock, polls)
+        assert await scheduler._async_confirm(SN, "change_status", _is_charging)
+        assert clock.slept == list(_mod.CONFIRM_BACKOFF[:3])
+        assert published == polls
+        stats = scheduler.stats["change_status"]
+        assert stats.confirmed == 1
+        assert stats.last_latency == sum(_mod.CONFIRM_BACKOFF[:3])
+
+    async def test_backoff_grows_then_repeats_until_deadline(self, clock):
+        scheduler, _ = _scheduler(clock, [{"charging": False}], deadline=100)
+        assert not await scheduler._async_confirm(SN, "change_status", _is_charging)
+        assert clock.slept[: len(_mod.CONFIRM_BACKOFF)] == list(_mod.CONFIRM_BACKOFF)
+        assert set(clock.slept[len(_mod.CONFIRM_BACKOFF):]) <= {_mod.CONFIRM_BACKOFF[-1]}
+        assert clock.now <= 100
+        assert scheduler.stats["change_status"].timed_out == 1
+
+    async def test_failed_poll_is_retried(self, clock):
+        polls = [RuntimeError("boom"), {"charging": True}]
+        scheduler, published = _scheduler(clock, polls)
+        assert await scheduler._async_confirm(SN, "change_status", _is_charging)
+        assert published == [{"charging": True}]
+        assert scheduler.stats["change_status"].polls == 2
+
+    async def test_latency_recorded_per_command_type(self, clock):
+        scheduler, _ = _scheduler(clock, [{"charging": True}])
+        await scheduler._async_confirm(SN, "change_status", _is_charging)
+        await scheduler._async_confirm(SN, "set_charge_mode", _is_charging)
+        await scheduler._async_confirm(SN, "set_charge_mode", _is_charging)
+        stats = scheduler.as_dict()
+        assert stats["change_status"]["confirmed"] == 1
+        assert stats["set_charge_mode"]["confirmed"] == 2
+        assert stats["set_charge_mode"]["avg_latency"] == _mod.CONFIRM_BACKOFF[0]
+
+
+class TestTasks:
+    async def test_new_command_replaces_running_confirmation(self, clock):
+        scheduler, _ = _scheduler(clock, [{"charging": False}])
+        scheduler.async_expect(SN, "change_status", _is_charging)
+        first = scheduler._tasks[(SN, "change_status")]
+        scheduler.async_expect(SN, "change_status", _is_charging)
+        await asyncio.sleep(0)
+        assert first.cancelled()
+        scheduler.async_cancel()
+
+    async def test_echoed_command_is_still_polled(self, clock):
+        scheduler, published = _scheduler(clock, [{"charging": False}])
+        scheduler.async_expect(SN, "change_status", _is_charging, {"charging": True})
+        assert scheduler.stats["change_status"].immediate == 1
+        task = scheduler._tasks[(SN, "change_status")]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # The echo only repeated the request: the poll shows the real state
+        assert clock.slept[0] == _mod.CONFIRM_BACKOFF[0]
+        assert published[0] == {"charging": False}
+        scheduler.async_cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def test_cancel_per_serial(self, clock):
+        scheduler, _ = _scheduler(clock, [{"charging": False}])
+        scheduler.async_expect(SN, "change_status", _is_charging)
+        scheduler.async_expect("OTHER", "change_status", _is_charging)
+        scheduler.async_cancel(SN)
+        assert list(scheduler._tasks) == [("OTHER", "change_status")]
+        scheduler.async_cancel()
+        assert scheduler._tasks == {}
+
+    async def test_finished_task_is_forgotten(self, clock):
+        scheduler, _ = _scheduler(clock, [{"charging": True}])
+        scheduler.async_expect(SN, "change_status", _is_charging)
+        task = scheduler._tasks[(SN, "change_status")]
+        assert await task is True
+        assert scheduler._tasks == {}
@@ -0,0 +1,667 @@
+"""Unit tests for coordinator.py — account-wide SemsUpdateCoordinator."""
+
+import sys
+import os
+import types
+import asyncio
+import importlib.util
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# All HA stubs are set up by conftest.py before this file is collected.
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+# --------------------------------------------------------------------------
+# Load coordinator.py under its own isolated package namespace
+# --------------------------------------------------------------------------
+_pkg_name = "sems_wallbox_pkg_coordinator"
+
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_const = types.ModuleType(f"{_pkg_name}.const")
+_const.DOMAIN = "sems-wallbox"
+_const.CONF_STATION_ID = "wallbox_serial_No"
+_const.CONF_SCAN_INTERVAL_CHARGING = "scan_interval_charging"
+_const.DEFAULT_SCAN_INTERVAL = 20
+_const.DEFAULT_SCAN_INTERVAL_IDLE = 60
+_const.DEFAULT_SCAN_INTERVAL_CHARGING = 30
+_const.CONF_SCAN_INTERVAL_TRANSITION = "scan_interval_transition"
+_const.CONF_SCAN_INTERVAL_MAX = "scan_interval_max"
+_const.DEFAULT_SCAN_INTERVAL_TRANSITION = 15
+_const.DEFAULT_SCAN_INTERVAL_MAX = 600
+_const.CONF_PROFILES = "profiles"
+_const.CONF_TRIGGERS = "triggers"
+sys.modules[f"{_pkg_name}.const"] = _const
+
+_api_stub = types.ModuleType(f"{_pkg_name}.sems_api")
+
+
+class OutOfRetries(Exception):
+    pass
+
+
+_api_stub.SemsApi = object
+_api_stub.OutOfRetries = OutOfRetries
+sys.modules[f"{_pkg_name}.sems_api"] = _api_stub
+
+_spec = importlib.util.spec_from_file_location(
+    f"{_pkg_name}.coordinator", os.path.join(_HERE, "coordinator.py")
+)
+_coord_mod = importlib.util.module_from_spec(_spec)
+_coord_mod.__package__ = _pkg_name
+sys.modules[f"{_pkg_name}.coordinator"] = _coord_mod
+_spec.loader.exec_module(_coord_mod)
+
+SemsUpdateCoordinator = _coord_mod.SemsUpdateCoordinator
+UpdateFailed = sys.modules["homeassistant.helpers.update_coordinator"].UpdateFailed
+CircuitOpenError = sys.modules[f"{_pkg_name}.circuit_breaker"].CircuitOpenError
+_rate_limiter = sys.modules[f"{_pkg_name}.rate_limiter"]
+_polling = sys.modules[f"{_pkg_name}.polling"]
+_event = sys.modules["homeassistant.helpers.event"]
+ConfigEntryNotReady = sys.modules["homeassistant.exceptions"].ConfigEntryNotReady
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _FakeApi:
+    """Returns canned data per serial; a serial mapped to None fails."""
+
+    def __init__(self, data):
+        self.data = data
+        self.calls: list[str] = []
+        self.priorities: list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def async_get_data(self, sn, priority=None):
+        self.calls.append(sn)
+        self.priorities.append(priority)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        value = self.data.get(sn)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def _payload(sn, power=0.0):
+    return {"sn": sn, "power": power, "status": "EVDetail_Status_Title_Waiting"}
+
+
+def _entry(sn, idle=60, charging=30):
+    entry = MagicMock()
+    entry.data = {"wallbox_serial_No": sn}
+    entry.options = {"scan_interval": idle, "scan_interval_charging": charging}
+    return entry
+
+
+async def _coordinator(api, serials):
+    coordinator = SemsUpdateCoordinator(MagicMock(), api)
+    for sn in serials:
+        await coordinator.async_add_serial(_entry(sn))
+    return coordinator
+
+
+# ===========================================================================
+# Serial registration
+# ===========================================================================
+
+class TestSerialRegistration:
+    async def test_add_serial_fetches_and_merges(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        assert set(coordinator.data) == {"A", "B"}
+        assert coordinator.serials == ["A", "B"]
+
+    async def test_add_serial_failure_raises_not_ready(self):
+        api = _FakeApi({"A": None})
+        coordinator = SemsUpdateCoordinator(MagicMock(), api)
+        with pytest.raises(ConfigEntryNotReady):
+            await coordinator.async_add_serial(_entry("A"))
+        assert coordinator.serials == []
+
+    async def test_remove_serial_drops_data(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        coordinator.async_remove_serial("A")
+        assert coordinator.serials == ["B"]
+        assert "A" not in coordinator.data
+
+    async def test_fastest_interval_wins(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = SemsUpdateCoordinator(MagicMock(), api)
+        await coordinator.async_add_serial(_entry("A", idle=120, charging=30))
+        await coordinator.async_add_serial(_entry("B", idle=45, charging=60))
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=45)
+
+
+# ===========================================================================
+# Batch update
+# ===========================================================================
+
+class TestBatchUpdate:
+    async def test_polls_all_serials_once_per_update(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        api.calls.clear()
+        await coordinator.async_refresh()
+        assert sorted(api.calls) == ["A", "B"]
+
+    async def test_concurrency_is_limited(self):
+        serials = [f"S{i}" for i in range(10)]
+        api = _FakeApi({sn: _payload(sn) for sn in serials})
+        coordinator = await _coordinator(api, serials)
+        api.max_in_flight = 0
+        await coordinator.async_refresh()
+        assert 1 < api.max_in_flight <= _coord_mod.MAX_PARALLEL_FETCHES
+
+    async def test_one_failing_serial_is_marked_stale(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        api.data["B"] = None
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success is True
+        assert coordinator.stale_serials == {"B"}
+        assert coordinator.serial_available("A") is True
+        assert coordinator.serial_available("B") is False
+        # Last known data is kept for the stale serial
+        assert coordinator.data["B"].sn == "B"
+
+    async def test_stale_serial_recovers(self):
+        api = _FakeApi({"A": _payload("A"), "B": None})
+        coordinator = await _coordinator(api, ["A"])
+        coordinator._serials["B"] = _polling.PollingStateMachine(_polling.PollingIntervals())
+        await coordinator.async_refresh()
+        assert "B" in coordinator.stale_serials
+        api.data["B"] = _payload("B")
+        await coordinator.async_refresh()
+        assert coordinator.stale_serials == set()
+
+    async def test_all_failing_raises_update_failed(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        api.data["A"] = OSError("down")
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success is False
+        assert isinstance(coordinator.last_exception, UpdateFailed)
+
+    async def test_open_circuit_is_explained(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        api.data["A"] = CircuitOpenError("v4/EvCharger/GetEvChargerMoreView", 42)
+        await coordinator.async_refresh()
+        assert isinstance(coordinator.last_exception, UpdateFailed)
+        assert "paused" in str(coordinator.last_exception)
+        assert "42s" in str(coordinator.last_exception)
+
+    async def test_scheduled_poll_uses_read_priority(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        await coordinator.async_refresh()
+        assert api.priorities[-1] is _rate_limiter.RequestPriority.READ
+
+    async def test_dropped_refresh_keeps_data_fresh(self, monkeypatch):
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 0)
+        api = _FakeApi({"A": _payload("A", power=1.0)})
+        coordinator = await _coordinator(api, ["A"])
+        api.data["A"] = _rate_limiter.RateLimited(_rate_limiter.RequestPriority.REFRESH, 2)
+        await coordinator.async_request_refresh()
+        assert api.priorities[-1] is _rate_limiter.RequestPriority.REFRESH
+        assert coordinator.last_update_success is True
+        assert coordinator.stale_serials == set()
+        assert coordinator.data["A"].power == 1.0
+
+    async def test_requested_priority_does_not_leak(self, monkeypatch):
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 0)
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        refresh = coordinator.async_refresh
+        # A request whose update never runs (e.g. skipped by HA)
+        coordinator.async_refresh = AsyncMock()
+        await coordinator.async_request_refresh()
+        coordinator.async_refresh = refresh
+        await coordinator.async_refresh()
+        assert api.priorities[-1] is _rate_limiter.RequestPriority.READ
+
+    async def test_charging_serial_switches_to_charging_interval(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B", power=7.4)})
+        coordinator = await _coordinator(api, ["A", "B"])
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=30)
+
+
+# ===========================================================================
+# Confirmation after commands
+# ===========================================================================
+
+class TestConfirmation:
+    async def test_confirmation_poll_fetches_and_publishes_one_serial(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        coordinator.stale_serials.add("A")
+        api.calls.clear()
+        api.data["A"] = _payload("A", power=7.4)
+        result = await coordinator._async_fetch_serial("A")
+        coordinator._async_publish_serial("A", result)
+        assert api.calls == ["A"]
+        assert coordinator.data["A"].power == 7.4
+        assert coordinator.stale_serials == set()
+
+    async def test_one_serial_publish_keeps_account_timer(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        seen = []
+        coordinator.async_add_listener(lambda: seen.append(coordinator.data["A"].power))
+        coordinator._schedule_refresh = MagicMock()
+        coordinator._async_publish_serial("A", await coordinator._async_fetch_serial("A"))
+        api.data["A"] = _payload("A", power=7.4)
+        coordinator.async_apply_command_state("A", {"power": 7.4})
+        assert seen == [7.4]
+        coordinator._schedule_refresh.assert_not_called()
+
+    async def test_command_state_is_merged_right_away(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        api.calls.clear()
+        coordinator.async_apply_command_state("A", {"chargeMode": 1})
+        assert coordinator.data["A"].charge_mode == 1
+        assert coordinator.data["A"].sn == "A"
+        assert api.calls == []
+
+    async def test_empty_command_state_changes_nothing(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        before = coordinator.data
+        coordinator.async_apply_command_state("A", {})
+        coordinator.async_apply_command_state("B", {"chargeMode": 1})
+        assert coordinator.data is before
+
+    async def test_poll_of_removed_serial_is_ignored(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        coordinator.async_remove_serial("A")
+        coordinator._async_publish_serial("A", _payload("A"))
+        assert "A" not in coordinator.data
+
+    async def test_shutdown_cancels_confirmations(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        coordinator.confirmations.async_cancel = MagicMock()
+        await coordinator.async_shutdown()
+        coordinator.confirmations.async_cancel.assert_called_once_with()
+
+
+# ===========================================================================
+# Dirty-field listener fan-out
+# ===========================================================================
+
+class TestListeners:
+    async def _subscribed(self, api):
+        coordinator = await _coordinator(api, ["A", "B"])
+        calls = {"power": 0, "status": 0, "b": 0, "any": 0}
+
+        def counter(key):
+            def update():
+                calls[key] += 1
+            return update
+
+        coordinator.async_add_listener(counter("power"), ("A", ("power",)))
+        coordinator.async_add_listener(counter("status"), ("A", ("state",)))
+        coordinator.async_add_listener(counter("b"), ("B", ("power",)))
+        coordinator.async_add_listener(counter("any"))
+        return coordinator, calls
+
+    async def test_identical_poll_skips_fan_out(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator, calls = await self._subscribed(api)
+        await coordinator.async_refresh()
+        assert calls == {"power": 0, "status": 0, "b": 0, "any": 0}
+        assert coordinator.notify_stats["skipped"] >= 1
+
+    async def test_only_subscribers_of_changed_fields_are_notified(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator, calls = await self._subscribed(api)
+        api.data["A"] = {**_payload("A"), "current": 16.0}
+        await coordinator.async_refresh()
+        assert calls == {"power": 0, "status": 0, "b": 0, "any": 1}
+        api.data["A"] = {**_payload("A", power=7.4), "current": 16.0}
+        await coordinator.async_refresh()
+        assert calls == {"power": 1, "status": 0, "b": 0, "any": 2}
+
+    async def test_availability_change_notifies_everyone_of_that_serial(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator, calls = await self._subscribed(api)
+        api.data["A"] = RuntimeError("boom")
+        await coordinator.async_refresh()
+        assert calls == {"power": 1, "status": 1, "b": 0, "any": 1}
+
+    async def test_notify_serial_reaches_its_listeners(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator, calls = await self._subscribed(api)
+        coordinator.async_notify_serial("A")
+        assert calls == {"power": 1, "status": 1, "b": 0, "any": 1}
+
+
+# ===========================================================================
+# Device info
+# ===========================================================================
+
+class TestDevices:
+    async def _registered(self, api):
+        coordinator = await _coordinator(api, ["A"])
+        registry = sys.modules["homeassistant.helpers.device_registry"].DeviceRegistry()
+        registry.devices["dev-a"] = types.SimpleNamespace(
+            id="dev-a", identifiers={("sems-wallbox", "A")}, name=None, model=None, sw_version=None
+        )
+        coordinator.hass.device_registry = registry
+        return coordinator, registry.devices["dev-a"]
+
+    async def test_device_info_is_built_from_first_poll(self):
+        api = _FakeApi({"A": {**_payload("A"), "name": "Garage", "model": "HCA"}})
+        coordinator = await _coordinator(api, ["A"])
+        info = coordinator.devices["A"].info
+        assert info["identifiers"] == {("sems-wallbox", "A")}
+        assert info["name"] == "Garage"
+        assert info["model"] == "HCA"
+        assert info["sw_version"] == "unknown"
+
+    async def test_info_is_reused_until_metadata_changes(self):
+        api = _FakeApi({"A": {**_payload("A"), "name": "Garage"}})
+        coordinator, _ = await self._registered(api)
+        info = coordinator.devices["A"].info
+        api.data["A"] = {**_payload("A", power=7.4), "name": "Garage"}
+        await coordinator.async_refresh()
+        assert coordinator.devices["A"].info is info
+
+    async def test_metadata_change_updates_registry(self):
+        api = _FakeApi({"A": {**_payload("A"), "fireware": "1.0"}})
+        coordinator, device = await self._registered(api)
+        api.data["A"] = {**_payload("A"), "fireware": "1.1"}
+        await coordinator.async_refresh()
+        assert coordinator.devices["A"].info["sw_version"] == "1.1"
+        assert device.sw_version == "1.1"
+        assert device.name == "GoodWe Wallbox A"
+
+    async def test_remove_serial_drops_device(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        coordinator.async_remove_serial("A")
+        assert "A" not in coordinator.devices
+
+
+# ===========================================================================
+# Adaptive polling
+# ===========================================================================
+
+class TestAdaptivePolling:
+    async def test_offline_wallbox_backs_off(self):
+        offline = {"sn": "A", "status": "EVDetail_Status_Title_Offline"}
+        api = _FakeApi({"A": offline})
+        coordinator = await _coordinator(api, ["A"])
+        seen = []
+        for _ in range(3):
+            await coordinator.async_refresh()
+            seen.append(coordinator.update_interval.total_seconds())
+        assert seen == [60, 120, 240]
+        assert coordinator.polling_state("A")["state"] == "offline"
+
+    async def test_plugged_in_fast_mode_polls_fast(self):
+        api = _FakeApi({"A": {
+            **_payload("A"), "workstate": "EVDetail_Status_Waiting_Stat01", "chargeMode": 0,
+        }})
+        coordinator = await _coordinator(api, ["A"])
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=15)
+
+    async def test_busiest_wallbox_sets_the_pace(self):
+        offline = {"status": "EVDetail_Status_Title_Offline"}
+        api = _FakeApi({"A": {"sn": "A", **offline}, "B": {"sn": "B", **offline}})
+        coordinator = await _coordinator(api, ["A", "B"])
+        for _ in range(3):
+            await coordinator.async_refresh()
+        api.data["B"] = _payload("B", power=7.4)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=15)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=30)
+
+    async def test_timer_tick_polls_only_due_wallboxes(self, monkeypatch):
+        clock = types.SimpleNamespace(now=1000.0)
+        monkeypatch.setattr(
+            _coord_mod, "time", types.SimpleNamespace(monotonic=lambda: clock.now)
+        )
+        api = _FakeApi({
+            "A": {"sn": "A", "status": "EVDetail_Status_Title_Offline"},
+            "B": {**_payload("B"), "workstate": "EVDetail_Status_Waiting_Stat01",
+                  "chargeMode": 0},
+        })
+        coordinator = await _coordinator(api, ["A", "B"])
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=15)
+        assert coordinator.polling_state("A")["due_in"] == 60
+        api.calls.clear()
+        for _ in range(4):
+            clock.now += coordinator.update_interval.total_seconds()
+            await coordinator._handle_refresh_interval()
+        # The offline wallbox is not fetched at the starting one's cadence
+        assert api.calls.count("B") == 4
+        assert api.calls.count("A") == 1
+        assert coordinator.polling_state("A")["due_in"] == 120
+
+    async def test_tick_with_nothing_due_fetches_nothing(self, monkeypatch):
+        clock = types.SimpleNamespace(now=1000.0)
+        monkeypatch.setattr(
+            _coord_mod, "time", types.SimpleNamespace(monotonic=lambda: clock.now)
+        )
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        api.calls.clear()
+        clock.now += 30
+        await coordinator._handle_refresh_interval()
+        assert api.calls == []
+        assert coordinator.update_interval == timedelta(seconds=30)
+        assert coordinator.data["A"].sn == "A"
+
+    async def _two_cadences(self, monkeypatch, api):
+        clock = types.SimpleNamespace(now=1000.0)
+        monkeypatch.setattr(
+            _coord_mod, "time", types.SimpleNamespace(monotonic=lambda: clock.now)
+        )
+        coordinator = SemsUpdateCoordinator(MagicMock(), api)
+        await coordinator.async_add_serial(_entry("A", idle=60))
+        await coordinator.async_add_serial(_entry("B", idle=120))
+        api.calls.clear()
+        clock.now += 60
+        return coordinator
+
+    async def test_failing_due_wallbox_leaves_others_available(self, monkeypatch):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await self._two_cadences(monkeypatch, api)
+        api.data["A"] = OSError("down")
+        await coordinator._handle_refresh_interval()
+        assert api.calls == ["A"]
+        assert coordinator.last_update_success is True
+        assert coordinator.serial_available("A") is False
+        assert coordinator.serial_available("B") is True
+
+    async def test_tick_keeps_data_published_meanwhile(self, monkeypatch):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await self._two_cadences(monkeypatch, api)
+        fetch = api.async_get_data
+
+        async def fetch_while_confirming(sn, priority=None):
+            # A confirmation poll of B publishes while A is being fetched
+            coordinator._async_publish_serial(
+                "B", _coord_mod.WallboxSnapshot.from_dict(_payload("B", power=7.0))
+            )
+            return await fetch(sn, priority)
+
+        api.async_get_data = fetch_while_confirming
+        await coordinator._handle_refresh_interval()
+        assert api.calls == ["A"]
+        assert coordinator.data["B"].power == 7.0
+
+    async def test_added_wallbox_replans_running_timer(self):
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = SemsUpdateCoordinator(MagicMock(), api)
+        await coordinator.async_add_serial(_entry("A", idle=600))
+        coordinator.async_add_listener(lambda: None)
+        coordinator._schedule_refresh = MagicMock()
+        await coordinator.async_add_serial(_entry("B", idle=60))
+        assert coordinator.update_interval == timedelta(seconds=60)
+        coordinator._schedule_refresh.assert_called_once()
+        coordinator.async_remove_serial("B")
+        assert coordinator.update_interval == timedelta(seconds=600)
+        assert coordinator._schedule_refresh.call_count == 2
+
+    async def test_plug_in_is_learned(self):
+        api = _FakeApi({"A": {**_payload("A"), "workstate": "EVDetail_Status_Waiting_Stat00"}})
+        coordinator = await _coordinator(api, ["A"])
+        await coordinator.async_refresh()
+        api.data["A"] = {**_payload("A"), "workstate": "EVDetail_Status_Waiting_Stat01"}
+        await coordinator.async_refresh()
+        assert coordinator.polling_state("A")["learned_events"] == 1
+
+    async def test_profile_switch_replans_without_reload(self):
+        api = _FakeApi({"A": {**_payload("A"), "workstate": "EVDetail_Status_Waiting_Stat01",
+                              "chargeMode": 1}})
+        states = {"input_select.house_mode": "Home"}
+        hass = MagicMock()
+        hass.states.get = lambda entity_id: MagicMock(state=states[entity_id])
+        coordinator = SemsUpdateCoordinator(hass, api)
+        entry = _entry("A")
+        entry.options["profiles"] = [{
+            "name": "Away", "idle": 900, "charging": 120, "offline": 3600,
+            "entity_id": "input_select.house_mode",
+        }]
+        await coordinator.async_add_serial(entry)
+        await coordinator.async_refresh()
+        coordinator.async_add_listener(lambda: None)
+        coordinator._schedule_refresh = MagicMock()
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+        states["input_select.house_mode"] = "Away"
+        for _, action in list(_event.state_listeners):
+            action(None)
+        assert coordinator.update_interval == timedelta(seconds=900)
+        assert coordinator.polling_state("A")["profile"] == "Away"
+        coordinator._schedule_refresh.assert_called_once()
+
+        states["input_select.house_mode"] = "Home"
+        for _, action in list(_event.state_listeners):
+            action(None)
+        assert coordinator.update_interval == timedelta(seconds=60)
+        assert coordinator.polling_state("A")["profile"] is None
+
+        coordinator.async_remove_serial("A")
+        assert _event.state_listeners == []
+
+
+class TestRefreshTriggers:
+    async def test_trigger_refreshes_within_cooldown(self, monkeypatch):
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 0)
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        states = {"sensor.grid": "0"}
+        hass = MagicMock()
+        hass.states.get = lambda entity_id: MagicMock(state=states[entity_id])
+        tasks = []
+        hass.async_create_task = tasks.append
+        coordinator = SemsUpdateCoordinator(hass, api)
+        entry = _entry("A")
+        entry.options["triggers"] = [{"entity_id": "sensor.grid", "threshold": 1.0}]
+        await coordinator.async_add_serial(entry)
+        await coordinator.async_add_serial(_entry("B"))
+        api.calls.clear()
+        later = []
+        monkeypatch.setattr(
+            _coord_mod, "async_call_later",
+            lambda hass, delay, action: later.append((delay, action)) or (lambda: None),
+        )
+
+        def change(value):
+            event = MagicMock(data={"entity_id": "sensor.grid",
+                                    "new_state": MagicMock(state=value)})
+            for _, action in list(_event.state_listeners):
+                action(event)
+
+        change("2.5")
+        assert len(tasks) == 1
+        api.data["A"] = _payload("A", power=7.4)
+        await tasks.pop()
+        # Only the wallbox whose trigger fired is fetched
+        assert api.calls == ["A"]
+        assert api.priorities[-1] is _rate_limiter.RequestPriority.REFRESH
+        assert coordinator.data["A"].power == 7.4
+        assert coordinator.polling_state("A")["state"] == "charging"
+
+        # Within the cooldown: deferred once, then merged
+        change("5")
+        change("7")
+        assert tasks == [] and len(later) == 1
+        assert 0 < later[0][0] <= _coord_mod.TRIGGER_COOLDOWN
+        later[0][1](None)
+        await tasks.pop()
+        assert api.calls == ["A", "A"]
+        assert coordinator.trigger_stats == {
+            "fired": 3, "refreshes": 2, "deferred": 1, "merged": 1,
+        }
+        coordinator.async_remove_serial("A")
+        assert _event.state_listeners == []
+
+    async def test_dropped_trigger_refresh_keeps_data(self, monkeypatch):
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 0)
+        api = _FakeApi({"A": _payload("A", power=1.0)})
+        coordinator = await _coordinator(api, ["A"])
+        api.data["A"] = _rate_limiter.RateLimited(_rate_limiter.RequestPriority.REFRESH, 2)
+        await coordinator._async_refresh_serial("A")
+        assert coordinator.stale_serials == set()
+        assert coordinator.data["A"].power == 1.0
+
+
+class TestRefreshGate:
+    async def test_overlapping_requests_share_one_fetch(self, monkeypatch):
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 0)
+        api = _FakeApi({"A": _payload("A"), "B": _payload("B")})
+        coordinator = await _coordinator(api, ["A", "B"])
+        api.calls.clear()
+        await asyncio.gather(*(coordinator.async_request_refresh() for _ in range(8)))
+        assert api.calls == ["A", "B"]
+        assert coordinator.refresh_stats == {"requested": 8, "merged": 7, "spaced": 0}
+
+    async def test_request_right_after_fetch_reuses_data(self):
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        await coordinator.async_request_refresh()
+        assert api.calls == ["A"]
+        assert coordinator.refresh_stats["spaced"] == 1
+
+    async def test_confirmation_joins_update_in_flight(self, monkeypatch):
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 0)
+        api = _FakeApi({"A": _payload("A")})
+        coordinator = await _coordinator(api, ["A"])
+        monkeypatch.setattr(_coord_mod, "REFRESH_MIN_SPACING", 60)
+        api.calls.clear()
+        refresh = asyncio.ensure_future(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        snapshot = await coordinator._async_fetch_confirmation("A")
+        await refresh
+        assert api.calls == ["A"]
+        assert snapshot is coordinator.data["A"]
+        assert coordinator.refresh_stats["merged"] == 1
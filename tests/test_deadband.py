@@ -0,0 +1,99 @@
+"""Unit tests for deadband.DeadbandFilter."""
+
+import importlib.util
+import os
+import sys
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "sems_wallbox_deadband", os.path.join(_HERE, "deadband.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["sems_wallbox_deadband"] = _mod
+_spec.loader.exec_module(_mod)
+
+DeadbandFilter = _mod.DeadbandFilter
+
+
+def _filter(clock, **kwargs):
+    return DeadbandFilter(clock=clock, **kwargs)
+
+
+class TestDeadband:
+    def test_first_value_is_published(self, clock):
+        f = _filter(clock, absolute=1.0)
+        assert f.accept(7.4)
+        assert f.value == 7.4
+
+    def test_small_change_is_suppressed(self, clock):
+        f = _filter(clock, absolute=0.5)
+        f.accept(7.4)
+        assert not f.accept(7.6)
+        assert f.value == 7.4
+        assert f.suppressed == 1
+
+    def test_change_is_measured_from_last_published_value(self, clock):
+        f = _filter(clock, absolute=0.5)
+        f.accept(7.4)
+        f.accept(7.7)
+        assert f.accept(7.9)
+        assert f.value == 7.9
+
+    def test_relative_deadband_wins_when_larger(self, clock):
+        f = _filter(clock, absolute=0.1, relative=0.1)
+        f.accept(10.0)
+        assert not f.accept(10.5)
+        assert f.accept(11.0)
+
+    def test_no_thresholds_publishes_every_change(self, clock):
+        f = _filter(clock)
+        f.accept(7.4)
+        assert f.accept(7.41)
+        assert not f.accept(7.41)
+
+    def test_start_and_stop_always_published(self, clock):
+        f = _filter(clock, absolute=5.0)
+        f.accept(0.0)
+        assert f.accept(1.4)
+        assert f.accept(0.0)
+
+    def test_heartbeat_publishes_drift(self, clock):
+        f = _filter(clock, absolute=1.0, heartbeat=300)
+        f.accept(7.4)
+        clock.now = 299
+        assert not f.accept(7.5)
+        clock.now = 300
+        assert f.accept(7.5)
+
+    def test_flush_publishes_pending_at_heartbeat(self, clock):
+        f = _filter(clock, absolute=1.0, heartbeat=300)
+        f.accept(7.0)
+        clock.now = 10
+        assert not f.accept(7.05)
+        assert f.heartbeat_delay() == 290
+        assert not f.flush()
+        clock.now = 300
+        assert f.flush()
+        assert f.value == 7.05
+        assert f.heartbeat_delay() is None
+
+    def test_no_pending_once_value_returns(self, clock):
+        f = _filter(clock, absolute=1.0, heartbeat=300)
+        f.accept(7.0)
+        f.accept(7.05)
+        f.accept(7.0)
+        clock.now = 400
+        assert f.heartbeat_delay() is None
+        assert not f.flush()
+
+    def test_availability_change_published(self, clock):
+        f = _filter(clock, absolute=1.0)
+        f.accept(7.4)
+        assert f.accept(None)
+        assert not f.accept(None)
+        assert f.accept(7.4)
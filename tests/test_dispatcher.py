@@ -0,0 +1,115 @@
+"""Unit tests for dispatcher.CommandDispatcher."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "sems_wallbox_dispatcher", os.path.join(_HERE, "dispatcher.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["sems_wallbox_dispatcher"] = _mod
+_spec.loader.exec_module(_mod)
+
+CommandDispatcher = _mod.CommandDispatcher
+CommandOutcome = _mod.CommandOutcome
+
+
+def _sender(sent, ok=True):
+    def make(value):
+        async def send():
+            sent.append(value)
+            await asyncio.sleep(0)
+            return ok
+        return send
+    return make
+
+
+class TestCoalescing:
+    async def test_single_write_is_sent(self):
+        sent = []
+        dispatcher = CommandDispatcher(window=0)
+        outcome = await dispatcher.async_submit("k", _sender(sent)(5.0))
+        assert outcome is CommandOutcome.SUCCESS
+        assert sent == [5.0]
+
+    async def test_burst_collapses_to_last_value(self):
+        sent = []
+        make = _sender(sent)
+        dispatcher = CommandDispatcher(window=0.01)
+        outcomes = await asyncio.gather(
+            *(dispatcher.async_submit("k", make(v)) for v in (4.2, 6.0, 8.5, 11.0))
+        )
+        assert sent == [11.0]
+        assert outcomes == [CommandOutcome.SUPERSEDED] * 3 + [CommandOutcome.SUCCESS]
+        assert dispatcher.superseded == 3
+        assert dispatcher.sent == 1
+
+    async def test_keys_are_independent(self):
+        sent = []
+        make = _sender(sent)
+        dispatcher = CommandDispatcher(window=0.01)
+        await asyncio.gather(
+            dispatcher.async_submit("a", make("a")),
+            dispatcher.async_submit("b", make("b")),
+        )
+        assert sorted(sent) == ["a", "b"]
+
+    async def test_immediate_write_supersedes_debounced_one(self):
+        sent = []
+        make = _sender(sent)
+        dispatcher = CommandDispatcher(window=0.05)
+        slow = asyncio.ensure_future(dispatcher.async_submit("k", make("slider")))
+        await asyncio.sleep(0)
+        fast = await dispatcher.async_submit("k", make("mode"), delay=0)
+        assert fast is CommandOutcome.SUCCESS
+        assert await slow is CommandOutcome.SUPERSEDED
+        assert sent == ["mode"]
+
+    async def test_failure_is_reported(self):
+        dispatcher = CommandDispatcher(window=0)
+        outcome = await dispatcher.async_submit("k", _sender([], ok=False)(1))
+        assert outcome is CommandOutcome.FAILED
+
+
+class TestOrdering:
+    async def test_sends_to_same_key_do_not_overlap(self):
+        active = 0
+        peak = 0
+        release = asyncio.Event()
+
+        async def send():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await release.wait()
+            active -= 1
+            return True
+
+        dispatcher = CommandDispatcher(window=0)
+        first = asyncio.ensure_future(dispatcher.async_submit("k", send))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(dispatcher.async_submit("k", send))
+        await asyncio.sleep(0.01)
+        release.set()
+        assert await first is CommandOutcome.SUCCESS
+        assert await second is CommandOutcome.SUCCESS
+        assert peak == 1
+
+    async def test_cancelled_submit_is_forgotten(self):
+        dispatcher = CommandDispatcher(window=10)
+        task = asyncio.ensure_future(dispatcher.async_submit("k", _sender([])(1)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert dispatcher._pending == {}
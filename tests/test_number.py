@@ -1,11 +1,12 @@
 """Unit tests for number.py — SemsNumber charge-power slider entity."""
 
+import asyncio
 import sys
 import os
 import types
 import importlib.util
 import time
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, AsyncMock, call
 import pytest
 
 # ---------------------------------------------------------------------------
@@ -39,10 +40,16 @@ _coord_stub = types.ModuleType(f"{_pkg_name}.coordinator")
 class _FakeCoordinator:
     def __init__(self, data):
         self.data = data
+        self.hass = MagicMock()
+        self.devices = {sn: _device(snapshot) for sn, snapshot in data.items()}
         self.last_update_success = True
+        self.stale_serials = set()
         self._listeners: list = []
         self._refresh_requested = False
 
+    def serial_available(self, sn):
+        return self.last_update_success and sn not in self.stale_serials
+
     def async_add_listener(self, listener):
         self._listeners.append(listener)
         return lambda: self._listeners.remove(listener)
@@ -52,10 +59,20 @@ class _FakeCoordinator:
         for listener in list(self._listeners):
             listener()
 
+    def async_notify_serial(self, sn):
+        for listener in list(self._listeners):
+            listener()
+
     def async_request_refresh(self):
         self._refresh_requested = True
 
-    def schedule_delayed_refresh(self, delay=5):
+    def async_confirm(self, sn, kind, check):
+        pass
+
+    def poll(self, **changes):
+        self.data = {SAMPLE_SN: self.data[SAMPLE_SN].merge(changes)}
+
+    def async_apply_command_state(self, sn, state):
         pass
 
 
@@ -72,6 +89,18 @@ sys.modules[f"{_pkg_name}.number"] = _number_mod
 _spec.loader.exec_module(_number_mod)
 
 SemsNumber = _number_mod.SemsNumber
+_dispatcher_mod = sys.modules[f"{_pkg_name}.dispatcher"]
+_reconciler_mod = sys.modules[f"{_pkg_name}.reconciler"]
+WallboxSnapshot = sys.modules[f"{_pkg_name}.snapshot"].WallboxSnapshot
+WallboxDevice = importlib.import_module(f"{_pkg_name}.device").WallboxDevice
+
+
+def _device(snapshot):
+    """Return the shared device info object of a polled wallbox."""
+    device = WallboxDevice(snapshot.sn)
+    device.update(snapshot)
+    return device
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -79,6 +108,10 @@ SemsNumber = _number_mod.SemsNumber
 
 SAMPLE_SN = "GWSN001"
 
+# Command results as returned by SemsApi (ok, state echoed in the response)
+ACCEPTED = types.SimpleNamespace(ok=True, state={})
+REJECTED = types.SimpleNamespace(ok=False, state={})
+
 SAMPLE_DATA = {
     "sn": SAMPLE_SN,
     "chargeMode": 0,
@@ -102,19 +135,18 @@ def _make_entity(
         "min_charge_power": min_charge_power,
         "max_charge_power": max_charge_power,
     }
-    coordinator = _FakeCoordinator({SAMPLE_SN: data})
+    coordinator = _FakeCoordinator({SAMPLE_SN: WallboxSnapshot.from_dict(data)})
     api = MagicMock()
-    api.set_charge_mode = MagicMock()
+    api.async_set_charge_mode = AsyncMock(return_value=ACCEPTED)
+    reconciler = _reconciler_mod.WallboxReconciler(
+        coordinator, api, SAMPLE_SN, _dispatcher_mod.CommandDispatcher(window=0)
+    )
 
-    entity = SemsNumber(coordinator, SAMPLE_SN, api, set_charge_power)
+    entity = SemsNumber(coordinator, SAMPLE_SN, reconciler)
+    entity.api = api  # handle for assertions
 
     hass = MagicMock()
     hass.async_create_task = MagicMock()
-
-    async def fake_executor(func, *args):
-        return func(*args)
-
-    hass.async_add_executor_job = fake_executor
     entity.hass = hass
     entity.async_write_ha_state = MagicMock()
     return entity
@@ -127,15 +159,15 @@ def _make_entity(
 class TestInitialState:
     def test_initial_native_value(self):
         entity = _make_entity(set_charge_power=6.5)
-        assert entity._attr_native_value == 6.5
+        assert entity.native_value == 6.5
 
     def test_initial_native_value_none_when_data_none(self):
         entity = _make_entity(set_charge_power=None)
-        assert entity._attr_native_value is None
+        assert entity.native_value is None
 
     def test_unique_id(self):
         entity = _make_entity()
-        assert entity.unique_id == f"{SAMPLE_SN}_number_set_charge_power"
+        assert entity._attr_unique_id == f"{SAMPLE_SN}_number_set_charge_power"
 
     def test_translation_key(self):
         entity = _make_entity()
@@ -180,22 +212,22 @@ class TestMinMax:
 
     def test_min_fallback_to_default_when_none(self):
         entity = _make_entity()
-        entity.coordinator.data[SAMPLE_SN]["min_charge_power"] = None
+        entity.coordinator.poll(min_charge_power=None)
         assert entity.native_min_value == _number_mod.SemsNumber._DEFAULT_MIN
 
     def test_max_fallback_to_default_when_none(self):
         entity = _make_entity()
-        entity.coordinator.data[SAMPLE_SN]["max_charge_power"] = None
+        entity.coordinator.poll(max_charge_power=None)
         assert entity.native_max_value == _number_mod.SemsNumber._DEFAULT_MAX
 
     def test_min_fallback_on_invalid_string(self):
         entity = _make_entity()
-        entity.coordinator.data[SAMPLE_SN]["min_charge_power"] = "bad"
+        entity.coordinator.poll(min_charge_power="bad")
         assert entity.native_min_value == _number_mod.SemsNumber._DEFAULT_MIN
 
     def test_max_fallback_on_invalid_string(self):
         entity = _make_entity()
-        entity.coordinator.data[SAMPLE_SN]["max_charge_power"] = "bad"
+        entity.coordinator.poll(max_charge_power="bad")
         assert entity.native_max_value == _number_mod.SemsNumber._DEFAULT_MAX
 
 
@@ -206,198 +238,125 @@ class TestMinMax:
 class TestSetNativeValue:
     @pytest.mark.asyncio
     async def test_slider_sends_fast_mode_with_value(self):
-        """Moving the slider must always send set_charge_mode(sn, 0, value).
-
-        Sending mode=0 (Fast) together with the new power prevents a race
-        condition where an in-flight mode-switch call (which also sends
-        charge_power) could overwrite the slider value at the API side.
-        By always including mode=0, the last write wins regardless of call
-        ordering.
-        """
+        """Moving the slider must always send set_charge_mode(sn, 0, value)."""
         entity = _make_entity(chargeMode=0, set_charge_power=7.4)
         await entity.async_set_native_value(9.0)
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 9.0)
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 9.0)
 
     @pytest.mark.asyncio
-    async def test_slider_updates_coordinator_data_before_api_call(self):
-        """async_set_native_value must write set_charge_power into coordinator.data
-        before awaiting the API, so that an in-flight select.py mode-switch call
-        can detect the change and re-send with the correct power."""
+    async def test_slider_value_shown_before_api_call(self):
+        """native_value must show the new value while the API call is in flight."""
         entity = _make_entity(chargeMode=0, set_charge_power=7.4)
-
-        data_at_api_call_time: list[float] = []
+        seen: list[float] = []
 
         def capture_api(sn, mode, value):
-            # Read coordinator.data at the moment the API is called
-            data_at_api_call_time.append(
-                entity.coordinator.data[SAMPLE_SN].get("set_charge_power")
-            )
-            return True
-
-        entity.api.set_charge_mode = capture_api
+            seen.append(entity.native_value)
+            return ACCEPTED
 
+        entity.api.async_set_charge_mode = AsyncMock(side_effect=capture_api)
         await entity.async_set_native_value(9.0)
-
-        # coordinator.data must already hold 9.0 when the API was called
-        assert data_at_api_call_time == [9.0]
-        # And still correct after the call
-        assert entity.coordinator.data[SAMPLE_SN]["set_charge_power"] == 9.0
+        assert seen == [9.0]
+        assert entity.native_value == 9.0
 
     @pytest.mark.asyncio
-    async def test_slider_optimistic_update_before_api(self):
-        """native_value must be updated optimistically before the API call."""
-        call_order: list[str] = []
-
+    async def test_slider_notifies_listeners_before_api_call(self):
         entity = _make_entity(chargeMode=0)
-        original_write_state = entity.async_write_ha_state
-
-        def capture_write():
-            call_order.append(("write_ha_state", entity._attr_native_value))
-            original_write_state()
-
-        entity.async_write_ha_state = capture_write
-
-        original_set_charge_mode = entity.api.set_charge_mode
+        call_order: list = []
+        entity.coordinator.async_add_listener(
+            lambda: call_order.append(("update", entity.native_value))
+        )
 
         def capture_api(sn, mode, value):
             call_order.append(("api_call", value))
-            return original_set_charge_mode(sn, mode, value)
-
-        entity.api.set_charge_mode = capture_api
+            return ACCEPTED
 
+        entity.api.async_set_charge_mode = AsyncMock(side_effect=capture_api)
         await entity.async_set_native_value(9.0)
-
-        # write_ha_state must have been called with 9.0 BEFORE the API call
-        assert call_order[0] == ("write_ha_state", 9.0)
+        assert call_order[0] == ("update", 9.0)
         assert call_order[1] == ("api_call", 9.0)
 
     @pytest.mark.asyncio
-    async def test_slider_schedules_refresh_after_api(self):
-        """schedule_delayed_refresh must be called to schedule a coordinator refresh."""
+    async def test_slider_starts_confirmation_after_api(self):
+        """A successful write starts confirmation polling on the coordinator."""
         entity = _make_entity(chargeMode=0)
-        entity.coordinator.schedule_delayed_refresh = MagicMock()
+        entity.coordinator.async_confirm = MagicMock()
         await entity.async_set_native_value(9.0)
-        entity.coordinator.schedule_delayed_refresh.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_slider_sends_mode_0_not_mode_1(self):
-        """Slider must always use mode=0, never another mode value."""
-        entity = _make_entity(chargeMode=0)
-        await entity.async_set_native_value(5.5)
-        _, mode_arg, _ = entity.api.set_charge_mode.call_args[0]
-        assert mode_arg == 0
+        entity.coordinator.async_confirm.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_slider_passes_exact_value_to_api(self):
-        """The value passed to the API must equal the slider value."""
-        entity = _make_entity(chargeMode=0)
-        await entity.async_set_native_value(10.3)
-        _, _, power_arg = entity.api.set_charge_mode.call_args[0]
-        assert power_arg == 10.3
+    async def test_unchanged_value_sends_nothing(self):
+        entity = _make_entity(chargeMode=0, set_charge_power=7.4)
+        await entity.async_set_native_value(7.4)
+        entity.api.async_set_charge_mode.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_slider_reverts_value_on_api_failure(self):
-        """If set_charge_mode returns False the slider must revert to the value
-        currently in coordinator.data and async_write_ha_state must be called
-        so the UI reflects the revert immediately.  HomeAssistantError is raised
-        so HA shows a toast notification to the user."""
+        """If set_charge_mode returns False the slider falls back to the polled
+        value and HomeAssistantError is raised so HA shows a toast."""
         entity = _make_entity(chargeMode=0, set_charge_power=7.4)
-        entity.api.set_charge_mode = MagicMock(return_value=False)
+        entity.api.async_set_charge_mode = AsyncMock(return_value=REJECTED)
         with pytest.raises(Exception):  # HomeAssistantError
             await entity.async_set_native_value(9.0)
-        assert entity._attr_native_value == 7.4
-        assert entity.coordinator.data[SAMPLE_SN]["set_charge_power"] == 7.4
-        # write_ha_state must be called to push the reverted value to the UI
+        assert entity.native_value == 7.4
         entity.async_write_ha_state.assert_called()
-
-    @pytest.mark.asyncio
-    async def test_slider_still_schedules_refresh_on_api_failure(self):
-        """A coordinator refresh must be scheduled even when the API call fails,
-        so the UI reconciles with the actual device state."""
-        entity = _make_entity(chargeMode=0, set_charge_power=7.4)
-        entity.api.set_charge_mode = MagicMock(return_value=False)
-        with pytest.raises(Exception):  # HomeAssistantError
-            await entity.async_set_native_value(9.0)
         entity.hass.async_create_task.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_slider_does_not_revert_when_pv_mode_during_timeout(self):
-        """If an API call times out while the mode has already switched to PV
-        (entity becomes unavailable), the revert must NOT overwrite the preserved
-        PV power value.  The user set 11 kW; we must remember that for the next
-        switch back to Fast — not silently revert to the old 7.4 kW.
+        """If the call times out after the mode already switched to PV, the
+        user's value must be remembered for the next switch back to Fast.
 
         Real-world scenario (from log):
           15:27:30 Slider moved to 11 kW → API call starts (30 s timeout)
           15:27:33 PV mode selected → confirmed by poll, slider hidden (unavailable)
-          15:28:00 Set-Fast-11 API call finally times out → revert must be skipped
+          15:28:00 Set-Fast-11 API call finally times out → keep 11 kW
         """
         entity = _make_entity(chargeMode=0, set_charge_power=7.4)
 
         def side_effect(sn, mode, power):
-            # Simulate: while waiting for the API, PV mode was confirmed by poll →
-            # coordinator.data now shows chargeMode=1, slider is unavailable.
-            entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-            return False  # timeout
-
-        entity.api.set_charge_mode = side_effect
+            entity.coordinator.poll(chargeMode=1)
+            return REJECTED  # timeout
 
+        entity.api.async_set_charge_mode = AsyncMock(side_effect=side_effect)
         with pytest.raises(Exception):  # HomeAssistantError
             await entity.async_set_native_value(11.0)
+        assert entity.native_value == 11.0
+        assert entity.available is False
 
-        # native_value must stay at 11.0 (not reverted to 7.4)
-        assert entity._attr_native_value == 11.0
-        # coordinator.data must also keep 11.0 so select.py uses it on next Fast switch
-        assert entity.coordinator.data[SAMPLE_SN]["set_charge_power"] == 11.0
+    @pytest.mark.asyncio
+    async def test_slider_drag_sends_only_last_value(self):
+        """Rapid slider moves collapse into one API call with the final value;
+        earlier moves are superseded without reverting or raising."""
+        entity = _make_entity(chargeMode=0, set_charge_power=7.4)
+        entity.reconciler._dispatcher = _dispatcher_mod.CommandDispatcher(window=0.01)
+        entity.coordinator.async_confirm = MagicMock()
+        await asyncio.gather(
+            *(entity.async_set_native_value(v) for v in (5.0, 8.0, 11.0))
+        )
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 11.0)
+        assert entity.native_value == 11.0
+        entity.coordinator.async_confirm.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
-# Tests: _handle_coordinator_update
+# Tests: coordinator updates
 # ---------------------------------------------------------------------------
 
 class TestCoordinatorUpdate:
-    def test_update_sets_native_value(self):
+    def test_poll_sets_native_value(self):
         entity = _make_entity(set_charge_power=7.4)
-        entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = 9.0
-        entity._handle_coordinator_update()
-        assert entity._attr_native_value == 9.0
+        entity.coordinator.poll(set_charge_power=9.0)
+        assert entity.native_value == 9.0
 
-    def test_update_ignores_none_charge_power(self):
-        entity = _make_entity(set_charge_power=7.4)
-        entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = None
-        entity._handle_coordinator_update()
-        # Native value must remain unchanged when API returns None
-        assert entity._attr_native_value == 7.4
-
-    def test_update_calls_write_ha_state(self):
-        entity = _make_entity(set_charge_power=7.4)
-        entity._handle_coordinator_update()
-        entity.async_write_ha_state.assert_called()
-
-    def test_update_availability_reflects_charge_mode(self):
+    def test_availability_reflects_charge_mode(self):
         entity = _make_entity(chargeMode=0)
         assert entity.available is True
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-        entity._handle_coordinator_update()
+        entity.coordinator.poll(chargeMode=1)
         assert entity.available is False
 
-    def test_pv_mode_does_not_overwrite_native_value_with_stale_api_value(self):
+    def test_pv_mode_does_not_show_stale_api_value(self):
         """In PV mode the API may return a stale/default set_charge_power.
-        The entity must keep the last user-set value so switching back to Fast
-        restores it correctly."""
-        entity = _make_entity(chargeMode=0, set_charge_power=11.0)
-        # Simulate switch to PV mode: chargeMode changes, API returns old power
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-        entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = 5.6
-        entity._handle_coordinator_update()
-        assert entity._attr_native_value == 11.0
-
-    def test_pv_mode_preserves_value_in_coordinator_data_for_select(self):
-        """In PV mode, the locally-held value must also be written back into
-        coordinator.data so that select.py reads the right power when the user
-        switches back to Fast."""
+        The entity must keep the last Fast value so switching back restores it."""
         entity = _make_entity(chargeMode=0, set_charge_power=11.0)
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-        entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = 5.6
-        entity._handle_coordinator_update()
-        assert entity.coordinator.data[SAMPLE_SN]["set_charge_power"] == 11.0
+        entity.coordinator.poll(chargeMode=1, set_charge_power=5.6)
+        assert entity.native_value == 11.0
@@ -0,0 +1,164 @@
+"""Unit tests for polling.PollingStateMachine."""
+
+from datetime import datetime
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_pkg_name = "sems_wallbox_pkg_polling"
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_const = types.ModuleType(f"{_pkg_name}.const")
+_const.DOMAIN = "sems-wallbox"
+sys.modules[f"{_pkg_name}.const"] = _const
+
+_polling = importlib.import_module(f"{_pkg_name}.polling")
+WallboxSnapshot = sys.modules[f"{_pkg_name}.snapshot"].WallboxSnapshot
+PollState = _polling.PollState
+PollingIntervals = _polling.PollingIntervals
+PollingStateMachine = _polling.PollingStateMachine
+PlugInSchedule = sys.modules[f"{_pkg_name}.schedule"].PlugInSchedule
+
+CHARGING = "EVDetail_Status_Title_Charging"
+WAITING = "EVDetail_Status_Title_Waiting"
+OFFLINE = "EVDetail_Status_Title_Offline"
+UNPLUGGED = "EVDetail_Status_Waiting_Stat00"
+CONNECTED = "EVDetail_Status_Waiting_Stat01"
+FINISHED = "EVDetail_Status_Waiting_Stat02"
+
+
+def _snapshot(status=WAITING, workstate=UNPLUGGED, mode=0, power=0.0):
+    return WallboxSnapshot.from_dict(
+        {"sn": "GWSN001", "status": status, "workstate": workstate,
+         "chargeMode": mode, "power": power}
+    )
+
+
+class TestClassify:
+    @pytest.mark.parametrize(
+        ("snapshot", "state"),
+        [
+            (_snapshot(CHARGING, ""), PollState.CHARGING),
+            (_snapshot(WAITING, CONNECTED, power=1.2), PollState.CHARGING),
+            (_snapshot(OFFLINE, UNPLUGGED), PollState.OFFLINE),
+            (_snapshot(WAITING, UNPLUGGED), PollState.UNPLUGGED),
+            (_snapshot(WAITING, FINISHED), PollState.FINISHED),
+            (_snapshot(WAITING, CONNECTED, mode=0), PollState.STARTING),
+            (_snapshot(WAITING, CONNECTED, mode=1), PollState.WAITING),
+            (_snapshot(WAITING, ""), PollState.STARTING),
+            (_snapshot(WAITING, "Something_New"), PollState.WAITING),
+        ],
+    )
+    def test_states(self, snapshot, state):
+        assert _polling.classify(snapshot) is state
+
+
+class TestStateMachine:
+    def test_cadence_per_state(self):
+        intervals = PollingIntervals(idle=60, charging=30, transition=15, maximum=600)
+        for snapshot, interval in [
+            (_snapshot(CHARGING, ""), 30),
+            (_snapshot(WAITING, CONNECTED, mode=0), 15),
+            (_snapshot(WAITING, CONNECTED, mode=2), 60),
+            (_snapshot(WAITING, FINISHED), 60),
+        ]:
+            assert PollingStateMachine(intervals).update(snapshot) == interval
+
+    def test_unplugged_backs_off_exponentially(self):
+        machine = PollingStateMachine(PollingIntervals(idle=60, maximum=600))
+        intervals = [machine.update(_snapshot(WAITING, UNPLUGGED)) for _ in range(6)]
+        assert intervals == [60, 120, 240, 480, 600, 600]
+
+    def test_offline_backs_off_and_resets_on_change(self):
+        machine = PollingStateMachine(PollingIntervals(idle=60, transition=15, maximum=900))
+        for _ in range(4):
+            machine.update(_snapshot(OFFLINE))
+        assert machine.interval == 480
+        assert machine.update(_snapshot(WAITING, UNPLUGGED)) == 15
+        assert machine.update(_snapshot(WAITING, UNPLUGGED)) == 120
+
+    def test_change_polls_once_at_transition_cadence(self):
+        machine = PollingStateMachine(PollingIntervals(idle=60, charging=30, transition=15))
+        machine.update(_snapshot(WAITING, CONNECTED, mode=1))
+        assert machine.update(_snapshot(CHARGING, "")) == 15
+        assert machine.update(_snapshot(CHARGING, "")) == 30
+        assert machine.transitions == 1
+
+    def test_backoff_never_below_idle(self):
+        machine = PollingStateMachine(PollingIntervals(idle=120, maximum=60))
+        machine.update(_snapshot(OFFLINE))
+        assert machine.update(_snapshot(OFFLINE)) == 120
+
+    def test_set_intervals_applies_at_once(self):
+        machine = PollingStateMachine(PollingIntervals(idle=60, maximum=600))
+        assert machine.set_intervals(PollingIntervals(idle=300)) == 300
+        for _ in range(3):
+            machine.update(_snapshot(OFFLINE))
+        assert machine.interval == 600
+        assert machine.set_intervals(PollingIntervals(idle=300, maximum=3600)) == 1200
+
+    def test_as_dict(self):
+        machine = PollingStateMachine(PollingIntervals())
+        machine.update(_snapshot(OFFLINE))
+        assert machine.as_dict() == {
+            "state": "offline", "interval": 60, "polls_in_state": 0, "transitions": 0,
+            "outlook": "normal", "learned_events": None,
+        }
+
+
+# Monday 2024-01-01; cars usually arrive around 18:00
+MONDAY = datetime(2024, 1, 1)
+
+
+def _learned_schedule():
+    schedule = PlugInSchedule()
+    for week in range(8):
+        schedule.record(MONDAY.replace(day=1 + 7 * (week % 4), hour=18, minute=5))
+    return schedule
+
+
+class TestLearnedSchedule:
+    def test_plug_in_and_charge_start_are_recorded(self):
+        machine = PollingStateMachine(PollingIntervals(), PlugInSchedule())
+        now = MONDAY.replace(hour=18)
+        machine.update(_snapshot(WAITING, UNPLUGGED), now)
+        machine.update(_snapshot(WAITING, CONNECTED, mode=1), now)
+        machine.update(_snapshot(CHARGING, ""), now)
+        machine.update(_snapshot(WAITING, FINISHED), now)
+        assert machine.schedule.events == 2
+
+    def test_no_backoff_while_plug_in_is_expected(self):
+        machine = PollingStateMachine(PollingIntervals(idle=60), _learned_schedule())
+        now = MONDAY.replace(hour=17, minute=30)
+        intervals = [machine.update(_snapshot(WAITING, UNPLUGGED), now) for _ in range(4)]
+        assert intervals == [60, 60, 60, 60]
+        assert machine.outlook == "expected"
+
+    def test_idle_states_back_off_in_quiet_period(self):
+        machine = PollingStateMachine(
+            PollingIntervals(idle=60, maximum=900), _learned_schedule()
+        )
+        now = MONDAY.replace(hour=3)
+        intervals = [machine.update(_snapshot(WAITING, FINISHED), now) for _ in range(5)]
+        assert intervals == [60, 120, 240, 480, 900]
+
+    def test_change_still_polls_at_transition_cadence(self):
+        machine = PollingStateMachine(
+            PollingIntervals(idle=60, transition=15), _learned_schedule()
+        )
+        now = MONDAY.replace(hour=3)
+        for _ in range(4):
+            machine.update(_snapshot(WAITING, UNPLUGGED), now)
+        assert machine.update(_snapshot(WAITING, CONNECTED, mode=1), now) == 15
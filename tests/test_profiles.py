@@ -0,0 +1,145 @@
+"""Unit tests for profiles.PollingProfile and ProfileSelector."""
+
+from datetime import datetime, time
+import importlib
+import os
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_pkg_name = "sems_wallbox_pkg_profiles"
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_const = types.ModuleType(f"{_pkg_name}.const")
+_const.DOMAIN = "sems-wallbox"
+_const.CONF_PROFILES = "profiles"
+sys.modules[f"{_pkg_name}.const"] = _const
+
+_profiles = importlib.import_module(f"{_pkg_name}.profiles")
+PollingProfile = _profiles.PollingProfile
+ProfileSelector = _profiles.ProfileSelector
+PollingIntervals = sys.modules[f"{_pkg_name}.polling"].PollingIntervals
+_event = sys.modules["homeassistant.helpers.event"]
+
+NIGHT = {"name": "Night tariff", "idle": 300, "charging": 60, "offline": 1800,
+         "start": "22:00:00", "end": "06:00:00"}
+AWAY = {"name": "Away", "idle": 900, "charging": 120, "offline": 3600,
+        "entity_id": "input_select.house_mode"}
+SOLAR = {"name": "Solar hours", "idle": 30, "charging": 15, "offline": 600,
+         "start": "10:00", "end": "16:00", "entity_id": "schedule.solar"}
+
+
+def _hass(states):
+    hass = MagicMock()
+    hass.states.get = lambda entity_id: (
+        types.SimpleNamespace(state=states[entity_id]) if entity_id in states else None
+    )
+    return hass
+
+
+def _at(hour, minute=0):
+    return patch.object(
+        _profiles.dt_util, "now", lambda: datetime(2026, 10, 5, hour, minute)
+    )
+
+
+class TestPollingProfile:
+    def test_from_dict(self):
+        profile = PollingProfile.from_dict(NIGHT)
+        assert profile.start == time(22) and profile.end == time(6)
+        assert profile.entity_id is None
+
+    def test_intervals_keep_transition(self):
+        intervals = PollingProfile.from_dict(NIGHT).intervals(
+            PollingIntervals(idle=60, charging=30, transition=10, maximum=600)
+        )
+        assert intervals == PollingIntervals(
+            idle=300, charging=60, transition=10, maximum=1800
+        )
+
+    @pytest.mark.parametrize(
+        ("now", "active"),
+        [(time(23), True), (time(2), True), (time(6), False), (time(12), False)],
+    )
+    def test_window_across_midnight(self, now, active):
+        assert PollingProfile.from_dict(NIGHT).matches(now, None) is active
+
+    def test_input_select_matches_profile_name(self):
+        profile = PollingProfile.from_dict(AWAY)
+        assert profile.matches(time(12), "away")
+        assert not profile.matches(time(12), "Home")
+        assert not profile.matches(time(12), None)
+
+    def test_schedule_and_window_must_both_match(self):
+        profile = PollingProfile.from_dict(SOLAR)
+        assert profile.matches(time(12), "on")
+        assert not profile.matches(time(12), "off")
+        assert not profile.matches(time(17), "on")
+
+    def test_invalid_profiles_are_skipped(self):
+        profiles = _profiles.profiles_from_options(
+            {"profiles": [NIGHT, {"name": "Broken", "idle": "x"}]}
+        )
+        assert [profile.name for profile in profiles] == ["Night tariff"]
+
+
+class TestProfileSelector:
+    def _selector(self, states, *profiles):
+        changes = []
+        selector = ProfileSelector(
+            _hass(states),
+            [PollingProfile.from_dict(profile) for profile in profiles],
+            changes.append,
+        )
+        return selector, changes
+
+    def test_start_applies_active_profile(self):
+        selector, changes = self._selector({}, NIGHT)
+        with _at(23):
+            selector.async_start()
+        assert [profile.name for profile in changes] == ["Night tariff"]
+        selector.async_stop()
+
+    def test_first_matching_profile_wins(self):
+        states = {"input_select.house_mode": "Away"}
+        selector, changes = self._selector(states, AWAY, NIGHT)
+        with _at(23):
+            selector.async_start()
+        assert selector.active.name == "Away"
+        selector.async_stop()
+
+    def test_entity_change_switches_profile(self):
+        states = {"input_select.house_mode": "Home"}
+        selector, changes = self._selector(states, AWAY)
+        with _at(12):
+            selector.async_start()
+            assert changes == []
+            states["input_select.house_mode"] = "Away"
+            for entity_ids, action in list(_event.state_listeners):
+                if "input_select.house_mode" in entity_ids:
+                    action(None)
+            # Same state again: no new change reported
+            selector._async_evaluate()
+        assert [profile and profile.name for profile in changes] == ["Away"]
+        selector.async_stop()
+        assert _event.state_listeners == []
+
+    def test_leaving_window_reports_none(self):
+        selector, changes = self._selector({}, NIGHT)
+        with _at(5, 59):
+            selector.async_start()
+        with _at(6):
+            selector._async_evaluate()
+        assert changes[-1] is None
+        selector.async_stop()
@@ -0,0 +1,102 @@
+"""Unit tests for rate_limiter.RateLimiter."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# All HA stubs are set up by conftest.py before this file is collected.
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "sems_wallbox_rate_limiter", os.path.join(_HERE, "rate_limiter.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["sems_wallbox_rate_limiter"] = _mod
+_spec.loader.exec_module(_mod)
+
+RateLimiter = _mod.RateLimiter
+RateLimited = _mod.RateLimited
+RequestPriority = _mod.RequestPriority
+parse_retry_after = _mod.parse_retry_after
+
+
+def _limiter(clock, **kwargs):
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestBudgets:
+    async def test_burst_within_capacity_is_not_delayed(self, clock):
+        limiter = _limiter(clock, read_capacity=3)
+        for _ in range(3):
+            await limiter.async_acquire(RequestPriority.READ)
+        assert clock.slept == []
+
+    async def test_read_waits_for_refill(self, clock):
+        limiter = _limiter(clock, read_rate=0.5, read_capacity=1)
+        await limiter.async_acquire(RequestPriority.READ)
+        await limiter.async_acquire(RequestPriority.READ)
+        assert clock.slept == [pytest.approx(2.0)]
+        assert limiter.delayed == 1
+
+    async def test_refresh_is_dropped_not_queued(self, clock):
+        limiter = _limiter(clock, read_capacity=1)
+        await limiter.async_acquire(RequestPriority.REFRESH)
+        with pytest.raises(RateLimited):
+            await limiter.async_acquire(RequestPriority.REFRESH)
+        assert clock.slept == []
+        assert limiter.dropped == 1
+
+    async def test_reads_do_not_consume_command_budget(self, clock):
+        limiter = _limiter(clock, read_capacity=1, command_capacity=1)
+        await limiter.async_acquire(RequestPriority.READ)
+        await limiter.async_acquire(RequestPriority.COMMAND)
+        assert clock.slept == []
+
+    async def test_wait_beyond_max_raises(self, clock):
+        limiter = _limiter(clock, command_rate=0.01, command_capacity=1, max_wait=10)
+        await limiter.async_acquire(RequestPriority.COMMAND)
+        with pytest.raises(RateLimited):
+            await limiter.async_acquire(RequestPriority.COMMAND)
+
+    async def test_refresh_dropped_while_read_queued(self):
+        limiter = RateLimiter(read_capacity=1, read_rate=100)
+        await limiter.async_acquire(RequestPriority.READ)
+        waiting = asyncio.ensure_future(limiter.async_acquire(RequestPriority.READ))
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimited):
+            await limiter.async_acquire(RequestPriority.REFRESH)
+        await waiting
+
+
+class TestRetryAfter:
+    async def test_retry_after_pauses_all_priorities(self, clock):
+        limiter = _limiter(clock)
+        limiter.note_retry_after(5)
+        with pytest.raises(RateLimited):
+            await limiter.async_acquire(RequestPriority.REFRESH)
+        await limiter.async_acquire(RequestPriority.COMMAND)
+        assert clock.slept == [pytest.approx(5.0)]
+        assert limiter.throttled == 1
+
+    async def test_missing_header_uses_default_pause(self, clock):
+        limiter = _limiter(clock)
+        limiter.note_retry_after(None)
+        assert limiter.blocked_for == _mod.DEFAULT_RETRY_AFTER
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("120", 120.0), (" 7 ", 7.0), (None, None), ("soon", None),
+         ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)],
+    )
+    def test_parse_retry_after(self, value, expected):
+        assert parse_retry_after(value) == expected
@@ -0,0 +1,276 @@
+"""Unit tests for reconciler.py — desired-state reconciler per wallbox."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# All HA stubs are set up by conftest.py before this file is collected.
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_pkg_name = "sems_wallbox_pkg_reconciler"
+
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_spec = importlib.util.spec_from_file_location(
+    f"{_pkg_name}.reconciler", os.path.join(_HERE, "reconciler.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+_mod.__package__ = _pkg_name
+sys.modules[f"{_pkg_name}.reconciler"] = _mod
+_spec.loader.exec_module(_mod)
+
+WallboxReconciler = _mod.WallboxReconciler
+_dispatcher_mod = sys.modules[f"{_pkg_name}.dispatcher"]
+CommandOutcome = _dispatcher_mod.CommandOutcome
+WallboxSnapshot = sys.modules[f"{_pkg_name}.snapshot"].WallboxSnapshot
+
+SN = "GWSN001"
+
+# Command results as returned by SemsApi (ok, state echoed in the response)
+ACCEPTED = types.SimpleNamespace(ok=True, state={})
+REJECTED = types.SimpleNamespace(ok=False, state={})
+
+IDLE_FAST = {
+    "sn": SN,
+    "chargeMode": 0,
+    "set_charge_power": 7.4,
+    "min_charge_power": 4.2,
+    "max_charge_power": 11.0,
+    "status": "EVDetail_Status_Title_Waiting",
+    "power": 0.0,
+}
+
+
+def _snapshot(**changes):
+    return WallboxSnapshot.from_dict({**IDLE_FAST, **changes})
+
+
+class _FakeCoordinator:
+    def __init__(self, data):
+        self.data = {SN: WallboxSnapshot.from_dict(data)}
+        self.hass = MagicMock()
+        self.async_notify_serial = MagicMock()
+        self.async_confirm = MagicMock()
+        self.async_apply_command_state = MagicMock()
+
+    def poll(self, **changes):
+        self.data = {SN: self.data[SN].merge(changes)}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _reconciler(window=0, **data):
+    coordinator = _FakeCoordinator({**IDLE_FAST, **data})
+    api = MagicMock()
+    api.async_set_charge_mode = AsyncMock(return_value=ACCEPTED)
+    api.async_change_status = AsyncMock(return_value=ACCEPTED)
+    clock = _Clock()
+    reconciler = WallboxReconciler(
+        coordinator, api, SN, _dispatcher_mod.CommandDispatcher(window=window), clock
+    )
+    return reconciler, coordinator, api, clock
+
+
+# ===========================================================================
+# Minimal calls
+# ===========================================================================
+
+class TestMinimalCalls:
+    async def test_mode_change_sends_one_call(self):
+        reconciler, coordinator, api, _ = _reconciler()
+        assert await reconciler.async_set_charge_mode(1) is CommandOutcome.SUCCESS
+        api.async_set_charge_mode.assert_awaited_once_with(SN, 1, None)
+        coordinator.async_confirm.assert_called_once()
+
+    async def test_fast_mode_carries_remembered_power(self):
+        reconciler, _, api, _ = _reconciler(chargeMode=1, set_charge_power=6.0)
+        await reconciler.async_set_charge_mode(0)
+        api.async_set_charge_mode.assert_awaited_once_with(SN, 0, 6.0)
+
+    async def test_fast_mode_clamps_invalid_power_to_min(self):
+        reconciler, _, api, _ = _reconciler(chargeMode=1, set_charge_power=1.0)
+        await reconciler.async_set_charge_mode(0)
+        api.async_set_charge_mode.assert_awaited_once_with(SN, 0, 4.2)
+
+    async def test_already_converged_sends_nothing(self):
+        reconciler, coordinator, api, _ = _reconciler()
+        assert await reconciler.async_set_charge_power(7.4) is CommandOutcome.SUCCESS
+        assert await reconciler.async_set_charging(False) is CommandOutcome.SUCCESS
+        api.async_set_charge_mode.assert_not_awaited()
+        api.async_change_status.assert_not_awaited()
+        coordinator.async_confirm.assert_not_called()
+
+    async def test_slider_during_mode_switch_is_merged_into_next_call(self):
+        """A power change while Fast is being applied goes out as one
+        (mode, power) call instead of a mode call plus a power re-send."""
+        reconciler, _, api, _ = _reconciler(window=0.01, chargeMode=1, set_charge_power=6.0)
+        await asyncio.gather(
+            reconciler.async_set_charge_power(9.0),
+            reconciler.async_set_charge_power(11.0),
+        )
+        await reconciler.async_set_charge_mode(0)
+        assert [c.args for c in api.async_set_charge_mode.await_args_list] == [
+            (SN, 0, 11.0)
+        ]
+
+    async def test_pending_slider_write_superseded_by_pv_mode(self):
+        reconciler, _, api, _ = _reconciler(window=0.05)
+        slider = asyncio.ensure_future(reconciler.async_set_charge_power(11.0))
+        await asyncio.sleep(0)
+        assert await reconciler.async_set_charge_mode(1) is CommandOutcome.SUCCESS
+        assert await slider is CommandOutcome.SUPERSEDED
+        api.async_set_charge_mode.assert_awaited_once_with(SN, 1, None)
+        # The slider value is remembered for the next switch back to Fast
+        assert reconciler.charge_power == 11.0
+
+    async def test_confirmation_checks_mode_and_power(self):
+        reconciler, coordinator, _, _ = _reconciler(chargeMode=1, set_charge_power=6.0)
+        await reconciler.async_set_charge_mode(0)
+        sn, kind, check = coordinator.async_confirm.call_args.args
+        assert (sn, kind) == (SN, "set_charge_mode")
+        assert not check(_snapshot(chargeMode=1))
+        assert not check(_snapshot(set_charge_power=7.4))
+        assert check(_snapshot(set_charge_power=6.0))
+
+    async def test_response_state_is_applied_before_confirmation(self):
+        reconciler, coordinator, api, _ = _reconciler()
+        api.async_set_charge_mode.return_value = types.SimpleNamespace(
+            ok=True, state={"chargeMode": 1}
+        )
+        await reconciler.async_set_charge_mode(1)
+        coordinator.async_apply_command_state.assert_called_once_with(
+            SN, {"chargeMode": 1}
+        )
+        coordinator.async_confirm.assert_called_once()
+
+    async def test_confirmation_checks_charging(self):
+        reconciler, coordinator, _, _ = _reconciler()
+        await reconciler.async_set_charging(True)
+        _, kind, check = coordinator.async_confirm.call_args.args
+        assert kind == "change_status"
+        assert not check(_snapshot())
+        assert check(_snapshot(status="EVDetail_Status_Title_Charging"))
+
+    async def test_start_charging(self):
+        reconciler, _, api, _ = _reconciler()
+        await reconciler.async_set_charging(True)
+        api.async_change_status.assert_awaited_once_with(SN, 1)
+
+    async def test_stop_charging(self):
+        reconciler, _, api, _ = _reconciler(status="EVDetail_Status_Title_Charging", power=7.4)
+        await reconciler.async_set_charging(False)
+        api.async_change_status.assert_awaited_once_with(SN, 2)
+
+
+# ===========================================================================
+# Effective state
+# ===========================================================================
+
+class TestEffectiveState:
+    async def test_desired_mode_shown_until_poll_confirms(self):
+        reconciler, coordinator, _, _ = _reconciler()
+        await reconciler.async_set_charge_mode(1)
+        coordinator.poll(chargeMode=0)  # SEMS has not applied it yet
+        assert reconciler.charge_mode == 1
+        coordinator.poll(chargeMode=1)
+        assert reconciler.charge_mode == 1
+        assert reconciler.as_dict() == {}
+
+    async def test_unconfirmed_mode_expires(self):
+        reconciler, _, _, clock = _reconciler()
+        await reconciler.async_set_charge_mode(1)
+        clock.now += _mod.CONFIRM_DEADLINE + 1
+        assert reconciler.charge_mode == 0
+
+    async def test_charging_held_until_confirmed_or_expired(self):
+        reconciler, coordinator, _, clock = _reconciler()
+        await reconciler.async_set_charging(True)
+        assert reconciler.charging is True
+        clock.now += _mod.CONFIRM_DEADLINE - 1
+        assert reconciler.charging is True
+        clock.now += 2
+        assert reconciler.charging is False
+
+    async def test_expired_target_is_written_back(self, monkeypatch):
+        timers = []
+        monkeypatch.setattr(
+            _mod, "async_call_later",
+            lambda hass, delay, action: timers.append((delay, action)) or (lambda: None),
+        )
+        reconciler, coordinator, _, clock = _reconciler()
+        await reconciler.async_set_charging(True)
+        assert reconciler.charging is True
+        # The wallbox never starts and its data never changes: only the
+        # deadline timer can tell the entities to show the polled state
+        coordinator.async_notify_serial.reset_mock()
+        (delay, expire), = timers
+        assert delay == _mod.CONFIRM_DEADLINE
+        clock.now += delay
+        expire(None)
+        coordinator.async_notify_serial.assert_called_once_with(SN)
+        assert reconciler.charging is False
+        assert reconciler.as_dict() == {}
+
+    async def test_expiry_of_replaced_target_is_ignored(self, monkeypatch):
+        timers = []
+        monkeypatch.setattr(
+            _mod, "async_call_later",
+            lambda hass, delay, action: timers.append(action) or (lambda: None),
+        )
+        reconciler, coordinator, _, _ = _reconciler()
+        await reconciler.async_set_charge_mode(1)
+        await reconciler.async_set_charge_mode(2)
+        coordinator.async_notify_serial.reset_mock()
+        timers[0](None)
+        assert reconciler.charge_mode == 2
+        coordinator.async_notify_serial.assert_not_called()
+
+    async def test_change_notifies_listeners(self):
+        reconciler, coordinator, _, _ = _reconciler()
+        await reconciler.async_set_charge_mode(2)
+        coordinator.async_notify_serial.assert_called_with(SN)
+
+    def test_pv_mode_keeps_last_fast_power(self):
+        reconciler, coordinator, _, _ = _reconciler(set_charge_power=11.0)
+        assert reconciler.charge_power == 11.0
+        coordinator.poll(chargeMode=1, set_charge_power=5.6)
+        assert reconciler.charge_power == 11.0
+
+    async def test_failure_falls_back_to_polled_state(self):
+        reconciler, coordinator, api, _ = _reconciler()
+        api.async_set_charge_mode.return_value = REJECTED
+        assert await reconciler.async_set_charge_power(9.0) is CommandOutcome.FAILED
+        assert reconciler.charge_power == 7.4
+        coordinator.async_confirm.assert_not_called()
+
+    async def test_failure_does_not_drop_newer_target(self):
+        reconciler, _, api, _ = _reconciler()
+
+        async def slow_fail(sn, mode, power):
+            reconciler._targets[_mod.POWER] = _mod._Target(10.0, 100.0)
+            return REJECTED
+
+        api.async_set_charge_mode.side_effect = slow_fail
+        await reconciler.async_set_charge_power(9.0)
+        assert reconciler.charge_power == 10.0
@@ -0,0 +1,97 @@
+"""Unit tests for schedule.PlugInSchedule."""
+
+from datetime import datetime, timedelta
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_pkg_name = "sems_wallbox_pkg_schedule"
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_const = types.ModuleType(f"{_pkg_name}.const")
+_const.DOMAIN = "sems-wallbox"
+sys.modules[f"{_pkg_name}.const"] = _const
+
+_schedule = importlib.import_module(f"{_pkg_name}.schedule")
+PlugInSchedule = _schedule.PlugInSchedule
+Outlook = _schedule.Outlook
+Store = sys.modules["homeassistant.helpers.storage"].Store
+
+# Monday 2024-01-01 00:00
+MONDAY = datetime(2024, 1, 1)
+
+
+def _weekday_evenings(schedule, weeks=2):
+    for day in range(7 * weeks):
+        if day % 7 < 5:
+            schedule.record(MONDAY + timedelta(days=day, hours=18, minutes=10))
+
+
+class TestHistogram:
+    def test_hour_of_week(self):
+        assert _schedule.hour_of_week(MONDAY) == 0
+        assert _schedule.hour_of_week(MONDAY + timedelta(days=6, hours=23)) == 167
+
+    def test_no_opinion_without_enough_events(self):
+        schedule = PlugInSchedule()
+        schedule.record(MONDAY.replace(hour=18))
+        assert schedule.outlook(MONDAY.replace(hour=18)) is Outlook.NORMAL
+
+    @pytest.mark.parametrize(
+        ("when", "outlook"),
+        [
+            (MONDAY.replace(hour=17, minute=45), Outlook.EXPECTED),
+            (MONDAY.replace(hour=18, minute=30), Outlook.EXPECTED),
+            (MONDAY.replace(hour=3), Outlook.QUIET),
+            (MONDAY + timedelta(days=5, hours=18), Outlook.QUIET),
+            (MONDAY.replace(hour=21), Outlook.NORMAL),
+        ],
+    )
+    def test_outlook(self, when, outlook):
+        schedule = PlugInSchedule()
+        _weekday_evenings(schedule)
+        assert schedule.outlook(when) is outlook
+
+    def test_old_events_decay(self):
+        schedule = PlugInSchedule()
+        schedule.record(MONDAY.replace(hour=8))
+        schedule.record(MONDAY.replace(hour=18))
+        assert schedule.bins[8] < schedule.bins[18] == 1.0
+
+
+class TestStorage:
+    async def test_record_is_saved(self):
+        store = Store(None, 1, "sems-wallbox.schedule.GWSN001")
+        schedule = PlugInSchedule(store)
+        schedule.record(MONDAY.replace(hour=18))
+        assert store.data["events"] == 1
+        assert store.data["bins"][18] == 1.0
+
+    async def test_load_restores_saved_schedule(self):
+        original = PlugInSchedule()
+        _weekday_evenings(original)
+        restored = PlugInSchedule(None, original.as_dict())
+        assert restored.events == original.events
+        assert restored.outlook(MONDAY.replace(hour=18)) is Outlook.EXPECTED
+
+    async def test_async_load_without_data_is_empty(self):
+        schedule = await PlugInSchedule.async_load(None, "GWSN001")
+        assert schedule.events == 0
+        assert sum(schedule.bins) == 0
+
+    def test_invalid_data_is_ignored(self):
+        schedule = PlugInSchedule(None, {"bins": [1.0, 2.0], "events": 3})
+        assert len(schedule.bins) == _schedule.HOURS_PER_WEEK
+        assert schedule.events == 0
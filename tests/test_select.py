@@ -50,17 +50,28 @@ _coord_stub = types.ModuleType(f"{_pkg_name}.coordinator")
 class _FakeCoordinator:
     def __init__(self, data):
         self.data = data
+        self.hass = MagicMock()
+        self.devices = {sn: _device(snapshot) for sn, snapshot in data.items()}
         self.last_update_success = True
+        self.stale_serials = set()
         self._set_updated_data_calls = []
+        self.async_confirm = MagicMock()
+        self.async_apply_command_state = MagicMock()
+
+    def serial_available(self, sn):
+        return self.last_update_success and sn not in self.stale_serials
 
     def async_set_updated_data(self, new_data):
         self.data = new_data
         self._set_updated_data_calls.append(new_data)
 
-    def async_request_refresh(self):
+    def async_notify_serial(self, sn):
         pass
 
-    def schedule_delayed_refresh(self, delay=5):
+    def poll(self, **changes):
+        self.data = {SAMPLE_SN: self.data[SAMPLE_SN].merge(changes)}
+
+    def async_request_refresh(self):
         pass
 
 
@@ -77,6 +88,18 @@ sys.modules[f"{_pkg_name}.select"] = _select_mod
 _spec.loader.exec_module(_select_mod)
 
 InverterOperationModeEntity = _select_mod.InverterOperationModeEntity
+_dispatcher_mod = sys.modules[f"{_pkg_name}.dispatcher"]
+_reconciler_mod = sys.modules[f"{_pkg_name}.reconciler"]
+WallboxSnapshot = sys.modules[f"{_pkg_name}.snapshot"].WallboxSnapshot
+WallboxDevice = importlib.import_module(f"{_pkg_name}.device").WallboxDevice
+
+
+def _device(snapshot):
+    """Return the shared device info object of a polled wallbox."""
+    device = WallboxDevice(snapshot.sn)
+    device.update(snapshot)
+    return device
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -84,6 +107,10 @@ InverterOperationModeEntity = _select_mod.InverterOperationModeEntity
 
 SAMPLE_SN = "GWSN001"
 
+# Command results as returned by SemsApi (ok, state echoed in the response)
+ACCEPTED = types.SimpleNamespace(ok=True, state={})
+REJECTED = types.SimpleNamespace(ok=False, state={})
+
 SAMPLE_DATA = {
     "sn": SAMPLE_SN,
     "chargeMode": 0,
@@ -102,26 +129,24 @@ def _make_entity(chargeMode=0, set_charge_power=7.4, min_charge_power=4.2, max_c
         "min_charge_power": min_charge_power,
         "max_charge_power": max_charge_power,
     }
-    coordinator = _FakeCoordinator({SAMPLE_SN: data})
+    coordinator = _FakeCoordinator({SAMPLE_SN: WallboxSnapshot.from_dict(data)})
     api = MagicMock()
-    api.set_charge_mode = MagicMock()
+    api.async_set_charge_mode = AsyncMock(return_value=ACCEPTED)
 
+    reconciler = _reconciler_mod.WallboxReconciler(
+        coordinator, api, SAMPLE_SN, _dispatcher_mod.CommandDispatcher(window=0)
+    )
     entity = InverterOperationModeEntity(
         coordinator,
-        api,
         SAMPLE_SN,
         _select_mod.OPERATION_MODE,
         list(_select_mod._MODE_TO_OPTION.values()),
-        _select_mod._MODE_TO_OPTION.get(chargeMode),
+        reconciler,
     )
+    entity.api = api  # handle for assertions
     # Minimal hass mock
     hass = MagicMock()
     hass.async_create_task = MagicMock()
-
-    async def fake_executor(func, *args):
-        return func(*args)
-
-    hass.async_add_executor_job = fake_executor
     entity.hass = hass
     entity.async_write_ha_state = MagicMock()
     return entity
@@ -156,198 +181,91 @@ class TestSelectOption:
         """Switching TO fast (mode 0) must include set_charge_power in the API call."""
         entity = _make_entity(chargeMode=1, set_charge_power=6.0)
         await entity.async_select_option("fast")
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 6.0)
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 6.0)
 
     @pytest.mark.asyncio
     async def test_switch_to_fast_falls_back_to_min_when_power_none(self):
         """When set_charge_power is None, fall back to min_charge_power."""
         entity = _make_entity(chargeMode=1, set_charge_power=None, min_charge_power=4.2)
         await entity.async_select_option("fast")
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 4.2)
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 4.2)
 
     @pytest.mark.asyncio
     async def test_switch_to_fast_clamps_out_of_range_power_to_min(self):
         """When set_charge_power is out of range, clamp it to min."""
         entity = _make_entity(chargeMode=1, set_charge_power=1.0, min_charge_power=4.2, max_charge_power=11.0)
         await entity.async_select_option("fast")
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 4.2)
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 4.2)
 
     @pytest.mark.asyncio
     async def test_switch_to_pv_priority_no_charge_power(self):
         """Switching to pv_priority must NOT include charge_power."""
         entity = _make_entity(chargeMode=0, set_charge_power=7.4)
         await entity.async_select_option("pv_priority")
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 1, None)
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 1, None)
 
     @pytest.mark.asyncio
     async def test_switch_to_pv_and_battery_no_charge_power(self):
         """Switching to pv_and_battery must NOT include charge_power."""
         entity = _make_entity(chargeMode=0, set_charge_power=7.4)
         await entity.async_select_option("pv_and_battery")
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 2, None)
+        entity.api.async_set_charge_mode.assert_called_once_with(SAMPLE_SN, 2, None)
 
     @pytest.mark.asyncio
     async def test_optimistic_update_on_select(self):
-        """Current option is set optimistically before API call."""
+        """The chosen option is shown while the API call is in flight."""
         entity = _make_entity(chargeMode=1)
+        seen = []
+
+        def capture(sn, mode, power):
+            seen.append(entity.current_option)
+            return ACCEPTED
+
+        entity.api.async_set_charge_mode = AsyncMock(side_effect=capture)
         await entity.async_select_option("fast")
-        assert entity._attr_current_option == "fast"
-        entity.async_write_ha_state.assert_called()
+        assert seen == ["fast"]
+        assert entity.current_option == "fast"
 
     @pytest.mark.asyncio
-    async def test_coordinator_data_updated_immediately_on_to_fast(self):
-        """chargeMode in coordinator.data must be updated immediately when switching to Fast,
-        so dependent entities (number slider) become available without waiting for a poll."""
+    async def test_polled_data_is_not_rewritten(self):
+        """The pending mode lives in the reconciler; coordinator.data keeps the
+        polled values."""
         entity = _make_entity(chargeMode=1)
         await entity.async_select_option("fast")
-        assert entity.coordinator.data[SAMPLE_SN]["chargeMode"] == 0
-        assert len(entity.coordinator._set_updated_data_calls) == 1
-
-    @pytest.mark.asyncio
-    async def test_coordinator_data_updated_immediately_on_to_pv(self):
-        """chargeMode in coordinator.data must be updated immediately when switching to PV,
-        so the number slider becomes unavailable right away."""
-        entity = _make_entity(chargeMode=0)
-        await entity.async_select_option("pv_priority")
-        assert entity.coordinator.data[SAMPLE_SN]["chargeMode"] == 1
-        assert len(entity.coordinator._set_updated_data_calls) == 1
+        assert entity.coordinator.data[SAMPLE_SN].charge_mode == 1
+        assert entity.coordinator._set_updated_data_calls == []
 
     @pytest.mark.asyncio
     async def test_unknown_option_is_ignored(self):
         """An unknown option string must not call the API."""
         entity = _make_entity(chargeMode=0)
         await entity.async_select_option("invalid_option")
-        entity.api.set_charge_mode.assert_not_called()
+        entity.api.async_set_charge_mode.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_switch_to_fast_writes_charge_power_into_coordinator_data(self):
-        """When switching to Fast, the (possibly clamped) charge_power must be
-        written into coordinator.data immediately alongside chargeMode=0, so that
-        a later write by number.py can be unambiguously detected as a slider move."""
-        entity = _make_entity(chargeMode=1, set_charge_power=6.0)
-        await entity.async_select_option("fast")
-        assert entity.coordinator.data[SAMPLE_SN]["set_charge_power"] == 6.0
-
-    @pytest.mark.asyncio
-    async def test_switch_to_fast_resends_if_power_changed_during_api_call(self):
-        """If number.py updates set_charge_power in coordinator.data while the
-        mode-switch API call is in flight (slider moved by user), select must
-        re-fire set_charge_mode with the new power so the last write wins."""
-        entity = _make_entity(chargeMode=1, set_charge_power=6.0)
-
-        calls = []
-
-        def side_effect(sn, mode, power):
-            calls.append((sn, mode, power))
-            # Simulate number.py's optimistic write during the first API call
-            if len(calls) == 1:
-                entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = 11.0
-            return True
-
-        entity.api.set_charge_mode = side_effect
-
-        await entity.async_select_option("fast")
-
-        assert len(calls) == 2
-        assert calls[0] == (SAMPLE_SN, 0, 6.0)
-        assert calls[1] == (SAMPLE_SN, 0, 11.0)
-
-    @pytest.mark.asyncio
-    async def test_switch_to_fast_no_resend_if_power_unchanged_during_api_call(self):
-        """If set_charge_power did not change during the API call, no re-fire."""
-        entity = _make_entity(chargeMode=1, set_charge_power=6.0)
-        await entity.async_select_option("fast")
-        entity.api.set_charge_mode.assert_called_once_with(SAMPLE_SN, 0, 6.0)
-
-    @pytest.mark.asyncio
-    async def test_superseded_fast_call_does_not_refires_when_pv_pending(self):
-        """If the user switches Fast then immediately PV, the Fast call's result
-        must be discarded (no re-fire, no refresh) because _pending_mode is now 1."""
-        entity = _make_entity(chargeMode=1, set_charge_power=6.0)
-
-        calls = []
-
-        def side_effect(sn, mode, power):
-            calls.append((sn, mode, power))
-            # Simulate: slider moved to 11 AND user then clicked PV
-            # while this Fast API call was in flight.
-            if len(calls) == 1:
-                entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = 11.0
-                # Newer PV dispatch overwrites _pending_mode
-                entity._pending_mode = 1
-            return True
-
-        entity.api.set_charge_mode = side_effect
-
-        await entity.async_select_option("fast")
-
-        # Only the original Fast call — no re-fire because _pending_mode=1 != mode=0
-        assert len(calls) == 1
-        assert calls[0] == (SAMPLE_SN, 0, 6.0)
-        # No refresh scheduled either
-        entity.hass.async_create_task.assert_not_called()
+    async def test_selecting_current_mode_sends_nothing(self):
+        entity = _make_entity(chargeMode=1)
+        await entity.async_select_option("pv_priority")
+        entity.api.async_set_charge_mode.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_superseded_fast_call_discarded_when_pv_already_confirmed_by_poll(self):
-        """The superseded guard must also fire when _pending_mode was already
-        cleared by a poll confirming PV *before* a timed-out Fast call returned.
-
-        Real-world scenario (from log):
-          14:55:33 Fast call starts (30 s timeout)
-          14:55:49 PV call starts, _pending_mode=1
-          14:56:00 Poll confirms PV → _pending_mode cleared to None
-          14:56:03 Fast call FINALLY returns after timeout
-                   _pending_mode is None → old guard didn't fire
-                   coordinator.data["chargeMode"] = 1 → new guard fires ✓
-        """
-        entity = _make_entity(chargeMode=1, set_charge_power=6.0)
-
-        calls = []
-
-        def side_effect(sn, mode, power):
-            calls.append((sn, mode, power))
-            if len(calls) == 1:
-                # Simulate: PV dispatch ran AND poll confirmed it while we waited.
-                # _pending_mode is now None (poll cleared it), but chargeMode=1.
-                entity._pending_mode = None
-                entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-                entity.coordinator.data[SAMPLE_SN]["set_charge_power"] = 11.0
-            return True
-
-        entity.api.set_charge_mode = side_effect
-
+    async def test_success_starts_one_confirmation(self):
+        entity = _make_entity(chargeMode=1)
         await entity.async_select_option("fast")
-
-        # Only the original Fast call — no re-fire because chargeMode is now 1
-        assert len(calls) == 1
+        entity.coordinator.async_confirm.assert_called_once()
         entity.hass.async_create_task.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_mode_switch_reverts_on_api_failure(self):
-        """If set_charge_mode returns False the select entity must revert
-        _attr_current_option to whatever coordinator.data currently holds,
-        clear _pending_mode, and schedule a coordinator refresh.
-        HomeAssistantError is raised so HA shows a toast notification."""
+        """If set_charge_mode returns False the select falls back to the polled
+        mode, schedules a refresh and raises HomeAssistantError."""
         entity = _make_entity(chargeMode=0, set_charge_power=6.0)  # currently Fast
-        entity.api.set_charge_mode = MagicMock(return_value=False)
-        with pytest.raises(Exception):  # HomeAssistantError
-            await entity.async_select_option("pv_priority")
-        # _attr_current_option must be reverted to "fast" (chargeMode=0 in coordinator)
-        assert entity._attr_current_option == "fast"
-        # _pending_mode must be cleared so poll-based guard works correctly
-        assert entity._pending_mode is None
-        # A refresh must be scheduled so the UI catches up with the real device
-        entity.hass.async_create_task.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_mode_switch_revert_calls_write_ha_state_on_failure(self):
-        """async_write_ha_state must be called after reverting so the UI
-        reflects the correct option without waiting for the next poll."""
-        entity = _make_entity(chargeMode=0, set_charge_power=6.0)
-        entity.api.set_charge_mode = MagicMock(return_value=False)
+        entity.api.async_set_charge_mode = AsyncMock(return_value=REJECTED)
         with pytest.raises(Exception):  # HomeAssistantError
             await entity.async_select_option("pv_priority")
+        assert entity.current_option == "fast"
         entity.async_write_ha_state.assert_called()
+        entity.hass.async_create_task.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -355,103 +273,48 @@ class TestSelectOption:
 # ---------------------------------------------------------------------------
 
 class TestCoordinatorUpdate:
-    def test_update_sets_fast(self):
-        entity = _make_entity(chargeMode=0)
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 0
-        entity._handle_coordinator_update()
-        assert entity._attr_current_option == "fast"
-
-    def test_update_sets_pv_priority(self):
+    @pytest.mark.parametrize(
+        ("mode", "option"), [(0, "fast"), (1, "pv_priority"), (2, "pv_and_battery")]
+    )
+    def test_poll_sets_option(self, mode, option):
         entity = _make_entity(chargeMode=0)
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-        entity._handle_coordinator_update()
-        assert entity._attr_current_option == "pv_priority"
+        entity.coordinator.poll(chargeMode=mode)
+        assert entity.current_option == option
 
-    def test_update_sets_pv_and_battery(self):
+    def test_unknown_mode_has_no_option(self):
         entity = _make_entity(chargeMode=0)
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 2
-        entity._handle_coordinator_update()
-        assert entity._attr_current_option == "pv_and_battery"
+        entity.coordinator.poll(chargeMode=7)
+        assert entity.current_option is None
 
 
 # ---------------------------------------------------------------------------
-# Tests: pending mode grace period (blink prevention)
+# Tests: pending mode (blink prevention)
 # ---------------------------------------------------------------------------
 
 class TestPendingMode:
-    @pytest.mark.asyncio
-    async def test_pending_mode_set_after_select(self):
-        """_pending_mode is set after async_select_option."""
-        entity = _make_entity(chargeMode=0)
-        await entity.async_select_option("pv_priority")
-        assert entity._pending_mode == 1
-
     @pytest.mark.asyncio
     async def test_poll_with_old_mode_does_not_revert_state(self):
-        """When a poll returns the old chargeMode during a pending transition,
-        the select entity must not revert its current_option."""
-        entity = _make_entity(chargeMode=0)
-        await entity.async_select_option("pv_priority")  # _pending_mode = 1
-
-        # Simulate a regular poll that still returns old chargeMode=0
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 0
-        entity.coordinator._set_updated_data_calls.clear()
-        entity._handle_coordinator_update()
-
-        # Entity must still show pv_priority (not reverted to fast)
-        assert entity._attr_current_option == "pv_priority"
-
-    @pytest.mark.asyncio
-    async def test_poll_with_old_mode_restores_coordinator_data(self):
-        """When the poll returns the old mode, coordinator.data must be patched
-        back to the pending chargeMode so other entities (e.g. number) also
-        see the correct state."""
+        """A poll that still returns the old chargeMode must not flip the
+        select back while the change is pending."""
         entity = _make_entity(chargeMode=0)
-        await entity.async_select_option("pv_priority")  # _pending_mode = 1
-
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 0
-        entity.coordinator._set_updated_data_calls.clear()
-        entity._handle_coordinator_update()
-
-        # coordinator.data must be restored to chargeMode=1
-        assert entity.coordinator.data[SAMPLE_SN]["chargeMode"] == 1
-        # async_set_updated_data must have been called to notify other entities
-        assert len(entity.coordinator._set_updated_data_calls) == 1
+        await entity.async_select_option("pv_priority")
+        entity.coordinator.poll(chargeMode=0)
+        assert entity.current_option == "pv_priority"
 
     @pytest.mark.asyncio
     async def test_poll_confirming_pending_mode_clears_pending(self):
-        """When the poll returns the expected chargeMode, _pending_mode is cleared."""
         entity = _make_entity(chargeMode=0)
-        await entity.async_select_option("pv_priority")  # _pending_mode = 1
-
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-        entity._handle_coordinator_update()
-
-        assert entity._pending_mode is None
-        assert entity._attr_current_option == "pv_priority"
+        await entity.async_select_option("pv_priority")
+        entity.coordinator.poll(chargeMode=1)
+        assert entity.current_option == "pv_priority"
+        assert entity.reconciler.as_dict() == {}
 
     @pytest.mark.asyncio
-    async def test_pending_mode_timeout_clears_pending(self):
-        """When _pending_mode_set_at is long in the past, the grace period expires
-        and the next poll result is accepted normally."""
-        entity = _make_entity(chargeMode=0)
-        await entity.async_select_option("pv_priority")  # _pending_mode = 1
-
-        # Backdate the timestamp so timeout logic fires
-        entity._pending_mode_set_at = time.monotonic() - 100.0  # 100s in the past
-
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 0
-        entity._handle_coordinator_update()
-
-        # Grace period expired — pending cleared, option updated from poll data
-        assert entity._pending_mode is None
-        assert entity._attr_current_option == "fast"
-
-    def test_restoring_flag_prevents_reentrant_processing(self):
-        """When _restoring=True, _handle_coordinator_update returns immediately."""
+    async def test_pending_mode_timeout_accepts_poll(self):
         entity = _make_entity(chargeMode=0)
-        entity._restoring = True
-        entity.coordinator.data[SAMPLE_SN]["chargeMode"] = 1
-        entity._handle_coordinator_update()
-        # async_write_ha_state must NOT have been called (early return)
-        entity.async_write_ha_state.assert_not_called()
+        await entity.async_select_option("pv_priority")
+        entity.reconciler._targets[_reconciler_mod.MODE].set_at -= (
+            _reconciler_mod.CONFIRM_DEADLINE + 1
+        )
+        entity.coordinator.poll(chargeMode=0)
+        assert entity.current_option == "fast"
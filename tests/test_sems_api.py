@@ -1,7 +1,9 @@
 """Unit tests for sems_api.SemsApi."""
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch, PropertyMock
+import time
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -38,8 +40,17 @@ sys.modules.setdefault("custom_components.sems_wallbox", pkg_wallbox)
 import importlib.util, os
 
 _HERE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "custom_components", "sems-wallbox")
-spec = importlib.util.spec_from_file_location("sems_api", os.path.join(_HERE, "sems_api.py"))
+_pkg_name = "sems_wallbox_pkg_api"
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+spec = importlib.util.spec_from_file_location(
+    f"{_pkg_name}.sems_api", os.path.join(_HERE, "sems_api.py")
+)
 sems_api_module = importlib.util.module_from_spec(spec)
+sys.modules[f"{_pkg_name}.sems_api"] = sems_api_module
 spec.loader.exec_module(sems_api_module)
 
 SemsApi = sems_api_module.SemsApi
@@ -50,30 +61,73 @@ OutOfRetries = sems_api_module.OutOfRetries
 # Helper
 # ---------------------------------------------------------------------------
 
-def _make_api():
+class _FakeResponse:
+    """Minimal stand-in for an aiohttp response used as an async context manager."""
+
+    def __init__(self, payload=None, status=200, text=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._text = text if text is not None else json.dumps(payload)
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Records POST calls and replays queued responses (or raises exceptions)."""
+
+    def __init__(self, *responses, side_effect=None):
+        self._responses = list(responses)
+        self._side_effect = side_effect
+        self.calls: list[tuple[str, dict]] = []
+
+    def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        if self._side_effect is not None:
+            result = self._side_effect(url, **kwargs)
+        else:
+            result = self._responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _make_api(session=None):
     hass = MagicMock()
-    return SemsApi(hass, "user@example.com", "password123")
+    return SemsApi(hass, "user@example.com", "password123", session=session or _FakeSession())
+
+
+def _with_known_endpoint(api, sn="SN001", path=None):
+    """Seed the per-serial endpoint cache so get_data skips probing."""
+    api._status_endpoints[sn] = sems_api_module.StatusEndpoint(
+        path=path or sems_api_module._WallboxPath_V3,
+        fields=frozenset({"sn"}),
+        latency=0.1,
+        checked_at=time.monotonic(),
+    )
+    return api
 
 
 def _login_response(token_data: dict | None, code=0, has_error=False):
-    resp = MagicMock()
-    resp.raise_for_status = MagicMock()
-    resp.json.return_value = {
-        "code": code,
-        "hasError": has_error,
-        "data": token_data,
-        "api": "https://www.semsportal.com/api/",
-        "msg": "",
-    }
-    return resp
-
-
-def _data_response(data, msg=""):
-    resp = MagicMock()
-    resp.raise_for_status = MagicMock()
-    resp.json.return_value = {"data": data, "msg": msg}
-    resp.status_code = 200
-    return resp
+    return _FakeResponse(
+        {
+            "code": code,
+            "hasError": has_error,
+            "data": token_data,
+            "api": "https://www.semsportal.com/api/",
+            "msg": "",
+        }
+    )
+
+
+def _data_response(data, msg="", status=200):
+    return _FakeResponse({"data": data, "msg": msg}, status=status)
 
 
 # ===========================================================================
@@ -81,200 +135,610 @@ def _data_response(data, msg=""):
 # ===========================================================================
 
 class TestAuthentication:
-    def test_success(self):
-        api = _make_api()
+    async def test_success(self):
         token = {"uid": "abc", "token": "tok123", "timestamp": 123}
-        with patch("requests.post", return_value=_login_response(token)):
-            assert api.test_authentication() is True
-        assert api._token is not None
+        api = _make_api(_FakeSession(_login_response(token)))
+        assert await api.async_test_authentication() is True
+        assert api.token_manager.token is not None
 
-    def test_failure_returns_false(self):
-        api = _make_api()
-        with patch("requests.post", side_effect=Exception("timeout")):
-            assert api.test_authentication() is False
+    async def test_failure_returns_false(self):
+        api = _make_api(_FakeSession(Exception("timeout")))
+        assert await api.async_test_authentication() is False
 
-    def test_error_code_returns_false(self):
-        api = _make_api()
-        with patch("requests.post", return_value=_login_response(None, code=100)):
-            assert api.test_authentication() is False
+    async def test_error_code_returns_false(self):
+        api = _make_api(_FakeSession(_login_response(None, code=100)))
+        assert await api.async_test_authentication() is False
 
 
 # ===========================================================================
-# test _fetch_login_token
+# test _async_fetch_login_token
 # ===========================================================================
 
 class TestFetchLoginToken:
-    def test_returns_token_dict(self):
-        api = _make_api()
+    async def test_returns_token_dict(self):
         token = {"uid": "u1", "token": "t1", "timestamp": 999}
-        with patch("requests.post", return_value=_login_response(token)):
-            result = api._fetch_login_token()
+        api = _make_api(_FakeSession(_login_response(token)))
+        result = await api._async_fetch_login_token()
         assert result is not None
         assert result["token"] == "t1"
         assert result["api"] == "https://www.semsportal.com/api/"
 
-    def test_returns_none_on_network_error(self):
-        api = _make_api()
-        with patch("requests.post", side_effect=OSError("network down")):
-            assert api._fetch_login_token() is None
+    async def test_returns_none_on_network_error(self):
+        api = _make_api(_FakeSession(OSError("network down")))
+        assert await api._async_fetch_login_token() is None
 
-    def test_returns_none_when_has_error(self):
-        api = _make_api()
-        with patch("requests.post", return_value=_login_response(None, has_error=True)):
-            assert api._fetch_login_token() is None
+    async def test_returns_none_when_has_error(self):
+        api = _make_api(_FakeSession(_login_response(None, has_error=True)))
+        assert await api._async_fetch_login_token() is None
+
+    async def test_returns_none_on_http_error(self):
+        api = _make_api(_FakeSession(_FakeResponse(status=503, text="unavailable")))
+        assert await api._async_fetch_login_token() is None
 
 
 # ===========================================================================
-# test _ensure_token
+# test TokenManager
 # ===========================================================================
 
-class TestEnsureToken:
-    def test_fetches_token_when_none(self):
-        api = _make_api()
+class TestTokenManager:
+    async def test_fetches_token_when_none(self):
         token = {"uid": "u", "token": "t", "timestamp": 1}
-        with patch("requests.post", return_value=_login_response(token)):
-            assert api._ensure_token() is True
-        assert api._token is not None
-
-    def test_skips_fetch_when_token_already_set(self):
-        api = _make_api()
-        api._token = {"uid": "existing"}
-        with patch("requests.post") as mock_post:
-            assert api._ensure_token() is True
-            mock_post.assert_not_called()
-
-    def test_renew_forces_refetch(self):
-        api = _make_api()
-        api._token = {"uid": "old"}
+        api = _make_api(_FakeSession(_login_response(token)))
+        assert await api.token_manager.async_get_token() is not None
+        assert api.token_manager.token is not None
+
+    async def test_skips_fetch_when_token_already_set(self):
+        session = _FakeSession()
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "existing"})
+        assert await api.token_manager.async_get_token() == {"uid": "existing"}
+        assert session.calls == []
+
+    async def test_force_refetches(self):
         new_token = {"uid": "new", "token": "fresh", "timestamp": 2}
-        with patch("requests.post", return_value=_login_response(new_token)):
-            assert api._ensure_token(renew=True) is True
-        assert api._token["uid"] == "new"
-
-    def test_returns_false_when_login_fails(self):
-        api = _make_api()
-        with patch("requests.post", return_value=_login_response(None)):
-            assert api._ensure_token() is False
-        assert api._token is None
+        api = _make_api(_FakeSession(_login_response(new_token)))
+        api.token_manager.set_token({"uid": "old"})
+        assert await api.token_manager.async_refresh(force=True) is not None
+        assert api.token_manager.token["uid"] == "new"
+
+    async def test_returns_none_when_login_fails(self):
+        api = _make_api(_FakeSession(_login_response(None)))
+        assert await api.token_manager.async_get_token() is None
+        assert api.token_manager.token is None
+
+    async def test_concurrent_refreshes_share_one_login(self):
+        logins = 0
+        release = asyncio.Event()
+
+        async def login():
+            nonlocal logins
+            logins += 1
+            await release.wait()
+            return {"token": f"t{logins}"}
+
+        manager = sems_api_module.TokenManager(MagicMock(), login)
+        stale = {"token": "stale"}
+        manager.set_token(stale)
+        tasks = [
+            asyncio.create_task(manager.async_refresh(rejected=stale))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert logins == 1
+        assert all(r == {"token": "t1"} for r in results)
+
+    async def test_concurrent_callers_share_a_failed_login(self):
+        release = asyncio.Event()
+
+        async def login():
+            await release.wait()
+
+        login = AsyncMock(side_effect=login)
+        manager = sems_api_module.TokenManager(MagicMock(), login)
+        tasks = [asyncio.create_task(manager.async_get_token()) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*tasks) == [None] * 5
+        # The retry right after the failure does not log in again either
+        assert await manager.async_get_token() is None
+        assert login.await_count == 1
+
+    async def test_failed_login_retried_after_cooldown(self, monkeypatch):
+        monkeypatch.setattr(sems_api_module, "_LoginFailureCooldown", 0)
+        login = AsyncMock(side_effect=[None, {"token": "t"}])
+        manager = sems_api_module.TokenManager(MagicMock(), login)
+        assert await manager.async_get_token() is None
+        assert await manager.async_get_token() == {"token": "t"}
+
+    async def test_refresh_skipped_when_token_already_replaced(self):
+        login = AsyncMock(return_value={"token": "new"})
+        manager = sems_api_module.TokenManager(MagicMock(), login)
+        manager.set_token({"token": "current"})
+        assert await manager.async_refresh(rejected={"token": "older"}) == {"token": "current"}
+        login.assert_not_called()
+
+    async def test_old_token_triggers_background_refresh(self):
+        hass = MagicMock()
+        login = AsyncMock(return_value={"token": "new"})
+        manager = sems_api_module.TokenManager(hass, login)
+        manager.set_token({"token": "old"}, obtained_at=time.time() - sems_api_module._TokenRefreshAge - 1)
+        # Hot path returns the current token immediately
+        assert await manager.async_get_token() == {"token": "old"}
+        hass.async_create_background_task.assert_called_once()
+        coro = hass.async_create_background_task.call_args[0][0]
+        await coro
+        assert manager.token == {"token": "new"}
+
+    async def test_failed_background_refresh_keeps_token(self):
+        login = AsyncMock(return_value=None)
+        manager = sems_api_module.TokenManager(MagicMock(), login)
+        manager.set_token({"token": "old"})
+        await manager._async_proactive_refresh()
+        assert manager.token == {"token": "old"}
 
 
 # ===========================================================================
-# test getData
+# test async_get_data
 # ===========================================================================
 
 class TestGetData:
-    def _setup_api_with_token(self):
-        api = _make_api()
-        api._token = {"uid": "u", "token": "t", "timestamp": 1, "api": "https://www.semsportal.com/api/"}
-        return api
+    def _setup_api_with_token(self, session):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "timestamp": 1, "api": "https://www.semsportal.com/api/"})
+        return _with_known_endpoint(api)
 
-    def test_returns_data_dict(self):
-        api = self._setup_api_with_token()
+    async def test_returns_data_dict(self):
         payload = {"sn": "SN001", "status": "EVDetail_Status_Title_Charging", "power": 7.4}
-        with patch("requests.post", return_value=_data_response(payload)):
-            result = api.getData("SN001")
+        api = self._setup_api_with_token(_FakeSession(_data_response(payload)))
+        result = await api.async_get_data("SN001")
         assert result == payload
 
-    def test_returns_none_on_network_error(self):
-        api = self._setup_api_with_token()
-        with patch("requests.post", side_effect=OSError("connection refused")):
-            assert api.getData("SN001") is None
+    async def test_sends_serial_as_json(self):
+        session = _FakeSession(_data_response({"sn": "SN001"}))
+        api = self._setup_api_with_token(session)
+        await api.async_get_data("SN001")
+        _, kwargs = session.calls[0]
+        assert kwargs["json"] == {"sn": "SN001"}
+        assert json.loads(kwargs["headers"]["token"])["token"] == "t"
 
-    def test_retries_on_expired_auth(self):
-        api = self._setup_api_with_token()
-        expired_resp = _data_response(None, msg="authorization has expired")
-        good_payload = {"sn": "SN001", "power": 0.0}
-        good_resp = _data_response(good_payload)
-        new_token = {"uid": "u", "token": "new", "timestamp": 99, "api": "x"}
-
-        call_count = 0
+    async def test_returns_none_on_network_error(self):
+        api = self._setup_api_with_token(_FakeSession(OSError("connection refused")))
+        assert await api.async_get_data("SN001") is None
 
-        def side_effect(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return expired_resp  # status call -> expired
-            if call_count == 2:
-                return _login_response(new_token)  # token renewal
-            return good_resp  # retry status call
+    async def test_returns_none_on_http_error(self):
+        api = self._setup_api_with_token(_FakeSession(_data_response(None, status=500)))
+        assert await api.async_get_data("SN001") is None
 
-        with patch("requests.post", side_effect=side_effect):
-            result = api.getData("SN001", maxTokenRetries=1)
+    async def test_retries_on_expired_auth(self):
+        good_payload = {"sn": "SN001", "power": 0.0}
+        new_token = {"uid": "u", "token": "new", "timestamp": 99, "api": "x"}
+        session = _FakeSession(
+            _data_response(None, msg="authorization has expired"),  # status call -> expired
+            _login_response(new_token),  # token renewal
+            _data_response(good_payload),  # retry status call
+        )
+        api = self._setup_api_with_token(session)
+        result = await api.async_get_data("SN001", maxTokenRetries=1)
         assert result == good_payload
+        assert len(session.calls) == 3
 
-    def test_raises_out_of_retries_when_max_reached(self):
-        api = self._setup_api_with_token()
+    async def test_raises_out_of_retries_when_max_reached(self):
+        api = self._setup_api_with_token(_FakeSession())
         with pytest.raises(OutOfRetries):
-            api.getData("SN001", maxTokenRetries=-1)
+            await api.async_get_data("SN001", maxTokenRetries=-1)
 
 
 # ===========================================================================
-# test change_status
+# test async_change_status
 # ===========================================================================
 
 class TestChangeStatus:
-    def _setup_api_with_token(self):
-        api = _make_api()
-        api._token = {"uid": "u", "token": "t", "timestamp": 1, "api": "x"}
+    def _setup_api_with_token(self, session):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "timestamp": 1, "api": "x"})
+        return api
+
+    async def test_sends_correct_payload(self):
+        session = _FakeSession(_data_response("ok"))
+        api = self._setup_api_with_token(session)
+        assert (await api.async_change_status("SN001", 1)).ok is True
+        _, kwargs = session.calls[0]
+        assert kwargs["json"] == {"sn": "SN001", "status": "1"}
+
+    async def test_returns_false_on_non_200(self):
+        session = _FakeSession(_FakeResponse(status=500, text="Internal Server Error"))
+        api = self._setup_api_with_token(session)
+        assert (await api.async_change_status("SN001", 2)).ok is False
+
+    async def test_retries_on_expired_auth(self):
+        new_token = {"uid": "u", "token": "new", "timestamp": 99, "api": "x"}
+        session = _FakeSession(
+            _data_response(None, msg="authorization has expired"),
+            _login_response(new_token),
+            _data_response("ok"),
+        )
+        api = self._setup_api_with_token(session)
+        assert (await api.async_change_status("SN001", 1)).ok is True
+        assert api.token_manager.token["token"] == "new"
+
+
+# ===========================================================================
+# test async_set_charge_mode
+# ===========================================================================
+
+class TestSetChargeMode:
+    def _setup_api_with_token(self, session):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "timestamp": 1, "api": "x"})
         return api
 
-    def test_sends_correct_payload(self):
-        api = self._setup_api_with_token()
-        resp = MagicMock()
-        resp.raise_for_status = MagicMock()
-        resp.status_code = 200
-        resp.json.return_value = {"data": "ok", "msg": ""}
+    async def test_sends_mode_without_power(self):
+        session = _FakeSession(_data_response("ok"))
+        api = self._setup_api_with_token(session)
+        assert (await api.async_set_charge_mode("SN001", 1)).ok is True
+        _, kwargs = session.calls[0]
+        assert kwargs["json"] == {"sn": "SN001", "type": 1}
+
+    async def test_sends_mode_with_power(self):
+        session = _FakeSession(_data_response("ok"))
+        api = self._setup_api_with_token(session)
+        await api.async_set_charge_mode("SN001", 0, chargePower=7.4)
+        _, kwargs = session.calls[0]
+        assert kwargs["json"] == {"sn": "SN001", "type": 0, "charge_power": 7.4}
+
+    async def test_returns_false_on_network_error(self):
+        api = self._setup_api_with_token(_FakeSession(OSError("connection reset")))
+        assert (await api.async_set_charge_mode("SN001", 1)).ok is False
+
+    async def test_returns_state_echoed_in_response(self):
+        session = _FakeSession(
+            _data_response({"sn": "SN001", "chargeMode": "0", "charge_power": "7.4"})
+        )
+        api = self._setup_api_with_token(session)
+        result = await api.async_set_charge_mode("SN001", 0, chargePower=7.4)
+        assert result.state == {"chargeMode": 0, "set_charge_power": 7.4}
+
+    async def test_response_without_data_has_no_state(self):
+        api = self._setup_api_with_token(_FakeSession(_data_response("ok")))
+        assert (await api.async_set_charge_mode("SN001", 1)).state == {}
+
+    def test_requested_status_code_is_not_taken_as_status(self):
+        state = SemsApi._parse_command_state(
+            {"data": {"status": "1", "power": "bad", "chargeMode": 2}}
+        )
+        assert state == {"chargeMode": 2}
+
 
-        with patch("requests.post", return_value=resp) as mock_post:
-            api.change_status("SN001", 1)
+# ===========================================================================
+# connection pool
+# ===========================================================================
 
-        call_kwargs = mock_post.call_args
-        assert call_kwargs[1]["json"] == {"sn": "SN001", "status": "1"}
+class TestConnectionPool:
+    def test_reuse_ratio_zero_without_connections(self):
+        stats = sems_api_module.ConnectionStats()
+        assert stats.reuse_ratio == 0.0
+        assert stats.avg_handshake_time is None
+
+    def test_reuse_ratio_and_handshake_average(self):
+        stats = sems_api_module.ConnectionStats(
+            connections_created=1, connections_reused=3, handshake_time_total=0.2
+        )
+        assert stats.reuse_ratio == 0.75
+        assert stats.avg_handshake_time == 0.2
+        assert stats.as_dict()["reuse_ratio"] == 0.75
+
+    async def test_owned_session_is_pooled_and_closed(self):
+        api = SemsApi(MagicMock(), "user@example.com", "password123")
+        session = api._get_session()
+        assert api._get_session() is session
+        assert session.connector._keepalive_timeout == sems_api_module._KeepAliveTimeout
+        await api.async_close()
+        assert session.closed
+
+    async def test_owned_session_is_closed_when_ha_closes(self):
+        hass = MagicMock()
+        api = SemsApi(hass, "user@example.com", "password123")
+        session = api._get_session()
+        event, listener = hass.bus.async_listen_once.call_args[0]
+        assert event == sems_api_module.EVENT_HOMEASSISTANT_CLOSE
+        await listener(None)
+        assert session.closed
+        # The listener already fired, so closing again must not remove it
+        hass.bus.async_listen_once.return_value.assert_not_called()
+        await api.async_close()
+        hass.bus.async_listen_once.return_value.assert_not_called()
+
+    async def test_injected_session_is_not_closed(self):
+        session = _FakeSession()
+        api = _make_api(session)
+        session.close = MagicMock()
+        await api.async_close()
+        session.close.assert_not_called()
 
-    def test_logs_warning_on_non_200(self):
-        api = self._setup_api_with_token()
-        resp = MagicMock()
-        resp.raise_for_status = MagicMock()
-        resp.status_code = 500
-        resp.text = "Internal Server Error"
-        resp.json.return_value = {"data": None, "msg": "error"}
 
-        with patch("requests.post", return_value=resp):
-            api.change_status("SN001", 2)  # Should not raise, just log warning
+# ===========================================================================
+# token persistence
+# ===========================================================================
+
+class _FakeStore:
+    def __init__(self, data=None):
+        self.data = data
+        self.saved = []
+        self.removed = False
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data):
+        self.data = data
+        self.saved.append(data)
+
+    async def async_remove(self):
+        self.data = None
+        self.removed = True
+
+
+class TestTokenPersistence:
+    async def test_restored_token_skips_login(self):
+        store = _FakeStore({"token": {"uid": "u", "token": "persisted", "api": "x"}})
+        session = _FakeSession(_data_response({"sn": "SN001"}))
+        api = _with_known_endpoint(
+            SemsApi(MagicMock(), "user@example.com", "pw", session=session, token_store=store)
+        )
+        assert await api.async_load_token() is True
+        assert await api.async_get_data("SN001") == {"sn": "SN001"}
+        # Only the status call, no CrossLogin
+        assert len(session.calls) == 1
+
+    async def test_load_without_stored_token(self):
+        api = SemsApi(MagicMock(), "u", "p", session=_FakeSession(), token_store=_FakeStore())
+        assert await api.async_load_token() is False
+        assert api.token_manager.token is None
+
+    async def test_new_login_is_persisted(self):
+        store = _FakeStore()
+        token = {"uid": "u", "token": "fresh", "timestamp": 1}
+        api = SemsApi(MagicMock(), "u", "p", session=_FakeSession(_login_response(token)), token_store=store)
+        assert await api.token_manager.async_get_token() is not None
+        assert store.data["token"]["token"] == "fresh"
+
+    async def test_expired_persisted_token_is_replaced(self):
+        store = _FakeStore({"token": {"uid": "u", "token": "stale", "api": "x"}})
+        new_token = {"uid": "u", "token": "new", "timestamp": 2}
+        session = _FakeSession(
+            _data_response(None, msg="authorization has expired"),
+            _login_response(new_token),
+            _data_response({"sn": "SN001"}),
+        )
+        api = _with_known_endpoint(SemsApi(MagicMock(), "u", "p", session=session, token_store=store))
+        await api.async_load_token()
+        assert await api.async_get_data("SN001") == {"sn": "SN001"}
+        assert store.data["token"]["token"] == "new"
+
+    async def test_failed_login_drops_persisted_token(self):
+        store = _FakeStore({"token": {"uid": "u"}})
+        api = SemsApi(MagicMock(), "u", "p", session=_FakeSession(_login_response(None)), token_store=store)
+        assert await api.token_manager.async_refresh(force=True) is None
+        assert store.removed
 
 
 # ===========================================================================
-# test set_charge_mode
+# regional API host
 # ===========================================================================
 
-class TestSetChargeMode:
-    def _setup_api_with_token(self):
-        api = _make_api()
-        api._token = {"uid": "u", "token": "t", "timestamp": 1, "api": "x"}
+class TestRegionalHost:
+    def _api(self, session, api_url):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "api": api_url})
         return api
 
-    def test_sends_mode_without_power(self):
-        api = self._setup_api_with_token()
-        resp = MagicMock()
-        resp.raise_for_status = MagicMock()
-        resp.status_code = 200
-        resp.json.return_value = {"data": "ok", "msg": ""}
+    async def test_requests_use_regional_host(self):
+        session = _FakeSession(_data_response({"sn": "SN001"}))
+        api = _with_known_endpoint(self._api(session, "https://eu.semsportal.com/api/"))
+        await api.async_get_data("SN001")
+        url, _ = session.calls[0]
+        assert url == "https://eu.semsportal.com/api/v3/EvCharger/GetCurrentChargeinfo"
+
+    async def test_missing_trailing_slash_is_added(self):
+        api = self._api(_FakeSession(), "https://eu.semsportal.com/api")
+        assert api.base_url() == "https://eu.semsportal.com/api/"
+
+    @pytest.mark.parametrize(
+        "api_url",
+        [None, "x", "http://eu.semsportal.com/api/", "https://semsportal.com.evil.example/api/"],
+    )
+    async def test_untrusted_or_missing_host_uses_global(self, api_url):
+        api = self._api(_FakeSession(), api_url)
+        assert api.base_url() == sems_api_module._GlobalBaseURL
+
+    async def test_login_always_uses_global_host(self):
+        session = _FakeSession(_login_response({"uid": "u", "token": "t"}))
+        api = self._api(session, "https://eu.semsportal.com/api/")
+        await api._async_fetch_login_token()
+        url, _ = session.calls[0]
+        assert url == sems_api_module._LoginURL
+
+    async def test_connection_error_falls_back_to_global(self):
+        import aiohttp
+
+        session = _FakeSession(
+            aiohttp.ClientConnectionError("unreachable"),
+            _data_response("ok"),
+        )
+        api = self._api(session, "https://eu.semsportal.com/api/")
+        assert (await api.async_set_charge_mode("SN001", 1)).ok is True
+        assert session.calls[1][0].startswith(sems_api_module._GlobalBaseURL)
+        # Subsequent calls stay on the global host during the cooldown
+        assert api.base_url() == sems_api_module._GlobalBaseURL
 
-        with patch("requests.post", return_value=resp) as mock_post:
-            api.set_charge_mode("SN001", 1)
 
-        call_kwargs = mock_post.call_args
-        assert call_kwargs[1]["json"] == {"sn": "SN001", "type": 1}
+# ===========================================================================
+# status endpoint probing
+# ===========================================================================
+
+FULL_STATUS = {
+    "sn": "SN001", "name": "Garage", "model": "GW11K-HCA", "fireware": "1.0",
+    "status": "EVDetail_Status_Title_Waiting", "workstate": "EVDetail_Status_Waiting_Stat00",
+    "power": 0, "current": 0, "chargeEnergy": 12.5, "chargeMode": 0,
+    "set_charge_power": 7.4, "min_charge_power": 4.2, "max_charge_power": 11.0,
+}
 
-    def test_sends_mode_with_power(self):
-        api = self._setup_api_with_token()
-        resp = MagicMock()
-        resp.raise_for_status = MagicMock()
-        resp.status_code = 200
-        resp.json.return_value = {"data": "ok", "msg": ""}
 
-        with patch("requests.post", return_value=resp) as mock_post:
-            api.set_charge_mode("SN001", 0, chargePower=7.4)
+class TestStatusEndpointProbe:
+    def _api(self, session):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "api": None})
+        return api
+
+    @staticmethod
+    def _paths(session):
+        return [url.rsplit("/api/", 1)[1] for url, _ in session.calls]
+
+    async def test_v4_with_required_fields_is_cached(self):
+        session = _FakeSession(_data_response(FULL_STATUS), _data_response(FULL_STATUS))
+        api = self._api(session)
+        assert await api.async_get_data("SN001") == FULL_STATUS
+        assert await api.async_get_data("SN001") == FULL_STATUS
+        assert self._paths(session) == [sems_api_module._WallboxPath_V4] * 2
+
+    async def test_v4_404_probed_once_then_v3_cached(self):
+        session = _FakeSession(
+            _data_response(None, status=404),
+            _data_response(FULL_STATUS),
+            _data_response(FULL_STATUS),
+            _data_response(FULL_STATUS),
+        )
+        api = self._api(session)
+        for _ in range(3):
+            assert await api.async_get_data("SN001") == FULL_STATUS
+        v3, v4 = sems_api_module._WallboxPath_V3, sems_api_module._WallboxPath_V4
+        # The known-bad v4 endpoint is paid for exactly once
+        assert self._paths(session) == [v4, v3, v3, v3]
+        endpoint = api.diagnostics()["status_endpoints"]["SN001"]
+        assert endpoint["path"] == v3
+        assert endpoint["rejected"] == [v4]
+        assert "chargeMode" in endpoint["fields"]
+
+    async def test_v4_missing_fields_falls_back_to_v3(self):
+        session = _FakeSession(_data_response({"sn": "SN001"}), _data_response(FULL_STATUS))
+        api = self._api(session)
+        assert await api.async_get_data("SN001") == FULL_STATUS
+        assert api._status_endpoints["SN001"].path == sems_api_module._WallboxPath_V3
+
+    async def test_v4_without_energy_falls_back_to_v3(self):
+        partial = {k: v for k, v in FULL_STATUS.items() if k != "chargeEnergy"}
+        session = _FakeSession(_data_response(partial), _data_response(FULL_STATUS))
+        api = self._api(session)
+        assert await api.async_get_data("SN001") == FULL_STATUS
+        assert api._status_endpoints["SN001"].path == sems_api_module._WallboxPath_V3
+        assert api._status_endpoints["SN001"].rejected == (sems_api_module._WallboxPath_V4,)
+
+    async def test_cached_endpoint_404_triggers_reprobe(self):
+        session = _FakeSession(
+            _data_response(None, status=404),
+            _data_response(FULL_STATUS),
+            _data_response(FULL_STATUS),
+        )
+        api = _with_known_endpoint(self._api(session), path=sems_api_module._WallboxPath_V3)
+        api._status_endpoints["SN001"].path = sems_api_module._WallboxPath_V4
+        assert await api.async_get_data("SN001") == FULL_STATUS
+        assert api._status_endpoints["SN001"].path == sems_api_module._WallboxPath_V4
+
+    async def test_stale_probe_is_rechecked(self):
+        session = _FakeSession(_data_response(FULL_STATUS))
+        api = _with_known_endpoint(self._api(session))
+        api._status_endpoints["SN001"].checked_at -= sems_api_module._EndpointRecheckInterval + 1
+        await api.async_get_data("SN001")
+        assert self._paths(session) == [sems_api_module._WallboxPath_V4]
+
+    async def test_no_working_endpoint_returns_none_without_caching(self):
+        session = _FakeSession(_data_response(None, status=404), _data_response(None, status=500))
+        api = self._api(session)
+        assert await api.async_get_data("SN001") is None
+        assert "SN001" not in api._status_endpoints
+
+
+# ===========================================================================
+# Circuit breaker
+# ===========================================================================
+
+class TestCircuitBreaker:
+    def _api(self, session):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "api": None})
+        return _with_known_endpoint(api)
+
+    async def test_repeated_5xx_opens_circuit_and_stops_requests(self):
+        session = _FakeSession(side_effect=lambda url, **kw: _data_response(None, status=503))
+        api = self._api(session)
+        for _ in range(3):
+            assert await api.async_get_data("SN001") is None
+        sent = len(session.calls)
+        with pytest.raises(sems_api_module.CircuitOpenError):
+            await api.async_get_data("SN001")
+        assert len(session.calls) == sent
+        breaker = api.diagnostics()["circuit_breakers"][sems_api_module._WallboxPath_V3]
+        assert breaker["state"] == "open"
+        assert breaker["last_error"] == "HTTP 503"
+
+    async def test_commands_fail_fast_while_open(self):
+        session = _FakeSession(side_effect=lambda url, **kw: OSError("connection reset"))
+        api = self._api(session)
+        for _ in range(3):
+            assert (await api.async_change_status("SN001", 2)).ok is False
+        sent = len(session.calls)
+        assert (await api.async_change_status("SN001", 2)).ok is False
+        assert len(session.calls) == sent
+
+    async def test_client_errors_do_not_open_circuit(self):
+        session = _FakeSession(side_effect=lambda url, **kw: _data_response(None, status=400))
+        api = self._api(session)
+        for _ in range(5):
+            assert (await api.async_set_charge_mode("SN001", 1, 10)).ok is False
+        assert len(session.calls) == 5
+
+    async def test_open_v4_breaker_is_skipped_by_probe(self):
+        session = _FakeSession(_data_response(FULL_STATUS))
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "api": None})
+        v4 = api._breaker(sems_api_module._WallboxPath_V4)
+        for _ in range(3):
+            v4.record_failure("HTTP 500")
+        assert await api.async_get_data("SN001") == FULL_STATUS
+        assert session.calls[0][0].endswith(sems_api_module._WallboxPath_V3)
+
+
+# ===========================================================================
+# Rate limiting
+# ===========================================================================
 
-        call_kwargs = mock_post.call_args
-        assert call_kwargs[1]["json"] == {"sn": "SN001", "type": 0, "charge_power": 7.4}
+class TestRateLimiting:
+    def _api(self, session):
+        api = _make_api(session)
+        api.token_manager.set_token({"uid": "u", "token": "t", "api": None})
+        return _with_known_endpoint(api)
+
+    async def test_429_retry_after_pauses_requests(self):
+        session = _FakeSession(
+            _FakeResponse(status=429, text="", headers={"Retry-After": "120"})
+        )
+        api = self._api(session)
+        assert await api.async_get_data("SN001") is None
+        assert api.diagnostics()["rate_limiter"]["blocked_for"] == 120
+        with pytest.raises(sems_api_module.RateLimited):
+            await api.async_get_data(
+                "SN001", priority=sems_api_module.RequestPriority.REFRESH
+            )
+        assert len(session.calls) == 1
+
+    async def test_exhausted_read_budget_drops_refresh_not_command(self):
+        session = _FakeSession(side_effect=lambda url, **kw: _data_response(FULL_STATUS))
+        api = self._api(session)
+        refresh = sems_api_module.RequestPriority.REFRESH
+        for _ in range(sys.modules[f"{_pkg_name}.rate_limiter"].DEFAULT_READ_CAPACITY):
+            await api.async_get_data("SN001", priority=refresh)
+        with pytest.raises(sems_api_module.RateLimited):
+            await api.async_get_data("SN001", priority=refresh)
+        assert (await api.async_change_status("SN001", 1)).ok is True
@@ -1,4 +1,4 @@
-"""Unit tests for sensor.py — SemsSensor and SemsWorkStateSensor."""
+"""Unit tests for sensor.py — description-driven SemsSensor."""
 
 import sys
 import os
@@ -116,18 +116,41 @@ def _load_module(name, filepath):
     return mod
 
 
+snapshot_mod = _load_module(
+    "sems_wallbox_pkg.snapshot", os.path.join(_HERE, "snapshot.py")
+)
+WallboxSnapshot = snapshot_mod.WallboxSnapshot
+deadband_mod = _load_module(
+    "sems_wallbox_pkg.deadband", os.path.join(_HERE, "deadband.py")
+)
+DeadbandFilter = deadband_mod.DeadbandFilter
+
 # coordinator stub
 coord_stub = types.ModuleType("coordinator")
 class _FakeCoordinator:
     def __init__(self, data):
-        self.data = data
+        self.data = {sn: WallboxSnapshot.from_dict(d) for sn, d in data.items()}
+        self.devices = {sn: _device(snapshot) for sn, snapshot in self.data.items()}
         self.last_update_success = True
+        self.stale_serials = set()
+
+    def serial_available(self, sn):
+        return self.last_update_success and sn not in self.stale_serials
+
 coord_stub.SemsUpdateCoordinator = _FakeCoordinator
 sys.modules["coordinator"] = coord_stub
 
 # const stub
 const_stub = types.ModuleType("const")
 const_stub.DOMAIN = "sems-wallbox"
+const_stub.CONF_POWER_DEADBAND = "power_deadband"
+const_stub.CONF_CURRENT_DEADBAND = "current_deadband"
+const_stub.CONF_DEADBAND_PERCENT = "deadband_percent"
+const_stub.CONF_HEARTBEAT = "heartbeat"
+const_stub.DEFAULT_POWER_DEADBAND = 0.1
+const_stub.DEFAULT_CURRENT_DEADBAND = 0.5
+const_stub.DEFAULT_DEADBAND_PERCENT = 0
+const_stub.DEFAULT_HEARTBEAT = 300
 sys.modules["const"] = const_stub
 
 # Patch relative imports inside sensor.py
@@ -138,6 +161,18 @@ sys.modules.setdefault("sems_wallbox_pkg", pkg)
 sys.modules["sems_wallbox_pkg.coordinator"] = coord_stub
 sys.modules["sems_wallbox_pkg.const"] = const_stub
 
+WallboxDevice = _load_module(
+    "sems_wallbox_pkg.device", os.path.join(_HERE, "device.py")
+).WallboxDevice
+
+
+def _device(snapshot):
+    """Return the shared device info object of a polled wallbox."""
+    device = WallboxDevice(snapshot.sn)
+    device.update(snapshot)
+    return device
+
+
 # Monkey-patch: load sensor.py as a top-level module but pretend its package exports
 sensor_source = os.path.join(_HERE, "sensor.py")
 spec = importlib.util.spec_from_file_location("sems_wallbox_pkg.sensor", sensor_source)
@@ -147,10 +182,7 @@ sys.modules["sems_wallbox_pkg.sensor"] = sensor_mod
 spec.loader.exec_module(sensor_mod)
 
 SemsSensor = sensor_mod.SemsSensor
-SemsWorkStateSensor = sensor_mod.SemsWorkStateSensor
-SemsPowerSensor = sensor_mod.SemsPowerSensor
-SemsStatisticsSensor = sensor_mod.SemsStatisticsSensor
-SemsCurrentSensor = sensor_mod.SemsCurrentSensor
+DESCRIPTIONS = {d.key: d for d in sensor_mod.SENSOR_DESCRIPTIONS}
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -179,88 +211,102 @@ def _make_coordinator(data=None):
     return _FakeCoordinator({SAMPLE_SN: data or SAMPLE_DATA.copy()})
 
 
+def _sensor(key, coord, value_filter=None):
+    return SemsSensor(coord, SAMPLE_SN, DESCRIPTIONS[key], value_filter)
+
+
 # ===========================================================================
-# SemsSensor
+# Status sensor
 # ===========================================================================
 
-class TestSemsSensor:
+class TestStatusSensor:
     def test_state_charging(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
-        assert sensor.state == "charging"
+        sensor = _sensor("status", coord)
+        assert sensor.native_value == "charging"
 
     def test_state_standby(self):
         d = {**SAMPLE_DATA, "status": "EVDetail_Status_Title_Waiting"}
         coord = _make_coordinator(d)
-        sensor = SemsSensor(coord, SAMPLE_SN)
-        assert sensor.state == "standby"
+        sensor = _sensor("status", coord)
+        assert sensor.native_value == "standby"
 
     def test_state_offline(self):
         d = {**SAMPLE_DATA, "status": "EVDetail_Status_Title_Offline"}
         coord = _make_coordinator(d)
-        sensor = SemsSensor(coord, SAMPLE_SN)
-        assert sensor.state == "offline"
+        sensor = _sensor("status", coord)
+        assert sensor.native_value == "offline"
 
     def test_state_unknown(self):
         d = {**SAMPLE_DATA, "status": "EVDetail_Status_SomethingElse"}
         coord = _make_coordinator(d)
-        sensor = SemsSensor(coord, SAMPLE_SN)
-        assert sensor.state == "unknown"
+        sensor = _sensor("status", coord)
+        assert sensor.native_value == "unknown"
 
     def test_icon_charging(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         assert sensor.icon == "mdi:battery-charging-100"
 
     def test_icon_standby(self):
         d = {**SAMPLE_DATA, "status": "EVDetail_Status_Title_Waiting"}
         coord = _make_coordinator(d)
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         assert sensor.icon == "mdi:ev-station"
 
     def test_icon_offline(self):
         d = {**SAMPLE_DATA, "status": "EVDetail_Status_Title_Offline"}
         coord = _make_coordinator(d)
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         assert sensor.icon == "mdi:power-plug-off"
 
     def test_icon_unknown(self):
         d = {**SAMPLE_DATA, "status": "EVDetail_Status_Other"}
         coord = _make_coordinator(d)
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         assert sensor.icon == "mdi:help-circle-outline"
 
     def test_translation_key_is_status(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
-        assert sensor._attr_translation_key == "status"
+        sensor = _sensor("status", coord)
+        assert sensor.entity_description.translation_key == "status"
 
     def test_has_entity_name(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         assert sensor._attr_has_entity_name is True
 
     def test_unique_id(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
-        assert sensor.unique_id == SAMPLE_SN
+        sensor = _sensor("status", coord)
+        assert sensor._attr_unique_id == SAMPLE_SN
 
     def test_available_follows_coordinator(self):
         coord = _make_coordinator()
         coord.last_update_success = False
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         assert sensor.available is False
 
     def test_extra_state_attributes_contains_status_text(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         attrs = sensor.extra_state_attributes
         assert "statusText" in attrs
         assert attrs["statusText"] == SAMPLE_DATA["status"]
 
+    def test_raw_payload_not_in_attributes(self):
+        attrs = _sensor("status", _make_coordinator()).extra_state_attributes
+        assert "fireware" not in attrs
+        assert "chargeEnergy" not in attrs
+
+    def test_attributes_are_not_recorded(self):
+        assert SemsSensor._unrecorded_attributes == frozenset(
+            {"statusText", "workstate", "chargeMode", "startStatus"}
+        )
+
     def test_device_info_has_identifiers(self):
         coord = _make_coordinator()
-        sensor = SemsSensor(coord, SAMPLE_SN)
+        sensor = _sensor("status", coord)
         info = sensor.device_info
         assert ("sems-wallbox", SAMPLE_SN) in info["identifiers"]
         assert info["manufacturer"] == "GoodWe"
@@ -270,14 +316,14 @@ class TestSemsSensor:
 
 
 # ===========================================================================
-# SemsWorkStateSensor
+# Workstate sensor
 # ===========================================================================
 
-class TestSemsWorkStateSensor:
+class TestWorkStateSensor:
     def _sensor(self, workstate: str):
         d = {**SAMPLE_DATA, "workstate": workstate}
         coord = _make_coordinator(d)
-        return SemsWorkStateSensor(coord, SAMPLE_SN)
+        return _sensor("workstate", coord)
 
     def test_not_plugged_in(self):
         s = self._sensor("EVDetail_Status_Waiting_Stat00")
@@ -306,11 +352,11 @@ class TestSemsWorkStateSensor:
 
     def test_unique_id(self):
         s = self._sensor("EVDetail_Status_Waiting_Stat00")
-        assert s.unique_id == f"{SAMPLE_SN}_workstate"
+        assert s._attr_unique_id == f"{SAMPLE_SN}_workstate"
 
     def test_translation_key(self):
         s = self._sensor("EVDetail_Status_Waiting_Stat00")
-        assert s._attr_translation_key == "workstate"
+        assert s.entity_description.translation_key == "workstate"
 
     def test_device_info(self):
         s = self._sensor("EVDetail_Status_Waiting_Stat00")
@@ -320,108 +366,202 @@ class TestSemsWorkStateSensor:
 
 
 # ===========================================================================
-# SemsPowerSensor
+# Power sensor
 # ===========================================================================
 
-class TestSemsPowerSensor:
+class TestPowerSensor:
     def test_normal_power(self):
         coord = _make_coordinator()
-        s = SemsPowerSensor(coord, SAMPLE_SN)
+        s = _sensor("power", coord)
         assert s.native_value == pytest.approx(7.4)
 
     def test_negative_power_clamped_to_zero(self):
         d = {**SAMPLE_DATA, "power": -1.5}
         coord = _make_coordinator(d)
-        s = SemsPowerSensor(coord, SAMPLE_SN)
+        s = _sensor("power", coord)
         assert s.native_value == 0.0
 
     def test_none_power_defaults_to_zero(self):
         d = {**SAMPLE_DATA, "power": None}
         coord = _make_coordinator(d)
-        s = SemsPowerSensor(coord, SAMPLE_SN)
+        s = _sensor("power", coord)
         assert s.native_value == 0.0
 
     def test_unique_id(self):
         coord = _make_coordinator()
-        s = SemsPowerSensor(coord, SAMPLE_SN)
-        assert s.unique_id == f"{SAMPLE_SN}_power"
+        s = _sensor("power", coord)
+        assert s._attr_unique_id == f"{SAMPLE_SN}_power"
 
     def test_translation_key(self):
         coord = _make_coordinator()
-        s = SemsPowerSensor(coord, SAMPLE_SN)
-        assert s._attr_translation_key == "power"
+        s = _sensor("power", coord)
+        assert s.entity_description.translation_key == "power"
+
+    async def test_deadband_suppresses_small_changes(self):
+        coord = _make_coordinator()
+        s = _sensor("power", coord, DeadbandFilter(absolute=0.5))
+        s.async_write_ha_state = MagicMock()
+        await s.async_added_to_hass()
+        coord.data = _make_coordinator({**SAMPLE_DATA, "power": 7.6}).data
+        s._handle_coordinator_update()
+        s.async_write_ha_state.assert_not_called()
+        assert s.native_value == pytest.approx(7.4)
+        coord.data = _make_coordinator({**SAMPLE_DATA, "power": 0.0}).data
+        s._handle_coordinator_update()
+        s.async_write_ha_state.assert_called_once()
+        assert s.native_value == 0.0
+
+    async def test_suppressed_value_published_at_heartbeat(self, monkeypatch, clock):
+        timers = []
+        monkeypatch.setattr(
+            sensor_mod, "async_call_later",
+            lambda hass, delay, action: timers.append((delay, action)) or (lambda: None),
+        )
+        coord = _make_coordinator({**SAMPLE_DATA, "power": 7.0})
+        s = _sensor("power", coord, DeadbandFilter(
+            absolute=0.5, heartbeat=300, clock=clock
+        ))
+        s.hass = MagicMock()
+        s.async_write_ha_state = MagicMock()
+        await s.async_added_to_hass()
+        clock.now = 10
+        coord.data = _make_coordinator({**SAMPLE_DATA, "power": 7.05}).data
+        s._handle_coordinator_update()
+        s.async_write_ha_state.assert_not_called()
+        # The value stays at 7.05: no further coordinator callback arrives
+        (delay, heartbeat), = timers
+        assert delay == 290
+        clock.now = 300
+        heartbeat(None)
+        s.async_write_ha_state.assert_called_once()
+        assert s.native_value == pytest.approx(7.05)
+
+    async def test_unavailable_is_always_written(self):
+        coord = _make_coordinator()
+        s = _sensor("power", coord, DeadbandFilter(absolute=5.0))
+        s.async_write_ha_state = MagicMock()
+        await s.async_added_to_hass()
+        coord.last_update_success = False
+        s._handle_coordinator_update()
+        coord.last_update_success = True
+        s._handle_coordinator_update()
+        assert s.async_write_ha_state.call_count == 2
 
 
 # ===========================================================================
-# SemsStatisticsSensor
+# Energy sensor
 # ===========================================================================
 
-class TestSemsStatisticsSensor:
+class TestEnergySensor:
     def test_parse_string_value(self):
         from decimal import Decimal
         coord = _make_coordinator()
-        s = SemsStatisticsSensor(coord, SAMPLE_SN)
+        s = _sensor("energy", coord)
         assert s.native_value == Decimal("123.5")
 
     def test_fallback_on_invalid_value(self):
         from decimal import Decimal
         d = {**SAMPLE_DATA, "chargeEnergy": "not_a_number"}
         coord = _make_coordinator(d)
-        s = SemsStatisticsSensor(coord, SAMPLE_SN)
+        s = _sensor("energy", coord)
         assert s.native_value == Decimal("0")
 
     def test_unique_id(self):
         coord = _make_coordinator()
-        s = SemsStatisticsSensor(coord, SAMPLE_SN)
-        assert s.unique_id == f"{SAMPLE_SN}-energy"
+        s = _sensor("energy", coord)
+        assert s._attr_unique_id == f"{SAMPLE_SN}-energy"
 
 
 # ===========================================================================
-# SemsCurrentSensor
+# Current sensor
 # ===========================================================================
 
-class TestSemsCurrentSensor:
+class TestCurrentSensor:
     def test_normal_current(self):
         coord = _make_coordinator()
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
+        s = _sensor("current", coord)
         assert s.native_value == pytest.approx(32.0)
 
     def test_negative_current_clamped_to_zero(self):
         d = {**SAMPLE_DATA, "current": -5.0}
         coord = _make_coordinator(d)
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
+        s = _sensor("current", coord)
         assert s.native_value == 0.0
 
     def test_none_current_defaults_to_zero(self):
         d = {**SAMPLE_DATA, "current": None}
         coord = _make_coordinator(d)
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
+        s = _sensor("current", coord)
         assert s.native_value == 0.0
 
     def test_unique_id(self):
         coord = _make_coordinator()
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
-        assert s.unique_id == f"{SAMPLE_SN}_current"
+        s = _sensor("current", coord)
+        assert s._attr_unique_id == f"{SAMPLE_SN}_current"
 
     def test_translation_key(self):
         coord = _make_coordinator()
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
-        assert s._attr_translation_key == "current"
+        s = _sensor("current", coord)
+        assert s.entity_description.translation_key == "current"
 
     def test_available_when_coordinator_success(self):
         coord = _make_coordinator()
         coord.last_update_success = True
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
+        s = _sensor("current", coord)
         assert s.available is True
 
     def test_unavailable_when_coordinator_fails(self):
         coord = _make_coordinator()
         coord.last_update_success = False
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
+        s = _sensor("current", coord)
         assert s.available is False
 
     def test_device_info(self):
         coord = _make_coordinator()
-        s = SemsCurrentSensor(coord, SAMPLE_SN)
+        s = _sensor("current", coord)
         info = s.device_info
         assert info["name"] == "My Wallbox"
+
+
+# ===========================================================================
+# Descriptions
+# ===========================================================================
+
+class TestDescriptions:
+    def test_unique_ids_are_distinct(self):
+        coord = _make_coordinator()
+        ids = [_sensor(key, coord)._attr_unique_id for key in DESCRIPTIONS]
+        assert len(set(ids)) == len(DESCRIPTIONS)
+
+    def test_value_is_read_once_per_update(self):
+        coord = _make_coordinator()
+        s = _sensor("power", coord)
+        s.async_write_ha_state = MagicMock()
+        coord.data = _make_coordinator({**SAMPLE_DATA, "power": 3.0}).data
+        assert s.native_value == pytest.approx(7.4)
+        s._handle_coordinator_update()
+        assert s.native_value == pytest.approx(3.0)
+        s.async_write_ha_state.assert_called_once()
+
+    def test_missing_snapshot_reads_as_none(self):
+        coord = _make_coordinator()
+        coord.data = {}
+        coord.serial_available = lambda sn: False
+        s = _sensor("status", coord)
+        assert s.native_value is None
+        assert s.extra_state_attributes == {}
+
+    def test_only_power_and_current_are_filtered(self):
+        filtered = {
+            key
+            for key, description in DESCRIPTIONS.items()
+            if sensor_mod._deadband_filter({}, description) is not None
+        }
+        assert filtered == {"power", "current"}
+
+    def test_deadband_comes_from_options(self):
+        f = sensor_mod._deadband_filter(
+            {"current_deadband": 2.0, "deadband_percent": 10}, DESCRIPTIONS["current"]
+        )
+        assert f.absolute == 2.0
+        assert f.relative == pytest.approx(0.1)
@@ -0,0 +1,131 @@
+"""Unit tests for snapshot.WallboxSnapshot."""
+
+import dataclasses
+from decimal import Decimal
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "sems_wallbox_snapshot", os.path.join(_HERE, "snapshot.py")
+)
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["sems_wallbox_snapshot"] = _mod
+_spec.loader.exec_module(_mod)
+
+WallboxSnapshot = _mod.WallboxSnapshot
+
+RESPONSE = {
+    "sn": "GWSN001",
+    "name": "My Wallbox",
+    "model": "AC Charger Pro",
+    "fireware": "1.2.3",
+    "status": "EVDetail_Status_Title_Waiting",
+    "workstate": "EVDetail_Status_Waiting_Stat01",
+    "power": "0",
+    "current": None,
+    "chargeEnergy": "123.5",
+    "chargeMode": "1",
+    "set_charge_power": "7.4",
+    "min_charge_power": 4.2,
+    "max_charge_power": "bad",
+}
+
+
+class TestDecoding:
+    def test_fields_are_typed(self):
+        snapshot = WallboxSnapshot.from_dict(RESPONSE)
+        assert snapshot.sn == "GWSN001"
+        assert snapshot.firmware == "1.2.3"
+        assert snapshot.power == 0.0
+        assert snapshot.current == 0.0
+        assert snapshot.charge_energy == Decimal("123.5")
+        assert snapshot.charge_mode == 1
+        assert snapshot.set_charge_power == 7.4
+        assert snapshot.min_charge_power == 4.2
+        assert snapshot.max_charge_power is None
+
+    def test_derived_states(self):
+        snapshot = WallboxSnapshot.from_dict(RESPONSE)
+        assert snapshot.state == "standby"
+        assert snapshot.workstate_state == "connected"
+        assert snapshot.is_charging is False
+
+    @pytest.mark.parametrize(
+        "changes",
+        [{"status": "EVDetail_Status_Title_Charging"}, {"power": 0.5}],
+    )
+    def test_is_charging(self, changes):
+        assert WallboxSnapshot.from_dict({**RESPONSE, **changes}).is_charging is True
+
+    def test_negative_and_invalid_readings(self):
+        snapshot = WallboxSnapshot.from_dict(
+            {**RESPONSE, "power": -1.5, "current": "n/a", "chargeEnergy": "n/a"}
+        )
+        assert snapshot.power == 0.0
+        assert snapshot.current == 0.0
+        assert snapshot.charge_energy == Decimal(0)
+
+    def test_unknown_status_and_empty_workstate(self):
+        snapshot = WallboxSnapshot.from_dict(
+            {**RESPONSE, "status": "Something_New", "workstate": ""}
+        )
+        assert snapshot.state == "unknown"
+        assert snapshot.workstate_state == "dash"
+
+    def test_attributes_are_status_details_only(self):
+        attributes = WallboxSnapshot.from_dict(RESPONSE).attributes
+        assert attributes == {
+            "statusText": RESPONSE["status"],
+            "workstate": RESPONSE["workstate"],
+            "chargeMode": RESPONSE["chargeMode"],
+        }
+
+    def test_missing_sn_raises(self):
+        with pytest.raises(ValueError):
+            WallboxSnapshot.from_dict({**RESPONSE, "sn": None})
+
+
+class TestImmutability:
+    def test_frozen(self):
+        snapshot = WallboxSnapshot.from_dict(RESPONSE)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.power = 1.0
+
+    def test_slotted(self):
+        assert not hasattr(WallboxSnapshot.from_dict(RESPONSE), "__dict__")
+
+    def test_raw_is_read_only_copy(self):
+        data = dict(RESPONSE)
+        snapshot = WallboxSnapshot.from_dict(data)
+        data["power"] = 9
+        assert snapshot.raw["power"] == "0"
+        with pytest.raises(TypeError):
+            snapshot.raw["power"] = 1
+
+    def test_merge_returns_new_snapshot(self):
+        snapshot = WallboxSnapshot.from_dict(RESPONSE)
+        merged = snapshot.merge({"chargeMode": 0, "set_charge_power": 11.0})
+        assert merged.charge_mode == 0
+        assert merged.set_charge_power == 11.0
+        assert merged.name == "My Wallbox"
+        assert snapshot.charge_mode == 1
+
+
+class TestChangedFields:
+    def test_identical_snapshots_have_no_changes(self):
+        a = WallboxSnapshot.from_dict(RESPONSE)
+        assert a.changed_fields(WallboxSnapshot.from_dict(dict(RESPONSE))) == frozenset()
+
+    def test_changed_reading_and_derived_flags(self):
+        a = WallboxSnapshot.from_dict(RESPONSE)
+        b = a.merge({"power": 7.4})
+        assert b.changed_fields(a) == {"power", "is_charging"}
@@ -1,12 +1,14 @@
-"""Unit tests for switch.py — SemsSwitch grace period logic."""
+"""Unit tests for switch.py — SemsSwitch on/off state and commands."""
 
 import sys
 import os
 import types
 import importlib.util
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, AsyncMock
 import time
 
+import pytest
+
 # ---------------------------------------------------------------------------
 # All HA stubs are set up by conftest.py before this file is collected.
 # ---------------------------------------------------------------------------
@@ -53,12 +55,24 @@ _coord_stub = types.ModuleType(f"{_pkg_name}.coordinator")
 class _FakeCoordinator:
     def __init__(self, data):
         self.data = data
+        self.hass = MagicMock()
+        self.devices = {sn: _device(snapshot) for sn, snapshot in data.items()}
         self.last_update_success = True
+        self.stale_serials = set()
+
+    def serial_available(self, sn):
+        return self.last_update_success and sn not in self.stale_serials
+
+    def async_notify_serial(self, sn):
+        pass
 
     def async_request_refresh(self):
         pass
 
-    def schedule_delayed_refresh(self, delay=5):
+    def async_confirm(self, sn, kind, check):
+        pass
+
+    def async_apply_command_state(self, sn, state):
         pass
 
 
@@ -76,8 +90,20 @@ sys.modules[f"{_pkg_name}.switch"] = _switch_mod
 _spec.loader.exec_module(_switch_mod)
 
 SemsSwitch = _switch_mod.SemsSwitch
-GRACE_ON_SECONDS = _switch_mod.GRACE_ON_SECONDS
-GRACE_OFF_SECONDS = _switch_mod.GRACE_OFF_SECONDS
+_dispatcher_mod = sys.modules[f"{_pkg_name}.dispatcher"]
+_reconciler_mod = sys.modules[f"{_pkg_name}.reconciler"]
+WallboxSnapshot = sys.modules[f"{_pkg_name}.snapshot"].WallboxSnapshot
+WallboxDevice = importlib.import_module(f"{_pkg_name}.device").WallboxDevice
+
+
+def _device(snapshot):
+    """Return the shared device info object of a polled wallbox."""
+    device = WallboxDevice(snapshot.sn)
+    device.update(snapshot)
+    return device
+
+
+GRACE_SECONDS = _reconciler_mod.CONFIRM_DEADLINE
 
 
 # ---------------------------------------------------------------------------
@@ -86,6 +112,10 @@ GRACE_OFF_SECONDS = _switch_mod.GRACE_OFF_SECONDS
 
 SAMPLE_SN = "GWSN001"
 
+# Command results as returned by SemsApi (ok, state echoed in the response)
+ACCEPTED = types.SimpleNamespace(ok=True, state={})
+REJECTED = types.SimpleNamespace(ok=False, state={})
+
 CHARGING_DATA = {
     "sn": SAMPLE_SN,
     "status": "EVDetail_Status_Title_Charging",
@@ -101,139 +131,95 @@ STANDBY_DATA = {
 }
 
 
-def _make_switch(data: dict, current_is_on: bool = False) -> SemsSwitch:
-    coord = _FakeCoordinator({SAMPLE_SN: data})
+class _Clock:
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def __call__(self):
+        return self.now
+
+
+def _make_switch(data: dict) -> SemsSwitch:
+    coord = _FakeCoordinator({SAMPLE_SN: WallboxSnapshot.from_dict(data)})
     api = MagicMock()
-    sw = SemsSwitch(coord, SAMPLE_SN, api, current_is_on)
+    api.async_change_status = AsyncMock(return_value=ACCEPTED)
+    clock = _Clock()
+    reconciler = _reconciler_mod.WallboxReconciler(
+        coord, api, SAMPLE_SN, _dispatcher_mod.CommandDispatcher(window=0), clock
+    )
+    sw = SemsSwitch(coord, SAMPLE_SN, reconciler)
+    sw.api = api  # handles for assertions
+    sw.clock = clock
 
-    # hass mock needs loop.time()
     hass = MagicMock()
-    hass.loop.time.return_value = time.monotonic()
     hass.async_create_task = MagicMock()
     sw.hass = hass
+    sw.async_write_ha_state = MagicMock()
     return sw
 
 
+def _poll(sw, data):
+    sw.coordinator.data = {SAMPLE_SN: WallboxSnapshot.from_dict(data)}
+
+
 # ===========================================================================
-# _compute_is_on_from_data — no grace (no command issued)
+# is_on — no command issued
 # ===========================================================================
 
-class TestComputeIsOnNoGrace:
+class TestIsOnNoCommand:
     def test_charging_status_returns_true(self):
-        sw = _make_switch(CHARGING_DATA)
-        assert sw._compute_is_on_from_data(CHARGING_DATA) is True
+        assert _make_switch(CHARGING_DATA).is_on is True
 
     def test_standby_status_returns_false(self):
-        sw = _make_switch(STANDBY_DATA)
-        assert sw._compute_is_on_from_data(STANDBY_DATA) is False
+        assert _make_switch(STANDBY_DATA).is_on is False
 
     def test_power_above_zero_is_on(self):
-        data = {**STANDBY_DATA, "power": 0.5}
-        sw = _make_switch(data)
-        assert sw._compute_is_on_from_data(data) is True
-
-    def test_zero_power_not_charging_is_off(self):
-        data = {**STANDBY_DATA, "power": 0.0}
-        sw = _make_switch(data)
-        assert sw._compute_is_on_from_data(data) is False
+        assert _make_switch({**STANDBY_DATA, "power": 0.5}).is_on is True
 
 
 # ===========================================================================
-# _compute_is_on_from_data — within ON grace window
+# is_on — after an ON command
 # ===========================================================================
 
-class TestComputeIsOnGraceOn:
-    def test_within_grace_api_standby_stays_true(self):
-        """After ON command, even if API returns Waiting/power=0, we stay ON."""
+class TestIsOnAfterTurnOn:
+    async def test_poll_still_standby_stays_on(self):
+        """After ON, a poll still showing Waiting/power=0 keeps the switch ON."""
         sw = _make_switch(STANDBY_DATA)
-        now = time.monotonic()
-        sw._last_command_target = True
-        sw._last_command_ts = now - 5  # 5 s ago — well within 130 s grace
-        sw.hass.loop.time.return_value = now
-
-        assert sw._compute_is_on_from_data(STANDBY_DATA) is True
-
-    def test_within_grace_api_charging_returns_true(self):
-        """ON grace + API already charging → True (API state already matches)."""
-        sw = _make_switch(CHARGING_DATA)
-        now = time.monotonic()
-        sw._last_command_target = True
-        sw._last_command_ts = now - 5
-        sw.hass.loop.time.return_value = now
-
-        assert sw._compute_is_on_from_data(CHARGING_DATA) is True
-
-    def test_grace_cleared_when_api_matches_command(self):
-        """When API state matches the command, grace fields are cleared."""
-        sw = _make_switch(CHARGING_DATA)
-        now = time.monotonic()
-        sw._last_command_target = True
-        sw._last_command_ts = now - 5
-        sw.hass.loop.time.return_value = now
-
-        sw._compute_is_on_from_data(CHARGING_DATA)
-
-        assert sw._last_command_target is None
-        assert sw._last_command_ts is None
+        await sw.async_turn_on()
+        sw.clock.now += 5
+        _poll(sw, STANDBY_DATA)
+        assert sw.is_on is True
 
-    def test_after_grace_expired_follows_api(self):
-        """Once ON grace window expires, follow the real API state."""
+    async def test_confirmed_command_clears_pending(self):
         sw = _make_switch(STANDBY_DATA)
-        now = time.monotonic()
-        sw._last_command_target = True
-        sw._last_command_ts = now - (GRACE_ON_SECONDS + 10)  # expired
-        sw.hass.loop.time.return_value = now
+        await sw.async_turn_on()
+        _poll(sw, CHARGING_DATA)
+        assert sw.is_on is True
+        assert sw.reconciler.as_dict() == {}
 
-        assert sw._compute_is_on_from_data(STANDBY_DATA) is False
+    async def test_unconfirmed_command_expires(self):
+        sw = _make_switch(STANDBY_DATA)
+        await sw.async_turn_on()
+        sw.clock.now += GRACE_SECONDS + 10
+        assert sw.is_on is False
 
 
 # ===========================================================================
-# _compute_is_on_from_data — within OFF grace window
+# is_on — after an OFF command
 # ===========================================================================
 
-class TestComputeIsOnGraceOff:
-    def test_within_grace_api_charging_stays_false(self):
-        """After OFF command, even if API still reports Charging, we stay OFF."""
+class TestIsOnAfterTurnOff:
+    async def test_poll_still_charging_stays_off(self):
         sw = _make_switch(CHARGING_DATA)
-        now = time.monotonic()
-        sw._last_command_target = False
-        sw._last_command_ts = now - 5  # 5 s ago — well within 130 s grace
-        sw.hass.loop.time.return_value = now
-
-        assert sw._compute_is_on_from_data(CHARGING_DATA) is False
-
-    def test_within_grace_api_standby_returns_false(self):
-        """OFF grace + API already standby → False (API state already matches)."""
-        sw = _make_switch(STANDBY_DATA)
-        now = time.monotonic()
-        sw._last_command_target = False
-        sw._last_command_ts = now - 5
-        sw.hass.loop.time.return_value = now
+        await sw.async_turn_off()
+        sw.clock.now += 5
+        assert sw.is_on is False
 
-        assert sw._compute_is_on_from_data(STANDBY_DATA) is False
-
-    def test_after_grace_expired_follows_api(self):
-        """Once OFF grace window expires, follow the real API state."""
+    async def test_unconfirmed_command_expires(self):
         sw = _make_switch(CHARGING_DATA)
-        now = time.monotonic()
-        sw._last_command_target = False
-        sw._last_command_ts = now - (GRACE_OFF_SECONDS + 10)  # expired
-        sw.hass.loop.time.return_value = now
-
-        assert sw._compute_is_on_from_data(CHARGING_DATA) is True
-
-    def test_grace_cleared_when_api_matches_command(self):
-        """When API state matches the OFF command, grace fields are cleared."""
-        sw = _make_switch(STANDBY_DATA)
-        now = time.monotonic()
-        sw._last_command_target = False
-        sw._last_command_ts = now - 5
-        sw.hass.loop.time.return_value = now
-
-        sw._compute_is_on_from_data(STANDBY_DATA)
-
-        assert sw._last_command_target is None
-        assert sw._last_command_ts is None
+        await sw.async_turn_off()
+        sw.clock.now += GRACE_SECONDS + 10
+        assert sw.is_on is True
 
 
 # ===========================================================================
@@ -242,8 +228,14 @@ class TestComputeIsOnGraceOff:
 
 class TestSemsSwitchProperties:
     def test_unique_id(self):
-        sw = _make_switch(CHARGING_DATA, current_is_on=True)
-        assert sw.unique_id == f"{SAMPLE_SN}-switch-start-charging"
+        sw = _make_switch(CHARGING_DATA)
+        assert sw._attr_unique_id == f"{SAMPLE_SN}-switch-start-charging"
+
+    def test_identity_survives_missing_data(self):
+        sw = _make_switch(CHARGING_DATA)
+        sw.coordinator.data = {}
+        assert sw._attr_unique_id == f"{SAMPLE_SN}-switch-start-charging"
+        assert ("sems-wallbox", SAMPLE_SN) in sw.device_info["identifiers"]
 
     def test_translation_key(self):
         sw = _make_switch(CHARGING_DATA)
@@ -263,3 +255,40 @@ class TestSemsSwitchProperties:
         info = sw.device_info
         assert ("sems-wallbox", SAMPLE_SN) in info["identifiers"]
         assert info["manufacturer"] == "GoodWe"
+
+
+# ===========================================================================
+# Commands
+# ===========================================================================
+
+class TestSemsSwitchCommands:
+    async def test_turn_on_sends_status_1(self):
+        sw = _make_switch(STANDBY_DATA)
+        await sw.async_turn_on()
+        sw.api.async_change_status.assert_awaited_once_with(SAMPLE_SN, 1)
+        assert sw.is_on is True
+
+    async def test_turn_off_sends_status_2(self):
+        sw = _make_switch(CHARGING_DATA)
+        await sw.async_turn_off()
+        sw.api.async_change_status.assert_awaited_once_with(SAMPLE_SN, 2)
+        assert sw.is_on is False
+
+    async def test_no_immediate_refresh(self):
+        """Only the reconciler's confirmation refresh follows a command."""
+        sw = _make_switch(STANDBY_DATA)
+        await sw.async_turn_on()
+        sw.hass.async_create_task.assert_not_called()
+
+    async def test_turn_on_when_already_charging_sends_nothing(self):
+        sw = _make_switch(CHARGING_DATA)
+        await sw.async_turn_on()
+        sw.api.async_change_status.assert_not_awaited()
+
+    async def test_failure_reverts_and_raises(self):
+        sw = _make_switch(STANDBY_DATA)
+        sw.api.async_change_status = AsyncMock(return_value=REJECTED)
+        with pytest.raises(Exception):  # HomeAssistantError
+            await sw.async_turn_on()
+        assert sw.is_on is False
+        sw.hass.async_create_task.assert_called_once()
@@ -0,0 +1,115 @@
+"""Unit tests for triggers.TriggerWatcher."""
+
+import importlib
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+_HERE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "sems-wallbox",
+)
+
+_pkg_name = "sems_wallbox_pkg_triggers"
+_pkg = types.ModuleType(_pkg_name)
+_pkg.__path__ = [_HERE]
+_pkg.__package__ = _pkg_name
+sys.modules[_pkg_name] = _pkg
+
+_const = types.ModuleType(f"{_pkg_name}.const")
+_const.DOMAIN = "sems-wallbox"
+_const.CONF_TRIGGERS = "triggers"
+sys.modules[f"{_pkg_name}.const"] = _const
+
+_triggers = importlib.import_module(f"{_pkg_name}.triggers")
+RefreshTrigger = _triggers.RefreshTrigger
+TriggerWatcher = _triggers.TriggerWatcher
+_event = sys.modules["homeassistant.helpers.event"]
+
+GRID = "sensor.grid_power"
+
+
+def _state(value):
+    return types.SimpleNamespace(state=value) if value is not None else None
+
+
+def _hass(states):
+    hass = MagicMock()
+    hass.states.get = lambda entity_id: _state(states.get(entity_id))
+    return hass
+
+
+def _change(entity_id, value):
+    event = types.SimpleNamespace(data={"entity_id": entity_id, "new_state": _state(value)})
+    for entity_ids, action in list(_event.state_listeners):
+        if entity_id in entity_ids:
+            action(event)
+
+
+@pytest.fixture
+def fired():
+    return []
+
+
+def _watcher(fired, states, *triggers):
+    watcher = TriggerWatcher(_hass(states), list(triggers), fired.append)
+    watcher.async_start()
+    return watcher
+
+
+class TestRefreshTrigger:
+    def test_from_dict(self):
+        trigger = RefreshTrigger.from_dict({"entity_id": GRID, "threshold": "-1.5"})
+        assert trigger == RefreshTrigger(GRID, 1.5)
+
+    def test_invalid_triggers_are_skipped(self):
+        triggers = _triggers.triggers_from_options(
+            {"triggers": [{"entity_id": GRID, "threshold": 1}, {"threshold": 2}]}
+        )
+        assert triggers == [RefreshTrigger(GRID, 1.0)]
+
+
+class TestTriggerWatcher:
+    def test_jump_above_threshold_fires(self, fired):
+        watcher = _watcher(fired, {GRID: "0.5"}, RefreshTrigger(GRID, 1.0))
+        _change(GRID, "0.9")
+        assert fired == []
+        _change(GRID, "2.0")
+        assert fired == [GRID]
+        watcher.async_stop()
+
+    def test_ramp_fires_against_last_fired_value(self, fired):
+        watcher = _watcher(fired, {GRID: "0"}, RefreshTrigger(GRID, 1.0))
+        for value in ("0.4", "0.8", "1.2", "1.6", "2.0", "2.4"):
+            _change(GRID, value)
+        # Fired at 1.2 (from 0) and at 2.4 (from 1.2)
+        assert fired == [GRID, GRID]
+        watcher.async_stop()
+
+    def test_unavailable_is_ignored(self, fired):
+        watcher = _watcher(fired, {GRID: "0"}, RefreshTrigger(GRID, 1.0))
+        _change(GRID, "unavailable")
+        _change(GRID, "0.2")
+        _change(GRID, None)
+        assert fired == []
+        watcher.async_stop()
+
+    def test_first_value_only_sets_reference(self, fired):
+        watcher = _watcher(fired, {}, RefreshTrigger(GRID, 1.0))
+        _change(GRID, "5")
+        assert fired == []
+        _change(GRID, "6")
+        assert fired == [GRID]
+        watcher.async_stop()
+
+    def test_non_numeric_state_fires_on_change(self, fired):
+        entity_id = "binary_sensor.sun_up"
+        watcher = _watcher(fired, {entity_id: "off"}, RefreshTrigger(entity_id, 5))
+        _change(entity_id, "on")
+        assert fired == [entity_id]
+        watcher.async_stop()
+        assert _event.state_listeners == []